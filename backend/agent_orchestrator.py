@@ -3,28 +3,76 @@ Agent orchestrator for comprehensive code review.
 Coordinates multiple analysis tools to provide intelligent code feedback.
 """
 
-from typing import Dict, List, Optional
-from dataclasses import dataclass, asdict, field
-from analyzers.compile_checker import CompileTimeChecker, CompileTimeResult
+import hashlib
+import json
+import re
+import sys
+import threading
+from collections import OrderedDict
+from typing import ClassVar, Dict, List, Optional, Tuple
+from dataclasses import dataclass, field
+from concurrent.futures import ThreadPoolExecutor
+from analyzers.code_context import CodeContext
+from analyzers.compile_checker import CompileError, CompileTimeChecker, CompileTimeResult
 from analyzers.logic_analyzer import LogicAnalyzer
 from analyzers.optimization_analyzer import OptimizationAnalyzer
 from analyzers.control_flow_analyzer import ControlFlowAnalyzer
 from analyzers.smell_detector import SmellDetector
+from analyzers.universal_ast_analyzer import get_analyzer
 from llm_providers.base import LLMProvider
 from llm_providers.factory import create_llm_provider
-from model import ErrorDetectionModel
+from model import ErrorDetectionModel, RuntimeModelBatcher
 
 
-@dataclass
+COMBINED_REVIEW_PROMPT = """You are an expert Python code reviewer.
+Review the code below for logical errors (edge cases, off-by-one errors,
+incorrect conditionals, potential infinite loops) and for optimization
+opportunities (performance, readability, safety).
+
+Return ONLY a JSON object with exactly these keys:
+{{
+  "logical_concerns": ["Line X: <brief description>", ...],
+  "optimizations": [
+    {{"type": "performance|readability|safety", "line": <int>,
+      "suggestion": "<brief description>", "impact": "<expected benefit>",
+      "example": "<one-line code example>"}}
+  ]
+}}
+Use empty lists when there is nothing to report.
+
+Code:
+```python
+{code}
+```"""
+
+
+# LLM results kept per agent, keyed by (stage, hash of the source)
+_LLM_CACHE_SIZE = 128
+
+
+def _digest(code: str) -> bytes:
+    return hashlib.blake2b(code.encode("utf-8", "surrogatepass"), digest_size=16).digest()
+
+
+@dataclass(slots=True)
 class RuntimeRisk:
     """Represents a runtime error risk."""
     type: str
     line: int
     confidence: float
     explanation: str
+    
+    def to_dict(self) -> Dict:
+        """Convert to dictionary for JSON serialization."""
+        return {
+            "type": self.type,
+            "line": self.line,
+            "confidence": self.confidence,
+            "explanation": self.explanation
+        }
 
 
-@dataclass
+@dataclass(slots=True)
 class ReviewResult:
     """Complete code review result."""
     compile_time: Dict
@@ -47,6 +95,29 @@ class CodeReviewAgent:
     4. Optimization analyzer (heuristics + LLM)
     """
     
+    # Line-locating patterns for _estimate_error_line (one C-level scan each)
+    _RE_INDEX = re.compile(r'^(?=.*\[).*\]', re.M)
+    _RE_IMPORT = re.compile(r'^\s*(?:import|from)\b', re.M)
+    
+    # Below this many characters, LLM stages only run if a runtime risk
+    # was predicted
+    _LLM_MIN_CODE_CHARS = 200
+    
+    # Human-readable explanation per predicted error type (keys interned
+    # so lookups with the model's interned labels compare by identity)
+    _EXPLANATIONS: ClassVar[Dict[str, str]] = {
+        sys.intern(k): v for k, v in {
+            "IndexError": "Possible array/list index out of bounds",
+            "RuntimeError": "Potential runtime error detected",
+            "ImportError": "Module import may fail",
+            "TypeError": "Type mismatch or invalid operation",
+            "ValueError": "Invalid value for operation",
+            "AttributeError": "Attribute access may fail",
+            "KeyError": "Dictionary key may not exist",
+            "ZeroDivisionError": "Possible division by zero"
+        }.items()
+    }
+    
     def __init__(
         self,
         runtime_model: ErrorDetectionModel,
@@ -62,8 +133,17 @@ class CodeReviewAgent:
         # Initialize all analyzers
         self.compile_checker = CompileTimeChecker()
         self.runtime_model = runtime_model
+        # Concurrent reviews share forward passes; the heuristic stub gains
+        # nothing from waiting, so it only batches what is already queued
+        self._runtime_batcher = RuntimeModelBatcher(
+            runtime_model,
+            max_latency_ms=0 if getattr(runtime_model, "is_stub", False) else 20,
+        )
         self.control_flow_analyzer = ControlFlowAnalyzer()
         self.smell_detector = SmellDetector()
+
+        # Stages 2-6 only depend on `code`, so they run on a shared pool
+        self._executor = ThreadPoolExecutor(max_workers=6)
         
         # Create LLM provider if not provided
         if llm_provider is None:
@@ -76,6 +156,16 @@ class CodeReviewAgent:
         self.llm_provider = llm_provider
         self.logic_analyzer = LogicAnalyzer(llm_provider) if llm_provider else None
         self.optimizer = OptimizationAnalyzer(llm_provider) if llm_provider else None
+
+        # Re-submitting an unchanged buffer (IDE autosave) reuses successful
+        # LLM results (LogicAnalyzer keeps its own cache keyed by source hash)
+        self._llm_cache: "OrderedDict[Tuple[str, bytes], Tuple[List[str], List[Dict]]]" = OrderedDict()
+        self._llm_cache_lock = threading.Lock()
+    
+    def close(self) -> None:
+        """Release the stage thread pool and the runtime model batcher."""
+        self._executor.shutdown(wait=False)
+        self._runtime_batcher.close()
     
     def review_code(
         self,
@@ -95,7 +185,8 @@ class CodeReviewAgent:
 
         # Steps 2-6: Additional analyses
         runtime_risks, logical_concerns, optimizations, control_flow_dict, smells = self._run_additional_analysis(
-            code, language, include_logic_analysis, include_optimizations, include_control_flow
+            code, language, include_logic_analysis, include_optimizations, include_control_flow,
+            ctx=compile_result.context
         )
 
         # Step 7: Generate summary
@@ -120,7 +211,7 @@ class CodeReviewAgent:
     def _build_success_result(self, compile_dict, runtime_risks, logical_concerns, optimizations, control_flow_dict, summary, smells):
         return ReviewResult(
             compile_time=compile_dict,
-            runtime_risks=[asdict(r) for r in runtime_risks],
+            runtime_risks=[r.to_dict() for r in runtime_risks],
             logical_concerns=logical_concerns,
             optimizations=optimizations,
             control_flow=control_flow_dict,
@@ -128,36 +219,183 @@ class CodeReviewAgent:
             smells=smells
         )
         
-    def _run_additional_analysis(self, code: str, language: str, include_logic_analysis: bool, include_optimizations: bool, include_control_flow: bool):
+    def _run_additional_analysis(self, code: str, language: str, include_logic_analysis: bool, include_optimizations: bool, include_control_flow: bool, ctx: Optional[CodeContext] = None):
+        # `ctx` is the AST parsed and walked once by the compile checker
+        # (Python only); it is shared read-only by the AST-based stages below.
+        # Steps 2-6 are independent of each other: submit them all first,
+        # then collect, so wall-clock time is bounded by the slowest stage
+        # (usually an LLM round-trip) instead of the sum of all stages.
+        futures = {}
+
         # Step 2: Runtime error prediction (your existing model)
-        runtime_risks = self._predict_runtime_errors(code)
-        
-        # Step 3: Logical analysis (LLM reasoning)
-        logical_concerns = []
-        if include_logic_analysis and self.logic_analyzer:
-            logical_concerns = self.logic_analyzer.analyze(code)
-        
-        # Step 4: Optimization suggestions (heuristics + LLM)
-        optimizations = []
-        if include_optimizations and self.optimizer:
-            optimizations = self.optimizer.suggest(code)
-        
+        futures["runtime"] = self._executor.submit(self._predict_runtime_errors, code)
+
         # Step 5: Control flow analysis (visual error explanation)
-        control_flow_dict = None
         if include_control_flow:
-            control_flow_result = self.control_flow_analyzer.analyze(code, language=language)
+            futures["control_flow"] = self._executor.submit(
+                self.control_flow_analyzer.analyze, code, language=language,
+                tree=ctx.tree if ctx is not None else None
+            )
+
+        # Step 6: Code smell detection
+        futures["smells"] = self._executor.submit(self.smell_detector.detect_to_dict, code, ctx=ctx)
+
+        run_logic = include_logic_analysis and self.logic_analyzer is not None
+        run_optimizations = include_optimizations and self.optimizer is not None
+
+        # Short snippets are only worth an LLM round-trip if the runtime
+        # model flagged something
+        if (run_logic or run_optimizations) and len(code) < self._LLM_MIN_CODE_CHARS:
+            if not futures["runtime"].result():
+                run_logic = False
+                if run_optimizations:
+                    futures["optimizations"] = self._executor.submit(
+                        self.optimizer.suggest, code, llm_suggestions=[], ctx=ctx
+                    )
+                    run_optimizations = False
+
+        # Steps 3+4: one LLM round-trip when both LLM stages are requested
+        if run_logic and run_optimizations:
+            futures["llm"] = self._executor.submit(self._combined_llm_review, code)
+        else:
+            # Step 3: Logical analysis (LLM reasoning)
+            if run_logic:
+                futures["logic"] = self._executor.submit(self.logic_analyzer.analyze, code)
+
+            # Step 4: Optimization suggestions (heuristics + LLM)
+            if run_optimizations:
+                futures["optimizations"] = self._executor.submit(self._suggest_optimizations, code, ctx)
+
+        runtime_risks = futures["runtime"].result()
+        if "llm" in futures:
+            logical_concerns, llm_suggestions = futures["llm"].result()
+            optimizations = self.optimizer.suggest(code, llm_suggestions=llm_suggestions, ctx=ctx)
+        else:
+            logical_concerns = futures["logic"].result() if "logic" in futures else []
+            optimizations = futures["optimizations"].result() if "optimizations" in futures else []
+
+        control_flow_dict = None
+        if "control_flow" in futures:
+            control_flow_result = futures["control_flow"].result()
             if control_flow_result.has_issues:
                 control_flow_dict = control_flow_result.to_dict()
-        
-        # Step 6: Code smell detection
+
         smells = []
         try:
-            smells = self.smell_detector.detect_to_dict(code)
+            smells = futures["smells"].result()
         except Exception as e:
             print(f"Smell detection error: {e}")
             
         return runtime_risks, logical_concerns, optimizations, control_flow_dict, smells
 
+    def _combined_llm_review(self, code: str) -> Tuple[List[str], List[Dict]]:
+        """
+        Fetch logical concerns and optimization suggestions in a single
+        LLM call instead of one round-trip per analyzer.
+        
+        Args:
+            code: Python source code
+            
+        Returns:
+            Tuple of (logical concerns, LLM optimization suggestions)
+        """
+        key = ("combined", _digest(code))
+        cached = self._llm_cache_get(key)
+        if cached is not None:
+            return cached
+        
+        if not self.llm_provider.is_available():
+            return ["⚠️ LLM not available - logical analysis skipped"], []
+        
+        try:
+            prompt = COMBINED_REVIEW_PROMPT.format(code=self.llm_provider.prepare_code(code))
+            response = self.llm_provider.generate_json(prompt)
+            parsed = self._parse_combined_response(response)
+        except Exception as e:
+            print(f"Combined LLM review error: {e}")
+            parsed = None
+        
+        if parsed is None:
+            # Model ignored the JSON envelope - fall back to separate calls
+            # (not cached here: LogicAnalyzer caches its own successes)
+            return self.logic_analyzer.analyze(code), self._llm_optimizations(code)
+        
+        self._llm_cache_put(key, parsed)  # Stores copies
+        return parsed
+    
+    def _suggest_optimizations(self, code: str, ctx: Optional[CodeContext] = None) -> List[Dict]:
+        """optimizer.suggest() with the LLM part reused for unchanged code."""
+        key = ("optimizations", _digest(code))
+        cached = self._llm_cache_get(key)
+        if cached is not None:
+            return self.optimizer.suggest(code, llm_suggestions=cached[1], ctx=ctx)
+        
+        llm_suggestions = None
+        if self.llm_provider.is_available():
+            llm_suggestions = self._llm_optimizations(code)
+            # An empty list may be a failed request, so only hits are kept
+            if llm_suggestions:
+                self._llm_cache_put(key, ([], llm_suggestions))
+        return self.optimizer.suggest(code, llm_suggestions=llm_suggestions or [], ctx=ctx)
+    
+    def _llm_cache_get(self, key: Tuple[str, bytes]) -> Optional[Tuple[List[str], List[Dict]]]:
+        """Copy of a cached (concerns, suggestions) pair, or None."""
+        with self._llm_cache_lock:
+            cached = self._llm_cache.get(key)
+            if cached is None:
+                return None
+            self._llm_cache.move_to_end(key)
+            concerns, suggestions = cached
+            return list(concerns), [dict(s) for s in suggestions]
+    
+    def _llm_cache_put(self, key: Tuple[str, bytes], result: Tuple[List[str], List[Dict]]) -> None:
+        concerns, suggestions = result
+        with self._llm_cache_lock:
+            self._llm_cache[key] = (list(concerns), [dict(s) for s in suggestions])
+            self._llm_cache.move_to_end(key)
+            if len(self._llm_cache) > _LLM_CACHE_SIZE:
+                self._llm_cache.popitem(last=False)
+    
+    def _llm_optimizations(self, code: str) -> List[Dict]:
+        """LLM-only optimization suggestions (heuristics are added later)."""
+        try:
+            return self.llm_provider.suggest_optimizations(code)
+        except Exception as e:
+            print(f"LLM optimization error: {e}")
+            return []
+    
+    def _parse_combined_response(self, response: str) -> Optional[Tuple[List[str], List[Dict]]]:
+        """Split the JSON envelope from the combined prompt into both result lists."""
+        match = re.search(r"\{[\s\S]*\}", response or "")
+        if not match:
+            return None
+        try:
+            data = json.loads(match.group(0))
+        except ValueError:
+            return None
+        if not isinstance(data, dict):
+            return None
+        
+        concerns = [
+            str(c).strip() for c in data.get("logical_concerns") or []
+            if str(c).strip()
+        ]
+        
+        suggestions = []
+        for opt in data.get("optimizations") or []:
+            if not isinstance(opt, dict) or not opt.get("suggestion"):
+                continue
+            line = str(opt.get("line", 0))
+            suggestions.append({
+                "type": str(opt.get("type", "general")).lower(),
+                "line": int(line) if line.isdigit() else 0,
+                "suggestion": str(opt["suggestion"]),
+                "impact": str(opt.get("impact", "")),
+                "example": str(opt.get("example", ""))
+            })
+        
+        return concerns[:5], suggestions[:5]
+
     def _check_syntax(self, code: str, language: str):
         """Perform syntax checking depending on language."""
         compile_result = None
@@ -166,10 +404,8 @@ class CodeReviewAgent:
             compile_result = self.compile_checker.check(code)
             compile_dict = self.compile_checker.to_dict(compile_result)
         else:
-            from analyzers.universal_ast_analyzer import UniversalASTAnalyzer
-            from analyzers.compile_checker import CompileTimeResult, CompileError
             try:
-                analyzer = UniversalASTAnalyzer(language)
+                analyzer = get_analyzer(language)
                 syntax_result = analyzer.check_syntax(code)
                 if syntax_result['status'] == 'error':
                     error_objects = [
@@ -201,7 +437,7 @@ class CodeReviewAgent:
             List of runtime risks
         """
         try:
-            error_type, confidence = self.runtime_model.predict(code)
+            error_type, confidence = self._runtime_batcher.submit(code).result(timeout=5)
             
             # Only report if confidence is reasonable and not "Unknown"
             if confidence > 0.3 and error_type != "Unknown":
@@ -234,34 +470,21 @@ class CodeReviewAgent:
         Returns:
             Estimated line number (0 if unknown)
         """
-        lines = code.split('\n')
-        
         # Simple heuristics based on error type
         if error_type == "IndexError":
-            for i, line in enumerate(lines, 1):
-                if '[' in line and ']' in line:
-                    return i
-        
+            match = self._RE_INDEX.search(code)
         elif error_type == "ImportError":
-            for i, line in enumerate(lines, 1):
-                if 'import' in line:
-                    return i
+            match = self._RE_IMPORT.search(code)
+        else:
+            match = None
         
-        return 0  # Unknown line
+        if match is None:
+            return 0  # Unknown line
+        return code.count('\n', 0, match.start()) + 1
     
     def _explain_runtime_error(self, error_type: str) -> str:
         """Generate human-readable explanation for error type."""
-        explanations = {
-            "IndexError": "Possible array/list index out of bounds",
-            "RuntimeError": "Potential runtime error detected",
-            "ImportError": "Module import may fail",
-            "TypeError": "Type mismatch or invalid operation",
-            "ValueError": "Invalid value for operation",
-            "AttributeError": "Attribute access may fail",
-            "KeyError": "Dictionary key may not exist",
-            "ZeroDivisionError": "Possible division by zero"
-        }
-        return explanations.get(error_type, "Potential runtime issue detected")
+        return self._EXPLANATIONS.get(error_type, "Potential runtime issue detected")
     
     def _generate_summary(
         self,
@@ -284,28 +507,20 @@ class CodeReviewAgent:
         Returns:
             Summary string
         """
-        parts = []
-        smells = smells or []
-
-        if compile_result.has_errors:
-            parts.append(f"{len(compile_result.errors)} compile-time error(s)")
-        else:
-            parts.append("✓ No compile-time errors")
-
-        if runtime_risks:
-            parts.append(f"{len(runtime_risks)} runtime risk(s)")
-
-        if logical_concerns:
-            parts.append(f"{len(logical_concerns)} logical concern(s)")
-
-        if optimizations:
-            parts.append(f"{len(optimizations)} optimization(s) available")
-
-        high_conf_smells = [s for s in smells if s.get("confidence", 0) > 0.6]
-        if high_conf_smells:
-            parts.append(f"{len(high_conf_smells)} code smell(s) detected")
+        high_conf_smells = sum(1 for s in smells or () if s.get("confidence", 0) > 0.6)
+        counts = (
+            (len(runtime_risks), "runtime risk(s)"),
+            (len(logical_concerns), "logical concern(s)"),
+            (len(optimizations), "optimization(s) available"),
+            (high_conf_smells, "code smell(s) detected"),
+        )
 
-        if not runtime_risks and not logical_concerns and not optimizations and not high_conf_smells:
+        # Clean code is the common case: return before formatting anything
+        if not any(n for n, _ in counts):
             return "✓ Code looks good! No issues detected."
 
-        return " | ".join(parts)
+        head = (
+            f"{len(compile_result.errors)} compile-time error(s)"
+            if compile_result.has_errors else "✓ No compile-time errors"
+        )
+        return " | ".join([head, *(f"{n} {label}" for n, label in counts if n)])
@@ -15,15 +15,41 @@ This gives the Agile team an early warning of impending technical debt explosion
 """
 
 import math
-import statistics
 from typing import Dict, Any, List, Optional
 
+import numpy as np
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+def _batch_p_exceed_py(mu: np.ndarray, sigma: np.ndarray, thr: np.ndarray) -> np.ndarray:
+    """Vectorised SprintRiskModel._p_exceed over parallel float64 arrays."""
+    out = np.empty(mu.shape[0], dtype=np.float64)
+    sqrt2 = math.sqrt(2.0)
+    for i in range(mu.shape[0]):
+        if sigma[i] <= 0.0:
+            out[i] = 1.0 if mu[i] > thr[i] else 0.0
+        else:
+            out[i] = 0.5 * math.erfc((thr[i] - mu[i]) / (sigma[i] * sqrt2))
+    return out
+
+
+if NUMBA_AVAILABLE:
+    _batch_p_exceed = njit(cache=True, fastmath=True)(_batch_p_exceed_py)
+else:
+    _batch_p_exceed = _batch_p_exceed_py
+
 
 class SprintRiskModel:
     """
     Predicts smell accumulation risk for the next sprint.
 
-    No external dependencies — pure Python stdlib.
+    History statistics are computed with NumPy so long multi-team
+    histories stay cheap to re-score.
     """
 
     def predict(
@@ -44,17 +70,65 @@ class SprintRiskModel:
             Dict with keys: risk_probability, predicted_smell_count,
                             threshold, trend, recommendation
         """
-        refactor_history = refactor_history or []
+        drift, predicted, sigma = self._estimate(smell_history, refactor_history or [])
 
-        # Estimate λ: average increase per sprint
-        deltas = [
-            smell_history[i] - smell_history[i - 1]
-            for i in range(1, len(smell_history))
+        # P(S > threshold) using normal CDF approximation
+        risk_prob = self._p_exceed(predicted, sigma, threshold)
+
+        return self._build_result(risk_prob, drift, predicted, threshold)
+
+    def predict_batch(
+        self,
+        histories: List[List[int]],
+        refactor_histories: Optional[List[Optional[List[int]]]] = None,
+        threshold: int = 10,
+    ) -> List[Dict[str, Any]]:
+        """
+        Score many modules/teams at once (e.g. for a risk dashboard).
+
+        The per-history statistics are gathered first, then all exceedance
+        probabilities are computed in one kernel call (Numba-compiled when
+        numba is installed).
+
+        Args:
+            histories:          One smell-count history per module
+            refactor_histories: Matching refactor histories (optional)
+            threshold:          Maximum acceptable smell count
+
+        Returns:
+            List of result dicts in the same order as ``histories``
+        """
+        if not histories:
+            return []
+        refactor_histories = refactor_histories or [None] * len(histories)
+
+        estimates = [
+            self._estimate(smells, refactors or [])
+            for smells, refactors in zip(histories, refactor_histories)
+        ]
+        predicted = np.array([pred for _, pred, _ in estimates], dtype=np.float64)
+        sigmas = np.array([sigma for _, _, sigma in estimates], dtype=np.float64)
+        thresholds = np.full(len(estimates), float(threshold))
+
+        risks = _batch_p_exceed(predicted, sigmas, thresholds)
+
+        return [
+            self._build_result(float(risk), drift, pred, threshold)
+            for risk, (drift, pred, _) in zip(risks, estimates)
         ]
-        lambda_rate = max(statistics.mean(deltas), 0) if deltas else 0
+
+    # ------------------------------------------------------------------
+    # Private helpers
+    # ------------------------------------------------------------------
+
+    def _estimate(self, smell_history: List[int], refactor_history: List[int]):
+        """Return (drift, predicted next-sprint count, sigma) for one history."""
+        # Estimate λ: average increase per sprint
+        deltas = np.diff(np.asarray(smell_history, dtype=np.float64))
+        lambda_rate = max(float(deltas.mean()), 0.0) if deltas.size else 0.0
 
         # Estimate μ: average refactorings per sprint
-        mu_rate = statistics.mean(refactor_history) if refactor_history else 0
+        mu_rate = float(np.mean(refactor_history)) if refactor_history else 0.0
 
         # Net drift per sprint
         drift = lambda_rate - mu_rate
@@ -66,32 +140,25 @@ class SprintRiskModel:
         predicted = max(current + drift, 0)
 
         # Variance: use std dev of deltas (captures process noise)
-        if len(deltas) >= 2:
-            sigma = statistics.stdev(deltas)
+        if deltas.size >= 2:
+            sigma = float(deltas.std(ddof=1))
         else:
             sigma = max(abs(drift) * 0.5, 1.0)  # Fallback estimate
 
-        # P(S > threshold) using normal CDF approximation
-        risk_prob = self._p_exceed(predicted, sigma, threshold)
-
-        # Classify trend
-        trend = self._classify_trend(drift, predicted, threshold)
-
-        # Recommendation
-        recommendation = self._recommendation(risk_prob, drift, threshold, predicted)
+        return drift, predicted, sigma
 
+    def _build_result(
+        self, risk_prob: float, drift: float, predicted: float, threshold: int
+    ) -> Dict[str, Any]:
+        """Assemble the response dict for one prediction."""
         return {
             "risk_probability": round(min(risk_prob, 1.0), 4),
             "predicted_smell_count": round(predicted, 2),
             "threshold": threshold,
-            "trend": trend,
-            "recommendation": recommendation,
+            "trend": self._classify_trend(drift, predicted, threshold),
+            "recommendation": self._recommendation(risk_prob, drift, threshold, predicted),
         }
 
-    # ------------------------------------------------------------------
-    # Private helpers
-    # ------------------------------------------------------------------
-
     def _p_exceed(self, mu: float, sigma: float, threshold: int) -> float:
         """
         P(X > threshold) where X ~ Normal(mu, sigma).
@@ -1,28 +1,55 @@
 """
-JSON-File Sprint Store.
+JSONL-File Sprint Store.
 
 Persists sprint smell data without requiring a database.
-Data is stored in backend/agile_risk/sprint_data.json.
+Data is stored in backend/agile_risk/sprint_data.jsonl, one sprint record
+per line, so logging a sprint is a single append instead of a full rewrite.
 This is the MVP approach — swap for TimescaleDB in production.
 """
 
 import json
+import mmap
 import os
-from datetime import datetime
-from typing import Dict, List, Any, Optional
+import time
+from datetime import datetime, timedelta
+from typing import Dict, List, Any, Optional, Iterator
 from pathlib import Path
 
-_DATA_FILE = Path(__file__).parent / "sprint_data.json"
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+_DATA_FILE = Path(__file__).parent / "sprint_data.jsonl"
+_EPOCH = datetime(1970, 1, 1)
+
+
+def _dumps(record: Dict[str, Any]) -> bytes:
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(record)
+    return json.dumps(record, separators=(",", ":")).encode("utf-8")
+
+
+def _format_timestamp(timestamp_ns: int) -> str:
+    """Render epoch nanoseconds as the naive-UTC ISO string older records use."""
+    return (_EPOCH + timedelta(microseconds=timestamp_ns // 1000)).isoformat()
+
+
+def _loads(line: bytes) -> Any:
+    if ORJSON_AVAILABLE:
+        return orjson.loads(line)
+    return json.loads(line)
 
 
 class SprintStore:
     """
-    Simple JSON file-based store for sprint metrics.
+    Simple JSON Lines file-based store for sprint metrics.
 
-    Each entry:
+    Each line:
         {
             "sprint_id":      "Sprint-1",
-            "timestamp":      "2026-02-27T09:00:00",
+            "timestamp_ns":   1772182800000000000,   # UTC epoch nanoseconds
             "smell_count":    12,
             "refactor_count": 3,
             "module":         "backend"
@@ -30,9 +57,9 @@ class SprintStore:
     """
 
     def __init__(self):
-        """Ensure data file exists."""
+        """Ensure data file exists (migrating a legacy sprint_data.json once)."""
         if not _DATA_FILE.exists():
-            _DATA_FILE.write_text(json.dumps({"sprints": []}, indent=2))
+            self._save(self._load_legacy())
 
     # ------------------------------------------------------------------
     # Write
@@ -45,16 +72,16 @@ class SprintStore:
         refactor_count: int = 0,
         module: str = "default",
     ) -> None:
-        """Append a sprint record."""
-        data = self._load()
-        data["sprints"].append({
+        """Append a sprint record (O(1) — existing history is not read)."""
+        record = {
             "sprint_id": sprint_id,
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp_ns": time.time_ns(),
             "smell_count": smell_count,
             "refactor_count": refactor_count,
             "module": module,
-        })
-        self._save(data)
+        }
+        with _DATA_FILE.open("ab") as f:
+            f.write(_dumps(record) + b"\n")
 
     def update_latest_sprint(self, smells_delta: int, refactor_delta: int) -> Optional[str]:
         """Update the most recent sprint with new smell/refactor deltas."""
@@ -66,7 +93,7 @@ class SprintStore:
         latest_sprint["smell_count"] = max(0, latest_sprint["smell_count"] + smells_delta)
         latest_sprint["refactor_count"] = max(0, latest_sprint.get("refactor_count", 0) + refactor_delta)
         
-        self._save(data)
+        self._save(data["sprints"])
         return latest_sprint["sprint_id"]
 
     def delete_sprint(self, sprint_id: str) -> bool:
@@ -76,7 +103,7 @@ class SprintStore:
         data["sprints"] = [s for s in data.get("sprints", []) if s["sprint_id"] != sprint_id]
         
         if len(data["sprints"]) < initial_count:
-            self._save(data)
+            self._save(data["sprints"])
             return True
         return False
 
@@ -89,6 +116,11 @@ class SprintStore:
         data = self._load()
         sprints = data.get("sprints", [])
 
+        # Integer timestamps are only formatted here, for display
+        for s in sprints:
+            if "timestamp" not in s and "timestamp_ns" in s:
+                s["timestamp"] = _format_timestamp(s["timestamp_ns"])
+
         smell_counts = [s["smell_count"] for s in sprints]
         refactor_counts = [s["refactor_count"] for s in sprints]
 
@@ -109,26 +141,57 @@ class SprintStore:
 
     def get_smell_history(self) -> List[int]:
         """Return just the smell count list (for risk model)."""
-        data = self._load()
-        return [s["smell_count"] for s in data.get("sprints", [])]
+        return [s["smell_count"] for s in self._iter_sprints()]
 
     def get_refactor_history(self) -> List[int]:
         """Return just the refactor count list (for risk model)."""
-        data = self._load()
-        return [s["refactor_count"] for s in data.get("sprints", [])]
+        return [s["refactor_count"] for s in self._iter_sprints()]
 
     # ------------------------------------------------------------------
     # Private
     # ------------------------------------------------------------------
 
+    def _iter_sprints(self) -> Iterator[Dict[str, Any]]:
+        """
+        Yield sprint records lazily; unreadable lines are skipped.
+
+        The file is memory-mapped so lines are sliced straight out of the
+        page cache and handed to the JSON parser as bytes, without a
+        whole-file read or UTF-8 decode.
+        """
+        try:
+            with _DATA_FILE.open("rb") as f:
+                if os.fstat(f.fileno()).st_size == 0:
+                    return  # mmap cannot map an empty file
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    for line in iter(mm.readline, b""):
+                        if not line.strip():
+                            continue
+                        try:
+                            record = _loads(line)
+                        except ValueError:
+                            continue
+                        if isinstance(record, dict):
+                            yield record
+        except OSError:
+            return
+
     def _load(self) -> Dict:
+        return {"sprints": list(self._iter_sprints())}
+
+    def _save(self, sprints: List[Dict[str, Any]]) -> None:
+        """Rewrite the whole file (only needed for updates and deletes)."""
+        tmp_file = _DATA_FILE.with_suffix(".jsonl.tmp")
+        tmp_file.write_bytes(b"".join(_dumps(s) + b"\n" for s in sprints))
+        os.replace(tmp_file, _DATA_FILE)
+
+    def _load_legacy(self) -> List[Dict[str, Any]]:
+        """Read sprints from the pre-JSONL sprint_data.json, if present."""
         try:
-            return json.loads(_DATA_FILE.read_text())
+            legacy_file = _DATA_FILE.with_suffix(".json")
+            return json.loads(legacy_file.read_text()).get("sprints", [])
         except Exception:
-            return {"sprints": []}
-
-    def _save(self, data: Dict) -> None:
-        _DATA_FILE.write_text(json.dumps(data, indent=2))
+            return []
 
     def _compute_trend(self, counts: List[int]) -> str:
         if len(counts) < 2:
@@ -139,3 +202,19 @@ class SprintStore:
         elif delta < -2:
             return "decreasing"
         return "stable"
+
+
+if __name__ == "__main__":
+    # Records are written compact; `python -m agile_risk.sprint_store --pretty`
+    # re-renders the store indented for a human to read
+    import argparse
+    import sys
+
+    parser = argparse.ArgumentParser(description="Dump the sprint store.")
+    parser.add_argument("--pretty", action="store_true", help="indent the output")
+    args = parser.parse_args()
+
+    if args.pretty:
+        print(json.dumps(SprintStore().get_all(), indent=2))
+    elif _DATA_FILE.exists():
+        sys.stdout.write(_DATA_FILE.read_text())
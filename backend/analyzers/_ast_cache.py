@@ -0,0 +1,49 @@
+"""
+Shared parse cache for the analyzers.
+
+Several analyzers may parse the same submission; they all go through
+get_ast() so the source is parsed once. Trees are shared between callers
+and must be treated as read-only.
+
+Trees are kept in memory only. Unpickling a tree costs almost as much as
+parsing it, so unchanged files are reused across runs one level up,
+by caching their extracted features (see feature_cache). JavaScript
+trees are far slower to build and are cached separately (js_tree_cache).
+"""
+
+import ast
+import hashlib
+import threading
+from functools import lru_cache
+from typing import List, Tuple
+
+# Some CPython 3.11 builds share the AST converter's recursion counter
+# between threads; concurrent parses then fail with "AST constructor
+# recursion depth mismatch", so parses are serialized
+_parse_lock = threading.Lock()
+
+
+@lru_cache(maxsize=256)
+def get_ast(code: str) -> ast.Module:
+    """
+    Parse ``code``, reusing the tree from an earlier call on the same source.
+
+    Raises the same SyntaxError / ValueError as ``ast.parse``; failures are
+    not cached.
+    """
+    with _parse_lock:
+        return ast.parse(code)
+
+
+def definition_span(node: ast.AST, lines: List[str]) -> Tuple[int, int, bytes]:
+    """
+    Locate a def/class and fingerprint its source for incremental reuse.
+
+    Returns ``(first_line, last_line, digest)``. Decorator lines are
+    included, since they are part of the node. The digest is a 64-bit
+    blake2b of those source lines.
+    """
+    start = min([node.lineno] + [d.lineno for d in getattr(node, "decorator_list", ())])
+    end = node.end_lineno or node.lineno
+    source = "\n".join(lines[start - 1:end]).encode("utf-8", "surrogatepass")
+    return start, end, hashlib.blake2b(source, digest_size=8).digest()
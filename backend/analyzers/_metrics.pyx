@@ -0,0 +1,86 @@
+# cython: language_level=3, boundscheck=False, wraparound=False
+"""
+Compiled version of FeatureExtractor._walk_function_metrics.
+
+Optional: feature_extractor.py uses it when the extension is built and
+falls back to the pure-Python walk otherwise. Build in place with:
+
+    pip install cython
+    cythonize -i analyzers/_metrics.pyx
+
+Results are identical to the Python walk, including the breadth-first
+(ast.walk) order of ``all_calls``.
+"""
+
+import ast
+
+cdef object AST = ast.AST
+cdef object Name = ast.Name
+cdef object Attribute = ast.Attribute
+cdef object Call = ast.Call
+cdef object BoolOp = ast.BoolOp
+cdef frozenset DECISION_NODES = frozenset({
+    ast.If, ast.For, ast.While, ast.ExceptHandler,
+    ast.With, ast.Assert, ast.comprehension,
+})
+
+
+cpdef tuple function_metrics(object node, set class_methods, set ext_names):
+    """
+    Compute complexity, call counts and CBO references in one traversal.
+
+    Returns:
+        (complexity, local_calls, external_calls, all_calls, cbo_refs)
+    """
+    cdef Py_ssize_t complexity = 1  # Base path
+    cdef Py_ssize_t local = 0
+    cdef Py_ssize_t external = 0
+    cdef list all_calls = []
+    cdef set cbo_refs = set()
+
+    # Breadth-first queue: a list plus a read position (nothing is popped)
+    cdef list queue = [node]
+    cdef Py_ssize_t head = 0
+    cdef object n, n_type, func, func_type, value, item, name
+
+    while head < len(queue):
+        n = queue[head]
+        head += 1
+        n_type = type(n)
+
+        if n_type in DECISION_NODES:
+            complexity += 1
+        elif n_type is BoolOp:
+            # 'and' / 'or' each add a branch
+            complexity += len(n.values) - 1
+        elif n_type is Call:
+            func = n.func
+            func_type = type(func)
+            if func_type is Name:
+                name = func.id
+                all_calls.append(name)
+                if name in class_methods:
+                    local += 1
+                elif name in ext_names:
+                    external += 1
+            elif func_type is Attribute:
+                all_calls.append(f"{getattr(func.value, 'id', '?')}.{func.attr}")
+                if type(func.value) is Name and func.value.id != "self":
+                    external += 1
+                else:
+                    local += 1
+        elif n_type is Attribute and type(n.value) is Name:
+            # CBO: attribute references to external names
+            if n.value.id in ext_names and n.value.id != "self":
+                cbo_refs.add(n.value.id)
+
+        for name in n._fields:
+            value = getattr(n, name, None)
+            if isinstance(value, AST):
+                queue.append(value)
+            elif type(value) is list:
+                for item in <list>value:
+                    if isinstance(item, AST):
+                        queue.append(item)
+
+    return complexity, local, external, all_calls, cbo_refs
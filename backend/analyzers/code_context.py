@@ -0,0 +1,57 @@
+"""
+Shared analysis context for one source buffer.
+
+The code is parsed once and walked once; analyzers read the node lists
+collected here instead of each running its own ast.walk over the tree.
+"""
+
+import ast
+from dataclasses import dataclass, field
+from typing import List, Optional
+from analyzers._ast_cache import get_ast
+
+
+@dataclass(slots=True, eq=False)
+class CodeContext:
+    """Parsed AST plus the nodes analyzers look up, in ast.walk order."""
+    code: str
+    tree: ast.Module = field(repr=False)
+    imports: List[ast.stmt] = field(default_factory=list, repr=False)        # Import / ImportFrom
+    calls: List[ast.Call] = field(default_factory=list, repr=False)
+    function_defs: List[ast.stmt] = field(default_factory=list, repr=False)  # FunctionDef / AsyncFunctionDef
+    loops: List[ast.stmt] = field(default_factory=list, repr=False)          # For / AsyncFor / While
+
+    @classmethod
+    def build(cls, code: str, tree: Optional[ast.Module] = None) -> Optional["CodeContext"]:
+        """
+        Collect the context for ``code`` in a single tree walk.
+
+        Args:
+            code: Python source code
+            tree: Optional pre-parsed AST of ``code`` (skips re-parsing)
+
+        Returns:
+            CodeContext, or None if the code does not parse
+        """
+        if tree is None:
+            try:
+                tree = get_ast(code)
+            except SyntaxError:
+                return None
+
+        ctx = cls(code=code, tree=tree)
+        buckets = {
+            ast.Import: ctx.imports,
+            ast.ImportFrom: ctx.imports,
+            ast.Call: ctx.calls,
+            ast.FunctionDef: ctx.function_defs,
+            ast.AsyncFunctionDef: ctx.function_defs,
+            ast.For: ctx.loops,
+            ast.AsyncFor: ctx.loops,
+            ast.While: ctx.loops,
+        }
+        for node in ast.walk(tree):
+            bucket = buckets.get(type(node))
+            if bucket is not None:
+                bucket.append(node)
+        return ctx
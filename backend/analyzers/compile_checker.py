@@ -4,12 +4,53 @@ NO AI needed - uses deterministic parsing and syntax validation.
 """
 
 import ast
+import re
 import sys
+import hashlib
+import threading
+from collections import OrderedDict
 from typing import List, Dict, Optional
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from analyzers._ast_cache import get_ast
+from analyzers.code_context import CodeContext
 
 
-@dataclass
+# Number of recent check() results kept in memory (editor buffers are
+# often re-submitted unchanged)
+_CACHE_SIZE = 128
+
+
+# Compound statement missing its trailing colon, e.g. "if x > 0"
+_MISSING_COLON = re.compile(r'^\s*(if|def|for|while)\b[^:]*$')
+
+_MISSING_COLON_SUGGESTIONS = {
+    "if": "Add colon ':' after if condition",
+    "def": "Add colon ':' after function definition",
+    "for": "Add colon ':' after for statement",
+    "while": "Add colon ':' after while condition",
+}
+
+
+def _invalid_syntax_suggestion(text: Optional[str]) -> str:
+    match = _MISSING_COLON.match(text) if text else None
+    if match:
+        return _MISSING_COLON_SUGGESTIONS[match.group(1)]
+    return "Check syntax - missing colon, parenthesis, or bracket"
+
+
+# Checked in order against the SyntaxError message - first match wins
+_SUGGESTION_RULES = (
+    (re.compile(r'invalid syntax', re.I), _invalid_syntax_suggestion),
+    (re.compile(r'unexpected eof|expected', re.I),
+     lambda text: "Check for unclosed parentheses, brackets, or quotes"),
+    (re.compile(r'indent', re.I),
+     lambda text: "Fix indentation - use consistent spaces or tabs"),
+    (re.compile(r'unterminated string', re.I),
+     lambda text: "Add closing quote to string"),
+)
+
+
+@dataclass(slots=True)
 class CompileError:
     """Represents a compile-time error."""
     type: str  # "SyntaxError", "ImportError", etc.
@@ -19,16 +60,22 @@ class CompileError:
     suggestion: str
 
 
-@dataclass
+@dataclass(slots=True)
 class CompileTimeResult:
     """Result of compile-time analysis."""
     status: str  # "ok" or "error"
     errors: List[CompileError]
+    context: Optional[CodeContext] = field(default=None, repr=False, compare=False)  # Parsed + walked once, shared with other analyzers
     
     @property
     def has_errors(self) -> bool:
         """Check if there are any errors."""
         return len(self.errors) > 0
+    
+    @property
+    def tree(self) -> Optional[ast.Module]:
+        """Parsed AST of the checked code (None if it did not parse)."""
+        return self.context.tree if self.context is not None else None
 
 
 class CompileTimeChecker:
@@ -37,21 +84,47 @@ class CompileTimeChecker:
     Fast, deterministic, no AI required.
     """
     
+    def __init__(self):
+        self._cache: "OrderedDict[bytes, CompileTimeResult]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+    
     def check(self, code: str) -> CompileTimeResult:
         """
         Check code for compile-time errors.
         
+        Results are memoized by a hash of the source. The parsed AST and
+        the nodes collected from it are attached as ``result.context`` so
+        downstream analyzers can skip re-parsing and re-walking; they are
+        shared and must be treated as read-only.
+        
         Args:
             code: Python source code as string
             
         Returns:
             CompileTimeResult with status and any errors found
         """
+        key = hashlib.blake2b(code.encode("utf-8", "surrogatepass"), digest_size=16).digest()
+        with self._cache_lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+                return cached
+        
+        result = self._check_uncached(code)
+        
+        with self._cache_lock:
+            self._cache[key] = result
+            if len(self._cache) > _CACHE_SIZE:
+                self._cache.popitem(last=False)
+        return result
+    
+    def _check_uncached(self, code: str) -> CompileTimeResult:
+        """Run the actual checks (single parse shared by every step)."""
         errors = []
         
         # Step 1: Try to parse with AST
         try:
-            ast.parse(code)
+            tree = get_ast(code)
         except SyntaxError as e:
             errors.append(self._handle_syntax_error(e))
             # If syntax error, can't continue with other checks
@@ -66,11 +139,13 @@ class CompileTimeChecker:
             ))
             return CompileTimeResult(status="error", errors=errors)
         
-        # Step 2: Try to compile (catches some additional errors)
+        # Step 2: Compile the parsed tree (catches symbol-table errors such
+        # as 'return' outside function) without re-parsing the source.
+        # optimize=2 skips codegen for asserts/docstrings - the bytecode is
+        # thrown away, only the errors matter.
         try:
-            compile(code, '<string>', 'exec')
+            compile(tree, '<string>', 'exec', dont_inherit=True, optimize=2)
         except SyntaxError as e:
-            # Should have been caught by AST, but just in case
             errors.append(self._handle_syntax_error(e))
         except Exception as e:
             errors.append(CompileError(
@@ -82,13 +157,14 @@ class CompileTimeChecker:
             ))
         
         # Step 3: Check for common import issues (static analysis)
-        import_errors = self._check_imports(code)
+        context = CodeContext.build(code, tree)
+        import_errors = self._check_imports(context.imports)
         errors.extend(import_errors)
         
         if errors:
-            return CompileTimeResult(status="error", errors=errors)
+            return CompileTimeResult(status="error", errors=errors, context=context)
         else:
-            return CompileTimeResult(status="ok", errors=[])
+            return CompileTimeResult(status="ok", errors=[], context=context)
     
     def _handle_syntax_error(self, e: SyntaxError) -> CompileError:
         """Convert SyntaxError to CompileError with helpful suggestion."""
@@ -109,75 +185,50 @@ class CompileTimeChecker:
     
     def _get_syntax_suggestion(self, message: str, text: Optional[str]) -> str:
         """Generate helpful suggestion for syntax errors."""
-        message_lower = message.lower()
-        
-        if "invalid syntax" in message_lower:
-            if text and "if " in text and ":" not in text:
-                return "Add colon ':' after if condition"
-            elif text and "def " in text and ":" not in text:
-                return "Add colon ':' after function definition"
-            elif text and "for " in text and ":" not in text:
-                return "Add colon ':' after for statement"
-            elif text and "while " in text and ":" not in text:
-                return "Add colon ':' after while condition"
-            else:
-                return "Check syntax - missing colon, parenthesis, or bracket"
-        
-        elif "unexpected eof" in message_lower or "expected" in message_lower:
-            return "Check for unclosed parentheses, brackets, or quotes"
-        
-        elif "indent" in message_lower:
-            return "Fix indentation - use consistent spaces or tabs"
-        
-        elif "unterminated string" in message_lower:
-            return "Add closing quote to string"
-        
-        else:
-            return "Review Python syntax documentation"
+        for pattern, suggest in _SUGGESTION_RULES:
+            if pattern.search(message):
+                return suggest(text)
+        return "Review Python syntax documentation"
     
-    def _check_imports(self, code: str) -> List[CompileError]:
+    def _check_imports(self, imports: List[ast.stmt]) -> List[CompileError]:
         """
         Check for potential import issues (static analysis only).
         Does NOT actually try to import - just checks syntax.
         """
         errors = []
-        
-        try:
-            tree = ast.parse(code)
+        for node in imports:
+            # Only ImportFrom nodes can trigger a warning
+            if not isinstance(node, ast.ImportFrom):
+                continue
             
-            for node in ast.walk(tree):
-                # Check for relative imports without package context
-                if isinstance(node, ast.ImportFrom):
-                    if node.level > 0:  # Relative import
-                        errors.append(CompileError(
-                            type="ImportWarning",
-                            line=node.lineno,
-                            column=node.col_offset,
-                            message=f"Relative import detected: {node.module or ''}",
-                            suggestion="Relative imports may fail outside package context"
-                        ))
-                
-                # Check for import * (not an error, but worth noting)
-                if isinstance(node, (ast.Import, ast.ImportFrom)):
-                    if isinstance(node, ast.ImportFrom) and node.names:
-                        for alias in node.names:
-                            if alias.name == '*':
-                                errors.append(CompileError(
-                                    type="ImportWarning",
-                                    line=node.lineno,
-                                    column=node.col_offset,
-                                    message="Wildcard import detected (import *)",
-                                    suggestion="Consider importing specific names for clarity"
-                                ))
-        
-        except Exception:
-            # If AST parsing fails, we already caught it in main check
-            pass
-        
+            # Check for relative imports without package context
+            if node.level > 0:
+                errors.append(CompileError(
+                    type="ImportWarning",
+                    line=node.lineno,
+                    column=node.col_offset,
+                    message=f"Relative import detected: {node.module or ''}",
+                    suggestion="Relative imports may fail outside package context"
+                ))
+            
+            # Check for import * (not an error, but worth noting)
+            if any(alias.name == '*' for alias in node.names):
+                errors.append(CompileError(
+                    type="ImportWarning",
+                    line=node.lineno,
+                    column=node.col_offset,
+                    message="Wildcard import detected (import *)",
+                    suggestion="Consider importing specific names for clarity"
+                ))
         return errors
     
     def to_dict(self, result: CompileTimeResult) -> Dict:
-        """Convert result to dictionary for JSON serialization."""
+        """
+        Convert result to dictionary for JSON serialization.
+        
+        The API layer renders this with orjson; ``result.context`` is
+        deliberately left out (AST nodes are not serializable).
+        """
         return {
             "status": result.status,
             "errors": [
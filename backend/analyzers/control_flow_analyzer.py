@@ -11,11 +11,59 @@ Detects:
 """
 
 import ast
-from typing import List, Dict, Optional, Set, Tuple
-from dataclasses import dataclass, asdict
+import threading
+import weakref
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from typing import Iterator, List, Dict, Optional, Tuple
+from dataclasses import dataclass
+from analyzers._ast_cache import definition_span, get_ast
+from analyzers.universal_ast_analyzer import get_analyzer
 
 
-@dataclass
+# Per-definition issue lists kept for re-analysis of edited files
+_DEFINITION_CACHE_SIZE = 512
+
+_DEFINITION_TYPES = (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)
+
+# A break inside one of these never exits an enclosing loop
+_LOOP_TYPES = frozenset({ast.While, ast.For, ast.AsyncFor})
+_SCOPE_TYPES = frozenset({ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef, ast.Lambda})
+
+# A break is a statement, so searches for one only descend into these
+_STMT_CONTAINERS = (ast.stmt, ast.excepthandler, ast.match_case)
+
+
+# Source text of single comparison operators, for _cheap_unparse
+_CMP_OP = {
+    ast.Eq: '==', ast.NotEq: '!=', ast.Lt: '<', ast.LtE: '<=', ast.Gt: '>',
+    ast.GtE: '>=', ast.Is: 'is', ast.IsNot: 'is not', ast.In: 'in', ast.NotIn: 'not in',
+}
+
+# Constant types whose repr() matches ast.unparse() (floats differ on inf/nan)
+_REPR_CONSTANT_TYPES = (int, str, bool, type(None))
+
+
+def _is_repr_constant(node: ast.AST) -> bool:
+    # kind is 'u' for u'' literals, which unparse keeps
+    return type(node) is ast.Constant and type(node.value) in _REPR_CONSTANT_TYPES and node.kind is None
+
+
+def _cheap_unparse(node: ast.AST) -> str:
+    """ast.unparse with fast paths for names, constants and simple comparisons"""
+    if type(node) is ast.Name:
+        return node.id
+    if _is_repr_constant(node):
+        return repr(node.value)
+    if type(node) is ast.Compare and len(node.ops) == 1:
+        left, right = node.left, node.comparators[0]
+        if (type(left) is ast.Name or _is_repr_constant(left)) and \
+           (type(right) is ast.Name or _is_repr_constant(right)):
+            return f"{_cheap_unparse(left)} {_CMP_OP[type(node.ops[0])]} {_cheap_unparse(right)}"
+    return ast.unparse(node)
+
+
+@dataclass(slots=True, frozen=True)
 class CFGNode:
     """Control Flow Graph Node"""
     id: str
@@ -25,16 +73,29 @@ class CFGNode:
     is_problematic: bool = False
     problem_description: Optional[str] = None
 
+    def to_dict(self) -> Dict:
+        return {
+            'id': self.id,
+            'type': self.type,
+            'label': self.label,
+            'line': self.line,
+            'is_problematic': self.is_problematic,
+            'problem_description': self.problem_description,
+        }
+
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class CFGEdge:
     """Control Flow Graph Edge"""
     from_node: str
     to_node: str
     label: Optional[str] = None  # 'true', 'false', etc.
 
+    def to_dict(self) -> Dict:
+        return {'from_node': self.from_node, 'to_node': self.to_node, 'label': self.label}
 
-@dataclass
+
+@dataclass(slots=True, frozen=True)
 class ControlFlowIssue:
     """Detected control flow issue"""
     type: str  # 'infinite_loop', 'unreachable_code', 'variable_not_updated'
@@ -42,6 +103,14 @@ class ControlFlowIssue:
     description: str
     severity: str  # 'error', 'warning'
 
+    def to_dict(self) -> Dict:
+        return {
+            'type': self.type,
+            'line': self.line,
+            'description': self.description,
+            'severity': self.severity,
+        }
+
 
 @dataclass
 class ControlFlowResult:
@@ -54,19 +123,12 @@ class ControlFlowResult:
     
     def to_dict(self) -> Dict:
         """Convert to dictionary for JSON serialization"""
-        # Handle issues that might already be dicts (from universal analyzer)
-        issues_list = []
-        for issue in self.issues:
-            if isinstance(issue, dict):
-                issues_list.append(issue)
-            else:
-                issues_list.append(asdict(issue))
-        
+        # Issues from the universal analyzer are already dicts
         return {
             'has_issues': self.has_issues,
-            'issues': issues_list,
-            'graph_nodes': [asdict(node) for node in self.graph_nodes],
-            'graph_edges': [asdict(edge) for edge in self.graph_edges],
+            'issues': [issue if isinstance(issue, dict) else issue.to_dict() for issue in self.issues],
+            'graph_nodes': [node.to_dict() for node in self.graph_nodes],
+            'graph_edges': [edge.to_dict() for edge in self.graph_edges],
             'mermaid_code': self.mermaid_code
         }
 
@@ -74,21 +136,31 @@ class ControlFlowResult:
 class ControlFlowAnalyzer:
     """Analyzes code for control flow issues across multiple languages"""
     
-    def analyze(self, code: str, language: str = "python") -> ControlFlowResult:
+    def __init__(self):
+        # Issues of unchanged top-level functions/classes are reused when
+        # the same file is re-analyzed after an edit elsewhere
+        self._definition_cache: "OrderedDict[tuple, Tuple[List[ControlFlowIssue], List[ControlFlowIssue]]]" = OrderedDict()
+        self._definition_cache_lock = threading.Lock()
+        # Statement spans sorted by start line, built once per (shared) tree
+        self._line_indexes: "weakref.WeakKeyDictionary[ast.AST, Tuple[List[int], List[Tuple[int, ast.stmt]]]]" = weakref.WeakKeyDictionary()
+        # while node -> "has its own break", recorded by the issue walk so
+        # graph generation does not search the loop again
+        self._loop_breaks: "weakref.WeakKeyDictionary[ast.While, bool]" = weakref.WeakKeyDictionary()
+    
+    def analyze(self, code: str, language: str = "python", tree: Optional[ast.AST] = None) -> ControlFlowResult:
         """
         Main analysis entry point.
         Returns control flow issues and graph visualization data.
-        """
-        # Import here to avoid circular dependency
-        from analyzers.universal_ast_analyzer import UniversalASTAnalyzer
         
-        tree = None
+        ``tree`` may carry an already-parsed Python AST of ``code`` so the
+        source is not parsed again.
+        """
         issues = []
         
         try:
-            tree, issues = self._analyze_supported_language(code, language, UniversalASTAnalyzer)
+            tree, issues = self._analyze_supported_language(code, language, tree)
         except ValueError:
-            tree, issues = self._analyze_fallback(code)
+            tree, issues = self._analyze_fallback(code, tree)
             
         nodes, edges = self._build_graph_for_first_issue(tree, issues, code)
         # Convert to Mermaid syntax
@@ -103,9 +175,29 @@ class ControlFlowAnalyzer:
             mermaid_code=mermaid_code
         )
         
-    def _analyze_supported_language(self, code: str, language: str, UniversalASTAnalyzer) -> Tuple[Optional[ast.AST], List[ControlFlowIssue]]:
-        analyzer = UniversalASTAnalyzer(language)
-        raw_issues = analyzer.find_infinite_loops(code) + analyzer.find_unreachable_code(code)
+    def _analyze_supported_language(self, code: str, language: str, tree: Optional[ast.AST] = None) -> Tuple[Optional[ast.AST], List[ControlFlowIssue]]:
+        analyzer = get_analyzer(language)
+        if language.lower() == 'python':
+            if tree is None:
+                try:
+                    tree = get_ast(code)
+                except SyntaxError:
+                    return None, []
+            # One walk covers everything the universal analyzer's Python
+            # checks would report, so they are not run separately.
+            # Issues are sorted into report order as statements stream in.
+            infinite: List[ControlFlowIssue] = []
+            unreachable: List[ControlFlowIssue] = []
+            others: List[ControlFlowIssue] = []
+            for loop_issues, stmt_unreachable in self._iter_python_issues(code, tree):
+                for issue in loop_issues:
+                    (infinite if issue.type == 'infinite_loop' else others).append(issue)
+                unreachable.extend(stmt_unreachable)
+            return tree, infinite + unreachable + others
+
+        tree = None
+        found = analyzer.find_issues(code, tree)
+        raw_issues = found['infinite_loops'] + found['unreachable_code']
         
         issues = []
         for issue in raw_issues:
@@ -119,99 +211,63 @@ class ControlFlowAnalyzer:
             else:
                 issues.append(issue)
                 
-        tree = None
-        if language.lower() == 'python':
-            try:
-                tree = ast.parse(code)
-                for py_issue in self._detect_infinite_loops(tree):
-                    if py_issue.type != 'infinite_loop':
-                        issues.append(py_issue)
-            except SyntaxError:
-                pass
-                
         return tree, issues
         
-    def _analyze_fallback(self, code: str) -> Tuple[Optional[ast.AST], List[ControlFlowIssue]]:
-        try:
-            tree = ast.parse(code)
-        except SyntaxError:
-            return None, []
+    def _analyze_fallback(self, code: str, tree: Optional[ast.AST] = None) -> Tuple[Optional[ast.AST], List[ControlFlowIssue]]:
+        if tree is None:
+            try:
+                tree = get_ast(code)
+            except SyntaxError:
+                return None, []
             
-        issues = self._detect_infinite_loops(tree) + self._detect_unreachable_code(tree)
-        return tree, issues
-        
+        loop_issues: List[ControlFlowIssue] = []
+        unreachable: List[ControlFlowIssue] = []
+        for stmt_loop_issues, stmt_unreachable in self._iter_python_issues(code, tree):
+            loop_issues.extend(stmt_loop_issues)
+            unreachable.extend(stmt_unreachable)
+        return tree, loop_issues + unreachable
+        
+    def _iter_python_issues(self, code: str, tree: ast.AST) -> Iterator[Tuple[List[ControlFlowIssue], List[ControlFlowIssue]]]:
+        """
+        Run the issue visitor per top-level statement, lazily.
+
+        Yields (loop issues, unreachable-code issues) for each statement
+        in source order; the lists may be shared with the cache and must
+        not be mutated. Top-level statements are independent for every
+        check, so results for unchanged functions/classes come from the
+        definition cache.
+        """
+        lines = code.splitlines()
+        
+        for stmt in getattr(tree, 'body', ()):
+            if isinstance(stmt, _DEFINITION_TYPES):
+                key = (type(stmt).__name__,) + definition_span(stmt, lines)
+                with self._definition_cache_lock:
+                    cached = self._definition_cache.get(key)
+                    if cached is not None:
+                        self._definition_cache.move_to_end(key)
+                if cached is None:
+                    cached = self._visit_issues(stmt)
+                    with self._definition_cache_lock:
+                        self._definition_cache[key] = cached
+                        if len(self._definition_cache) > _DEFINITION_CACHE_SIZE:
+                            self._definition_cache.popitem(last=False)
+            else:
+                cached = self._visit_issues(stmt)
+            yield cached
+    
+    def _visit_issues(self, node: ast.AST) -> Tuple[List[ControlFlowIssue], List[ControlFlowIssue]]:
+        visitor = _CFIssueVisitor()
+        visitor.visit(node)
+        for loop, has_break in visitor.while_breaks():
+            self._loop_breaks[loop] = has_break
+        return visitor.loop_issues(), visitor.unreachable
+    
     def _build_graph_for_first_issue(self, tree: Optional[ast.AST], issues: List[ControlFlowIssue], code: str) -> Tuple[List[CFGNode], List[CFGEdge]]:
         if not issues:
             return [], []
         return self._generate_graph_for_issue(tree, issues[0], code)
     
-    def _detect_infinite_loops(self, tree: ast.AST) -> List[ControlFlowIssue]:
-        """Detect infinite loop patterns"""
-        issues = []
-        
-        for node in ast.walk(tree):
-            # Pattern 1: while True without break
-            if isinstance(node, ast.While):
-                if self._is_constant_true(node.test):
-                    has_break = self._contains_break(node)
-                    if not has_break:
-                        issues.append(ControlFlowIssue(
-                            type='infinite_loop',
-                            line=node.lineno,
-                            description='Infinite loop: while True without break statement',
-                            severity='error'
-                        ))
-                else:
-                    # Pattern 2: Loop condition variable never modified
-                    condition_vars = self._get_condition_variables(node.test)
-                    modified_vars = self._get_modified_variables(node.body)
-                    
-                    if condition_vars and not condition_vars.intersection(modified_vars):
-                        vars_str = ', '.join(sorted(condition_vars))
-                        issues.append(ControlFlowIssue(
-                            type='variable_not_updated',
-                            line=node.lineno,
-                            description=f'Loop condition variable(s) "{vars_str}" never modified in loop body',
-                            severity='warning'
-                        ))
-            
-            # Pattern 3: For loop with variable not updated (less common)
-            if isinstance(node, ast.For):
-                target_name = self._get_target_name(node.target)
-                if target_name and self._is_target_overwritten_with_constant(node.body, target_name):
-                    issues.append(ControlFlowIssue(
-                        type='variable_not_updated',
-                        line=node.lineno,
-                        description=f'Loop variable "{target_name}" overwritten with constant in loop body',
-                        severity='warning'
-                    ))
-        
-        return issues
-    
-    def _detect_unreachable_code(self, tree: ast.AST) -> List[ControlFlowIssue]:
-        """Detect unreachable code after return/break/continue"""
-        issues = []
-        
-        for node in ast.walk(tree):
-            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.For, ast.While)):
-                body = node.body
-                for i, stmt in enumerate(body):
-                    # Check if statement is return/break/continue
-                    if isinstance(stmt, (ast.Return, ast.Break, ast.Continue)):
-                        # Check if there are statements after this
-                        if i < len(body) - 1:
-                            next_stmt = body[i + 1]
-                            stmt_type = stmt.__class__.__name__.lower()
-                            issues.append(ControlFlowIssue(
-                                type='unreachable_code',
-                                line=next_stmt.lineno,
-                                description=f'Unreachable code after {stmt_type} statement',
-                                severity='warning'
-                            ))
-                            break  # Only report first unreachable code
-        
-        return issues
-    
     def _generate_graph_for_issue(
         self, 
         tree: ast.AST, 
@@ -287,7 +343,7 @@ class ControlFlowAnalyzer:
         issue: ControlFlowIssue
     ) -> Tuple[List[CFGNode], List[CFGEdge]]:
         """Generate graph for while loop"""
-        condition_text = ast.unparse(node.test)
+        condition_text = _cheap_unparse(node.test)
         
         nodes = [
             CFGNode('start', 'entry', 'Start', node.lineno),
@@ -334,7 +390,7 @@ class ControlFlowAnalyzer:
     ) -> Tuple[List[CFGNode], List[CFGEdge]]:
         """Generate graph for for loop"""
         target_name = self._get_target_name(node.target)
-        iter_text = ast.unparse(node.iter)
+        iter_text = _cheap_unparse(node.iter)
         
         nodes = [
             CFGNode('start', 'entry', 'Start', node.lineno),
@@ -394,6 +450,282 @@ class ControlFlowAnalyzer:
         
         return nodes, edges
     
+    # Helper methods
+    def _contains_break(self, node: ast.AST) -> bool:
+        """
+        Check if the loop has a break statement that exits it.
+        
+        Breaks inside nested loops or function/class bodies belong to
+        those, so the search does not descend into them (a nested loop's
+        else clause is still searched: a break there exits this loop).
+        Expressions cannot contain a break and are skipped.
+        """
+        known = self._loop_breaks.get(node)
+        if known is not None:
+            return known
+        
+        stack = list(getattr(node, 'body', ()))
+        while stack:
+            n = stack.pop()
+            n_type = type(n)
+            if n_type is ast.Break:
+                return True
+            if n_type in _LOOP_TYPES:
+                stack.extend(n.orelse)
+            elif n_type not in _SCOPE_TYPES:
+                stack.extend(c for c in ast.iter_child_nodes(n) if isinstance(c, _STMT_CONTAINERS))
+        return False
+    
+    def _get_target_name(self, target: ast.AST) -> Optional[str]:
+        """Get variable name from for loop target"""
+        if isinstance(target, ast.Name):
+            return target.id
+        return None
+    
+    def _find_node_at_line(self, tree: ast.AST, line: int) -> Optional[ast.AST]:
+        """
+        Find the statement an issue on ``line`` refers to.
+
+        Statements starting on the line win (a loop over other kinds,
+        then the outermost); otherwise the innermost statement spanning
+        the line, e.g. for a line inside a multi-line expression.
+        """
+        index = self._line_indexes.get(tree)
+        if index is None:
+            # Sorted by start line, outer (longer) statements first
+            spans = sorted(
+                (
+                    (node.lineno, -(node.end_lineno or node.lineno), order, node)
+                    for order, node in enumerate(ast.walk(tree))
+                    if isinstance(node, ast.stmt)
+                ),
+                key=lambda span: span[:3],
+            )
+            index = ([span[0] for span in spans], [(-span[1], span[3]) for span in spans])
+            self._line_indexes[tree] = index
+        starts, entries = index
+        
+        lo = bisect_left(starts, line)
+        hi = bisect_right(starts, line, lo)
+        if lo < hi:
+            for _, node in entries[lo:hi]:
+                if type(node) in (ast.While, ast.For):
+                    return node
+            return entries[lo][1]
+        
+        # Nothing starts here: the latest-starting statement that still
+        # spans the line is the innermost one
+        for i in range(lo - 1, -1, -1):
+            end, node = entries[i]
+            if end >= line:
+                return node
+        return None
+
+@dataclass
+class _LoopFrame:
+    """Facts about one while loop gathered during the issue walk"""
+    node: ast.While
+    constant_true: bool
+    has_break: bool = False
+    condition_mask: int = 0   # Bit per variable read in the condition
+    modified_mask: int = 0    # Bit per variable assigned in the body
+
+
+class _CFIssueVisitor(ast.NodeVisitor):
+    """
+    Collects infinite-loop, stale-loop-variable and unreachable-code issues
+    in a single traversal instead of re-walking every loop body.
+    """
+    
+    _TERMINATORS = frozenset({ast.Return, ast.Break, ast.Continue})
+    
+    def __init__(self):
+        self.unreachable: List[ControlFlowIssue] = []
+        self._loop_entries: List = []          # _LoopFrame or ControlFlowIssue, in source order
+        self._open_loops: List[_LoopFrame] = []  # while loops whose body is being visited
+        # Innermost construct a break would exit: a while frame, or None
+        # for a for-loop or a function/class boundary
+        self._break_targets: List[Optional[_LoopFrame]] = []
+        self._condition: Optional[_LoopFrame] = None
+        # Variable name -> bit index, so per-loop variable sets are ints
+        self._var_bits: Dict[str, int] = {}
+        self._var_names: List[str] = []
+    
+    def _bit(self, name: str) -> int:
+        idx = self._var_bits.get(name)
+        if idx is None:
+            idx = self._var_bits[name] = len(self._var_names)
+            self._var_names.append(name)
+        return 1 << idx
+    
+    def _names(self, mask: int) -> List[str]:
+        return [name for i, name in enumerate(self._var_names) if mask >> i & 1]
+    
+    def loop_issues(self) -> List[ControlFlowIssue]:
+        """Loop issues in the order their loops appear"""
+        issues = []
+        for entry in self._loop_entries:
+            if isinstance(entry, ControlFlowIssue):
+                issues.append(entry)
+            elif entry.constant_true:
+                # Pattern 1: while True without break
+                if not entry.has_break:
+                    issues.append(ControlFlowIssue(
+                        type='infinite_loop',
+                        line=entry.node.lineno,
+                        description='Infinite loop: while True without break statement',
+                        severity='error'
+                    ))
+            # Pattern 2: Loop condition variable never modified
+            elif entry.condition_mask and not entry.condition_mask & entry.modified_mask:
+                vars_str = ', '.join(sorted(self._names(entry.condition_mask)))
+                issues.append(ControlFlowIssue(
+                    type='variable_not_updated',
+                    line=entry.node.lineno,
+                    description=f'Loop condition variable(s) "{vars_str}" never modified in loop body',
+                    severity='warning'
+                ))
+        return issues
+    
+    def while_breaks(self):
+        """(while node, has a break that exits it) for every while loop seen"""
+        return [(e.node, e.has_break) for e in self._loop_entries if isinstance(e, _LoopFrame)]
+    
+    def visit_While(self, node: ast.While):
+        frame = _LoopFrame(
+            node,
+            constant_true=type(node.test) is ast.Constant and node.test.value is True
+        )
+        self._loop_entries.append(frame)
+        self._check_unreachable(node.body)
+        
+        self._condition = frame
+        self.visit(node.test)
+        self._condition = None
+        
+        self._open_loops.append(frame)
+        self._break_targets.append(frame)
+        for stmt in node.body:
+            self.visit(stmt)
+        self._break_targets.pop()
+        self._open_loops.pop()
+        for stmt in node.orelse:
+            self.visit(stmt)
+    
+    def visit_For(self, node: ast.For):
+        # Pattern 3: For loop with variable not updated (less common)
+        target_name = node.target.id if type(node.target) is ast.Name else None
+        if target_name and self._is_target_overwritten_with_constant(node.body, target_name):
+            self._loop_entries.append(ControlFlowIssue(
+                type='variable_not_updated',
+                line=node.lineno,
+                description=f'Loop variable "{target_name}" overwritten with constant in loop body',
+                severity='warning'
+            ))
+        self._check_unreachable(node.body)
+        self._visit_loop_body(node)
+    
+    def visit_AsyncFor(self, node: ast.AsyncFor):
+        self._visit_loop_body(node)
+    
+    def _visit_loop_body(self, node):
+        # Breaks in the body exit this for-loop; breaks in its else clause
+        # exit the enclosing loop
+        self.visit(node.target)
+        self.visit(node.iter)
+        self._break_targets.append(None)
+        for stmt in node.body:
+            self.visit(stmt)
+        self._break_targets.pop()
+        for stmt in node.orelse:
+            self.visit(stmt)
+    
+    def visit_FunctionDef(self, node: ast.FunctionDef):
+        self._check_unreachable(node.body)
+        self._visit_scope(node)
+    
+    visit_AsyncFunctionDef = visit_FunctionDef
+    
+    def visit_ClassDef(self, node: ast.ClassDef):
+        self._visit_scope(node)
+    
+    def _visit_scope(self, node):
+        self._break_targets.append(None)
+        self.generic_visit(node)
+        self._break_targets.pop()
+    
+    def visit_Break(self, node: ast.Break):
+        if self._break_targets and self._break_targets[-1] is not None:
+            self._break_targets[-1].has_break = True
+    
+    def visit_Name(self, node: ast.Name):
+        if self._condition is not None:
+            self._condition.condition_mask |= self._bit(node.id)
+    
+    def visit_Assign(self, node: ast.Assign):
+        if self._open_loops:
+            for target in node.targets:
+                if type(target) is ast.Name:
+                    self._mark_modified(target.id)
+        self.generic_visit(node)
+    
+    def visit_AugAssign(self, node: ast.AugAssign):
+        if self._open_loops and type(node.target) is ast.Name:
+            self._mark_modified(node.target.id)
+        self.generic_visit(node)
+    
+    def _mark_modified(self, name: str):
+        bit = self._bit(name)
+        for frame in self._open_loops:
+            frame.modified_mask |= bit
+    
+    def _check_unreachable(self, body: List[ast.stmt]):
+        """Flag the first statement following a return/break/continue"""
+        for i, stmt in enumerate(body[:-1]):
+            if type(stmt) in self._TERMINATORS:
+                stmt_type = stmt.__class__.__name__.lower()
+                self.unreachable.append(ControlFlowIssue(
+                    type='unreachable_code',
+                    line=body[i + 1].lineno,
+                    description=f'Unreachable code after {stmt_type} statement',
+                    severity='warning'
+                ))
+                break  # Only report first unreachable code
+    
+    def _is_target_overwritten_with_constant(self, body: List[ast.stmt], target_name: str) -> bool:
+        """Check if target is overwritten with constant in body"""
+        for stmt in body:
+            if isinstance(stmt, ast.Assign):
+                for t in stmt.targets:
+                    if isinstance(t, ast.Name) and t.id == target_name:
+                        if isinstance(stmt.value, ast.Constant):
+                            return True
+        return False
+
+
+# Mermaid bracket pair per CFG node type
+_SHAPE_TABLE = {
+    'entry': ('[', ']'),        # Rectangle
+    'exit': ('[', ']'),         # Rectangle
+    'condition': ('{', '}'),    # Diamond
+    'block': ('[', ']'),        # Rectangle
+    'unreachable': ('[[', ']]'), # Subroutine shape
+}
+_DEFAULT_SHAPE = ('[', ']')
+
+# Double quotes would end the quoted label early
+_LABEL_ESCAPE = str.maketrans('"', "'")
+
+# Label quotes folded into the brackets, so a node line is id + open + label + close
+_NODE_AFFIXES = {
+    node_type: (shape_start + '"', '"' + shape_end)
+    for node_type, (shape_start, shape_end) in _SHAPE_TABLE.items()
+}
+_DEFAULT_AFFIXES = ('["', '"]')
+
+_MERMAID_FOOTER = "\n\n    classDef problem fill:#ff6b6b,stroke:#c92a2a,stroke-width:3px,color:#fff"
+
+
 class MermaidGenerator:
     """Helper class to generate Mermaid syntax from CFG nodes and edges."""
     
@@ -402,95 +734,39 @@ class MermaidGenerator:
         if not nodes:
             return ""
         
-        lines = ["flowchart TD"]
+        # Every fragment goes into one list, joined once at the end
+        parts = ["flowchart TD"]
+        append = parts.append
         
         # Add nodes
+        affixes = _NODE_AFFIXES.get
         for node in nodes:
-            shape_start, shape_end = self._get_mermaid_shape(node.type)
-            style_class = ""
-            
+            opening, closing = affixes(node.type, _DEFAULT_AFFIXES)
+            append("\n    ")
+            append(node.id)
+            append(opening)
+            append(node.label.translate(_LABEL_ESCAPE))
+            append(closing)
             if node.is_problematic:
-                style_class = ":::problem"
-            
-            # Escape quotes in label
-            label = node.label.replace('"', "'")
-            lines.append(f"    {node.id}{shape_start}\"{label}\"{shape_end}{style_class}")
+                append(":::problem")
         
         # Add edges
         for edge in edges:
-            label = f"|{edge.label}|" if edge.label else ""
-            lines.append(f"    {edge.from_node} --{label}--> {edge.to_node}")
+            append("\n    ")
+            append(edge.from_node)
+            if edge.label:
+                append(" --|")
+                append(edge.label)
+                append("|--> ")
+            else:
+                append(" ----> ")
+            append(edge.to_node)
         
         # Add styling
-        lines.append("")
-        lines.append("    classDef problem fill:#ff6b6b,stroke:#c92a2a,stroke-width:3px,color:#fff")
+        append(_MERMAID_FOOTER)
         
-        return "\n".join(lines)
+        return "".join(parts)
     
     def _get_mermaid_shape(self, node_type: str) -> Tuple[str, str]:
         """Get Mermaid shape syntax for node type"""
-        shapes = {
-            'entry': ('[', ']'),        # Rectangle
-            'exit': ('[', ']'),         # Rectangle
-            'condition': ('{', '}'),    # Diamond
-            'block': ('[', ']'),        # Rectangle
-            'unreachable': ('[[', ']]'), # Subroutine shape
-        }
-        return shapes.get(node_type, ('[', ']'))
-    
-    # Helper methods
-    def _is_constant_true(self, node: ast.AST) -> bool:
-        """Check if node is constant True"""
-        return isinstance(node, ast.Constant) and node.value is True
-    
-    def _contains_break(self, node: ast.AST) -> bool:
-        """Check if node contains a break statement"""
-        for child in ast.walk(node):
-            if isinstance(child, ast.Break):
-                return True
-        return False
-    
-    def _get_condition_variables(self, node: ast.AST) -> Set[str]:
-        """Extract variable names from condition"""
-        vars = set()
-        for child in ast.walk(node):
-            if isinstance(child, ast.Name):
-                vars.add(child.id)
-        return vars
-    
-    def _get_modified_variables(self, body: List[ast.AST]) -> Set[str]:
-        """Get variables that are assigned in body"""
-        vars = set()
-        for stmt in body:
-            for node in ast.walk(stmt):
-                if isinstance(node, ast.Assign):
-                    for target in node.targets:
-                        if isinstance(target, ast.Name):
-                            vars.add(target.id)
-                elif isinstance(node, ast.AugAssign):
-                    if isinstance(node.target, ast.Name):
-                        vars.add(node.target.id)
-        return vars
-    
-    def _get_target_name(self, target: ast.AST) -> Optional[str]:
-        """Get variable name from for loop target"""
-        if isinstance(target, ast.Name):
-            return target.id
-        return None
-    
-    def _is_target_overwritten_with_constant(self, body: List[ast.AST], target_name: str) -> bool:
-        """Check if target is overwritten with constant in body"""
-        for stmt in body:
-            if isinstance(stmt, ast.Assign):
-                for t in stmt.targets:
-                    if isinstance(t, ast.Name) and t.id == target_name:
-                        if isinstance(stmt.value, ast.Constant):
-                            return True
-        return False
-    
-    def _find_node_at_line(self, tree: ast.AST, line: int) -> Optional[ast.AST]:
-        """Find AST node at specific line number"""
-        for node in ast.walk(tree):
-            if hasattr(node, 'lineno') and node.lineno == line:
-                return node
-        return None
+        return _SHAPE_TABLE.get(node_type, _DEFAULT_SHAPE)
@@ -0,0 +1,106 @@
+"""
+On-disk cache of extracted FileFeatures, keyed by source hash.
+
+Re-running the pipeline over unchanged files (CI, large projects) then
+skips parsing and feature extraction entirely:
+
+    features = get_or_extract(code, extractor)
+
+Entries are pickles under ``~/.cache/edoc-ai/features`` (override with
+EDOC_FEATURE_CACHE_DIR). Writes are atomic; the directory is trimmed to
+_MAX_CACHE_BYTES by evicting the least recently used entries.
+"""
+
+import hashlib
+import os
+import pickle
+import tempfile
+from typing import Optional
+from analyzers.feature_extractor import FeatureExtractor, FileFeatures
+
+# Bump when FileFeatures or the extraction rules change, so stale
+# entries are not read back
+_FORMAT_VERSION = "v1"
+
+_MAX_CACHE_BYTES = 500 * 1024 * 1024
+
+DEFAULT_CACHE_DIR = os.environ.get(
+    "EDOC_FEATURE_CACHE_DIR",
+    os.path.join(os.path.expanduser("~"), ".cache", "edoc-ai", "features"),
+)
+
+
+def _entry_path(code: str, cache_dir: str) -> str:
+    digest = hashlib.blake2b(code.encode("utf-8", "surrogatepass"), digest_size=16).hexdigest()
+    return os.path.join(cache_dir, _FORMAT_VERSION, f"{digest}.pkl")
+
+
+def load(code: str, cache_dir: str = DEFAULT_CACHE_DIR) -> Optional[FileFeatures]:
+    """Cached features for ``code``, or None on a miss or unreadable entry."""
+    path = _entry_path(code, cache_dir)
+    try:
+        with open(path, "rb") as f:
+            features = pickle.load(f)
+        os.utime(path)  # Mark as recently used for eviction
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+        return None
+    return features if isinstance(features, FileFeatures) else None
+
+
+def store(code: str, features: FileFeatures, cache_dir: str = DEFAULT_CACHE_DIR) -> None:
+    """Write ``features`` for ``code``; cache I/O failures are ignored."""
+    path = _entry_path(code, cache_dir)
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(features, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+        _evict(os.path.dirname(path))
+    except OSError:
+        pass
+
+
+def get_or_extract(
+    code: str,
+    extractor: FeatureExtractor,
+    cache_dir: str = DEFAULT_CACHE_DIR
+) -> Optional[FileFeatures]:
+    """
+    Return features for ``code`` from the disk cache, extracting on a miss.
+
+    Returns None if the code does not parse (failures are not cached).
+    """
+    features = load(code, cache_dir)
+    if features is None:
+        features = extractor.extract(code)
+        if features is not None:
+            store(code, features, cache_dir)
+    return features
+
+
+def _evict(directory: str, max_bytes: int = _MAX_CACHE_BYTES) -> None:
+    """Delete least recently used entries until the directory fits."""
+    entries = []
+    total = 0
+    with os.scandir(directory) as it:
+        for entry in it:
+            if entry.name.endswith(".pkl"):
+                st = entry.stat()
+                entries.append((st.st_mtime, st.st_size, entry.path))
+                total += st.st_size
+    if total <= max_bytes:
+        return
+    entries.sort()
+    for _, size, path in entries:
+        try:
+            os.remove(path)
+        except OSError:
+            continue
+        total -= size
+        if total <= max_bytes:
+            break
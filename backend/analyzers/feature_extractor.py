@@ -14,11 +14,28 @@ These metrics map directly to the CodeSage blueprint specification.
 """
 
 import ast
-from typing import Dict, List, Optional, Any
+import multiprocessing
+import os
+import threading
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from itertools import accumulate
+from operator import attrgetter
+from typing import Callable, Dict, List, Optional, Any, Tuple
 from dataclasses import dataclass, field
+from analyzers._ast_cache import definition_span
+from analyzers.code_context import CodeContext
 
+# Compiled metric walk (analyzers/_metrics.pyx), if it has been built
+try:
+    from analyzers._metrics import function_metrics as _compiled_function_metrics
+    COMPILED_METRICS_AVAILABLE = True
+except ImportError:
+    _compiled_function_metrics = None
+    COMPILED_METRICS_AVAILABLE = False
 
-@dataclass
+
+@dataclass(slots=True, frozen=True)
 class MethodFeatures:
     """Features extracted for a single method/function."""
     name: str
@@ -32,8 +49,21 @@ class MethodFeatures:
     external_calls: int = 0         # Calls to other classes/modules
     local_calls: int = 0            # Calls within same class
 
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "start_line": self.start_line,
+            "end_line": self.end_line,
+            "loc": self.loc,
+            "params": self.params,
+            "complexity": self.complexity,
+            "max_nesting_depth": self.max_nesting_depth,
+            "external_calls": self.external_calls,
+            "local_calls": self.local_calls,
+        }
 
-@dataclass
+
+@dataclass(slots=True)
 class ClassFeatures:
     """Features extracted for a single class."""
     name: str
@@ -45,8 +75,20 @@ class ClassFeatures:
     loc: int = 0                    # Total class LOC
     num_methods: int = 0
 
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "start_line": self.start_line,
+            "end_line": self.end_line,
+            "wmc": self.wmc,
+            "cbo": self.cbo,
+            "loc": self.loc,
+            "num_methods": self.num_methods,
+            "methods": [m.to_dict() for m in self.methods],
+        }
+
 
-@dataclass
+@dataclass(slots=True)
 class FileFeatures:
     """Features extracted from the whole file."""
     classes: List[ClassFeatures] = field(default_factory=list)
@@ -62,36 +104,139 @@ class FileFeatures:
             "total_loc": self.total_loc,
             "total_methods": self.total_methods,
             "imports": self.imports,
-            "classes": [
-                {
-                    "name": c.name,
-                    "start_line": c.start_line,
-                    "end_line": c.end_line,
-                    "wmc": c.wmc,
-                    "cbo": c.cbo,
-                    "loc": c.loc,
-                    "num_methods": c.num_methods,
-                    "methods": [_method_to_dict(m) for m in c.methods],
-                }
-                for c in self.classes
-            ],
-            "standalone_functions": [_method_to_dict(f) for f in self.standalone_functions],
+            "classes": [c.to_dict() for c in self.classes],
+            "standalone_functions": [f.to_dict() for f in self.standalone_functions],
             "top_level_statements": self.top_level_statements,
         }
 
 
-def _method_to_dict(m: MethodFeatures) -> Dict[str, Any]:
-    return {
-        "name": m.name,
-        "start_line": m.start_line,
-        "end_line": m.end_line,
-        "loc": m.loc,
-        "params": m.params,
-        "complexity": m.complexity,
-        "max_nesting_depth": m.max_nesting_depth,
-        "external_calls": m.external_calls,
-        "local_calls": m.local_calls,
-    }
+# Top-level class/function and method features kept by extract_incremental()
+_INCREMENTAL_CACHE_SIZE = 4096
+
+# Files with at least this many classes to compute extract them in worker
+# processes; below it, pool round-trips cost more than they save
+_PARALLEL_MIN_CLASSES = 8
+_POOL_MAX_WORKERS = min(4, os.cpu_count() or 1)
+
+# Node types are matched exactly (``type(n) in ...``): parsed trees only
+# contain concrete node classes, and a set lookup skips isinstance's MRO walk.
+
+# Nodes that each add one decision point to cyclomatic complexity
+_DECISION_NODES = frozenset({ast.If, ast.For, ast.While, ast.ExceptHandler,
+                             ast.With, ast.Assert, ast.comprehension})
+
+# Dispatch table for _walk_function_metrics: node type -> branch, so each
+# node costs one dict lookup instead of a chain of type comparisons.
+_KIND_DECISION, _KIND_BOOLOP, _KIND_CALL, _KIND_ATTRIBUTE = range(1, 5)
+_METRIC_KIND = dict.fromkeys(_DECISION_NODES, _KIND_DECISION)
+_METRIC_KIND.update({
+    ast.BoolOp: _KIND_BOOLOP,
+    ast.Call: _KIND_CALL,
+    ast.Attribute: _KIND_ATTRIBUTE,
+})
+
+# Control structures that open one more level of nesting
+_NESTING_NODES = frozenset({ast.If, ast.For, ast.While, ast.With,
+                            ast.Try, ast.ExceptHandler})
+
+
+class _ChildGetters(dict):
+    """
+    node type -> function returning the node's children as a list.
+
+    Same children, in the same order, as ast.iter_child_nodes(), but the
+    field names are looked up once per node type and no generator is
+    created per node. Getters are built on first use of each type.
+    """
+
+    def __missing__(self, node_type: type) -> Callable[[ast.AST], List[ast.AST]]:
+        fields = getattr(node_type, "_fields", ())
+        if not fields:
+            children = _no_children
+        else:
+            if len(fields) == 1:
+                single = attrgetter(fields[0])
+                get_fields = lambda n: (single(n),)
+            else:
+                get_fields = attrgetter(*fields)
+
+            def children(n: ast.AST) -> List[ast.AST]:
+                out = []
+                for value in get_fields(n):
+                    if type(value) is list:
+                        out.extend([item for item in value if isinstance(item, ast.AST)])
+                    elif isinstance(value, ast.AST):
+                        out.append(value)
+                return out
+
+        self[node_type] = children
+        return children
+
+
+def _no_children(n: ast.AST) -> List[ast.AST]:
+    return []
+
+
+_CHILD_GETTERS = _ChildGetters()
+
+
+def _loc_prefix(lines: List[str]) -> List[int]:
+    """Prefix sums of non-blank lines: entry i counts non-blank lines[:i]."""
+    return list(accumulate((not l.isspace() and l != "" for l in lines), initial=0))
+
+
+def _loc_between(loc_prefix: List[int], start: int, end: int) -> int:
+    """Non-blank lines in the 1-based inclusive range start..end."""
+    last = len(loc_prefix) - 1
+    return loc_prefix[min(end, last)] - loc_prefix[min(start - 1, last)]
+
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool() -> Optional[ProcessPoolExecutor]:
+    """Shared worker pool, created on first use; None on single-core hosts."""
+    global _pool
+    if _POOL_MAX_WORKERS < 2:
+        return None
+    with _pool_lock:
+        if _pool is None:
+            # spawn, not fork: the server process runs other threads
+            # (e.g. the model batcher) whose locks must not be inherited
+            _pool = ProcessPoolExecutor(
+                max_workers=_POOL_MAX_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _pool
+
+
+def _discard_pool(pool: ProcessPoolExecutor) -> None:
+    """Drop a broken pool so the next parallel extraction starts a new one."""
+    global _pool
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _extract_class_from_source(source: str, first_line: int, ext_names: set) -> Optional["ClassFeatures"]:
+    """
+    Worker entry point: re-parse one top-level class and extract its features.
+
+    Source segments are sent instead of AST nodes, which pickle slowly.
+    Line numbers are shifted back to their place in the original file.
+    Returns None if the segment does not parse on its own.
+    """
+    try:
+        tree = ast.parse(source)
+    except (SyntaxError, ValueError):
+        return None
+    if len(tree.body) != 1 or type(tree.body[0]) is not ast.ClassDef:
+        return None
+    ast.increment_lineno(tree, first_line - 1)
+    loc_prefix = [0] * (first_line - 1) + _loc_prefix(source.splitlines())
+    return FeatureExtractor()._extract_class(tree.body[0], loc_prefix, ext_names)
 
 
 class FeatureExtractor:
@@ -101,37 +246,102 @@ class FeatureExtractor:
     Usage:
         extractor = FeatureExtractor()
         features = extractor.extract(source_code)
+
+    For editor-style re-submissions, extract_incremental() reuses the
+    features of top-level classes/functions whose source is unchanged.
     """
 
-    def extract(self, code: str) -> Optional[FileFeatures]:
+    def __init__(self):
+        self._node_cache: "OrderedDict[tuple, Any]" = OrderedDict()
+        self._node_cache_lock = threading.Lock()
+
+    def extract(self, code: str, ctx: Optional[CodeContext] = None) -> Optional[FileFeatures]:
         """
         Parse code and extract all features.
 
         Args:
             code: Python source code string
+            ctx: Optional shared context for ``code`` (skips re-parsing)
 
         Returns:
             FileFeatures or None if parsing fails
         """
-        try:
-            tree = ast.parse(code)
-        except SyntaxError:
-            return None
+        return self._extract(code, ctx, incremental=False)
+
+    def extract_incremental(
+        self,
+        code: str,
+        ctx: Optional[CodeContext] = None,
+        edit_range: Optional[Tuple[int, int]] = None
+    ) -> Optional[FileFeatures]:
+        """
+        Like extract(), but reuse features of unchanged top-level definitions.
+
+        A class or function is reused when an earlier call saw the same
+        source lines at the same position with the same imports. Reused
+        objects are shared between results and must not be mutated.
+
+        Args:
+            code: Python source code string
+            ctx: Optional shared context for ``code`` (skips re-parsing)
+            edit_range: Optional (first_line, last_line) of the latest edit;
+                definitions overlapping it are always recomputed
+
+        Returns:
+            FileFeatures or None if parsing fails
+        """
+        return self._extract(code, ctx, incremental=True, edit_range=edit_range)
+
+    def _extract(
+        self,
+        code: str,
+        ctx: Optional[CodeContext],
+        incremental: bool,
+        edit_range: Optional[Tuple[int, int]] = None
+    ) -> Optional[FileFeatures]:
+        if ctx is None:
+            ctx = CodeContext.build(code)
+            if ctx is None:
+                return None
+        tree = ctx.tree
 
         lines = code.splitlines()
+        loc_prefix = _loc_prefix(lines)
         file_features = FileFeatures()
 
         # Collect all imported module names for CBO
-        imported_names = self._collect_imports(tree, file_features)
+        imported_names = self._collect_imports(ctx.imports, file_features)
+
+        # Features depend on the file's imports as well as the node itself
+        imports_key = frozenset(imported_names) if incremental else None
+
+        # Large files: start class extraction in worker processes, and
+        # pick the results up in source order below
+        pending = self._submit_classes(tree, lines, imported_names, imports_key, edit_range)
 
         # Walk top-level nodes
-        for node in ast.iter_child_nodes(tree):
+        for node in tree.body:
             if isinstance(node, ast.ClassDef):
-                class_feat = self._extract_class(node, lines, imported_names)
+                if incremental:
+                    class_feat = self._cached_node_features(
+                        node, lines, imports_key, edit_range,
+                        lambda: self._class_features(
+                            node, pending, loc_prefix, imported_names,
+                            reuse=(lines, imports_key, edit_range)
+                        )
+                    )
+                else:
+                    class_feat = self._class_features(node, pending, loc_prefix, imported_names)
                 file_features.classes.append(class_feat)
                 file_features.total_methods += class_feat.num_methods
             elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
-                fn_feat = self._extract_function(node, lines, imported_names, class_methods=set())
+                if incremental:
+                    fn_feat = self._cached_node_features(
+                        node, lines, imports_key, edit_range,
+                        lambda: self._extract_function(node, loc_prefix, imported_names, class_methods=set())
+                    )
+                else:
+                    fn_feat = self._extract_function(node, loc_prefix, imported_names, class_methods=set())
                 file_features.standalone_functions.append(fn_feat)
                 file_features.total_methods += 1
             elif isinstance(node, (ast.Expr, ast.Assign, ast.Call)):
@@ -143,17 +353,111 @@ class FeatureExtractor:
                     "ast_node": node
                 })
 
-        file_features.total_loc = sum(1 for l in lines if l.strip())
+        file_features.total_loc = loc_prefix[-1]
         return file_features
 
     # ------------------------------------------------------------------
     # Private helpers
     # ------------------------------------------------------------------
 
-    def _collect_imports(self, tree: ast.AST, file_features: FileFeatures) -> set:
+    def _submit_classes(
+        self,
+        tree: ast.Module,
+        lines: List[str],
+        ext_names: set,
+        imports_key: Optional[frozenset],
+        edit_range: Optional[Tuple[int, int]]
+    ) -> Dict[ast.ClassDef, Future]:
+        """
+        Send top-level classes to the worker pool when there are enough.
+
+        Classes that extract_incremental() will find in its cache are not
+        sent. Returns a Future per submitted class node; empty when the
+        file is extracted serially.
+        """
+        classes = [node for node in tree.body if type(node) is ast.ClassDef]
+        if len(classes) < _PARALLEL_MIN_CLASSES:
+            return {}
+        if imports_key is not None:
+            classes = [
+                node for node in classes
+                if not self._is_cached(node, lines, imports_key, edit_range)
+            ]
+            if len(classes) < _PARALLEL_MIN_CLASSES:
+                return {}
+
+        pool = _get_pool()
+        if pool is None:
+            return {}
+        pending = {}
+        try:
+            for node in classes:
+                start, end, _ = definition_span(node, lines)
+                source = "\n".join(lines[start - 1:end])
+                pending[node] = pool.submit(_extract_class_from_source, source, start, ext_names)
+        except RuntimeError:
+            # Pool is shutting down or broken; the rest run in-process
+            _discard_pool(pool)
+        return pending
+
+    def _class_features(
+        self,
+        node: ast.ClassDef,
+        pending: Dict[ast.ClassDef, Future],
+        loc_prefix: List[int],
+        ext_names: set,
+        reuse: Optional[tuple] = None
+    ) -> "ClassFeatures":
+        """Worker result for ``node`` if one was submitted, else extract in-process."""
+        future = pending.get(node)
+        if future is not None:
+            try:
+                features = future.result()
+            except Exception:
+                # BrokenProcessPool and friends: fall back to in-process
+                features = None
+            if features is not None:
+                return features
+        return self._extract_class(node, loc_prefix, ext_names, reuse)
+
+    def _cache_key(self, node, lines, imports_key, edit_range):
+        """Cache key for a definition, and whether the latest edit touches it."""
+        start, end, digest = definition_span(node, lines)
+        key = (type(node).__name__, node.name, start, end, digest, imports_key)
+        touched = edit_range is not None and start <= edit_range[1] and edit_range[0] <= end
+        return key, touched
+
+    def _is_cached(self, node, lines, imports_key, edit_range) -> bool:
+        """Whether _cached_node_features() would reuse features for ``node``."""
+        key, touched = self._cache_key(node, lines, imports_key, edit_range)
+        if touched:
+            return False
+        with self._node_cache_lock:
+            return key in self._node_cache
+
+    def _cached_node_features(self, node, lines, imports_key, edit_range, compute):
+        """Return cached features for an unchanged definition, else compute()."""
+        key, touched = self._cache_key(node, lines, imports_key, edit_range)
+
+        if not touched:
+            with self._node_cache_lock:
+                cached = self._node_cache.get(key)
+                if cached is not None:
+                    self._node_cache.move_to_end(key)
+                    return cached
+
+        features = compute()
+        with self._node_cache_lock:
+            self._node_cache[key] = features
+            self._node_cache.move_to_end(key)
+            if len(self._node_cache) > _INCREMENTAL_CACHE_SIZE:
+                self._node_cache.popitem(last=False)
+        return features
+
+    def _collect_imports(self, imports: List[ast.stmt], file_features: FileFeatures) -> set:
         """Collect all imported names to help identify external calls."""
         imported = set()
-        for node in ast.walk(tree):
+        for node in imports:
             if isinstance(node, ast.Import):
                 for alias in node.names:
                     name = alias.asname or alias.name
@@ -167,8 +471,20 @@ class FeatureExtractor:
                     imported.add(alias.asname or alias.name)
         return imported
 
-    def _extract_class(self, node: ast.ClassDef, lines: List[str], ext_names: set) -> ClassFeatures:
-        """Extract features from a class definition."""
+    def _extract_class(
+        self,
+        node: ast.ClassDef,
+        loc_prefix: List[int],
+        ext_names: set,
+        reuse: Optional[tuple] = None
+    ) -> ClassFeatures:
+        """
+        Extract features from a class definition.
+
+        ``reuse`` is ``(lines, imports_key, edit_range)`` from
+        extract_incremental(); unchanged methods are then taken from the
+        node cache, so editing one method recomputes only that method.
+        """
         class_feat = ClassFeatures(
             name=node.name,
             start_line=node.lineno,
@@ -177,48 +493,64 @@ class FeatureExtractor:
 
         # Collect method names for local-call detection
         method_names = {
-            n.name for n in ast.iter_child_nodes(node)
+            n.name for n in node.body
             if isinstance(n, (ast.FunctionDef, ast.AsyncFunctionDef))
         }
 
         # Referenced external types for CBO
         external_types: set = set()
 
-        for child in ast.iter_child_nodes(node):
+        for child in node.body:
             if isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef)):
-                fn_feat = self._extract_function(child, lines, ext_names, method_names)
+                if reuse is not None:
+                    fn_feat, cbo_refs = self._cached_method_features(
+                        child, loc_prefix, ext_names, method_names, reuse
+                    )
+                    external_types.update(cbo_refs)
+                else:
+                    # CBO references are collected during the method's metric walk
+                    fn_feat = self._extract_function(
+                        child, loc_prefix, ext_names, method_names, external_types
+                    )
                 class_feat.methods.append(fn_feat)
                 class_feat.wmc += fn_feat.complexity
 
-                # CBO: collect attribute references to external names
-                for n in ast.walk(child):
-                    if isinstance(n, ast.Attribute) and isinstance(n.value, ast.Name):
-                        if n.value.id in ext_names and n.value.id != "self":
-                            external_types.add(n.value.id)
-
         class_feat.cbo = len(external_types)
         class_feat.num_methods = len(class_feat.methods)
-        class_feat.loc = sum(
-            1 for i in range(class_feat.start_line - 1, class_feat.end_line)
-            if i < len(lines) and lines[i].strip()
-        )
+        class_feat.loc = _loc_between(loc_prefix, class_feat.start_line, class_feat.end_line)
         return class_feat
 
+    def _cached_method_features(self, node, loc_prefix, ext_names, method_names, reuse):
+        """(MethodFeatures, CBO references) for a method, reused when unchanged."""
+        lines, imports_key, edit_range = reuse
+
+        def compute():
+            cbo_refs: set = set()
+            fn_feat = self._extract_function(node, loc_prefix, ext_names, method_names, cbo_refs)
+            return fn_feat, frozenset(cbo_refs)
+
+        # Local-call counts depend on the sibling method names too
+        key = (imports_key, frozenset(method_names))
+        return self._cached_node_features(node, lines, key, edit_range, compute)
+
     def _extract_function(
         self,
         node: Any,  # ast.FunctionDef or ast.AsyncFunctionDef
-        lines: List[str],
+        loc_prefix: List[int],
         ext_names: set,
-        class_methods: set
+        class_methods: set,
+        external_types: Optional[set] = None
     ) -> MethodFeatures:
-        """Extract features from a function/method definition."""
+        """
+        Extract features from a function/method definition.
+
+        If ``external_types`` is given, external names referenced through
+        attribute access are added to it (for the owning class's CBO).
+        """
         start = node.lineno
         end = node.end_lineno or node.lineno
 
-        loc = sum(
-            1 for i in range(start - 1, end)
-            if i < len(lines) and lines[i].strip()
-        )
+        loc = _loc_between(loc_prefix, start, end)
 
         # Parameters (exclude 'self' and 'cls')
         params = [
@@ -226,9 +558,13 @@ class FeatureExtractor:
             if a.arg not in ("self", "cls")
         ]
 
-        complexity = self._cyclomatic_complexity(node)
+        walk = _compiled_function_metrics or self._walk_function_metrics
+        complexity, local_calls, external_calls, all_calls, cbo_refs = walk(
+            node, class_methods, ext_names
+        )
         nesting = self._max_nesting(node)
-        local_calls, external_calls, all_calls = self._count_calls(node, class_methods, ext_names)
+        if external_types is not None:
+            external_types.update(cbo_refs)
 
         return MethodFeatures(
             name=node.name,
@@ -243,62 +579,89 @@ class FeatureExtractor:
             external_calls=external_calls,
         )
 
-    def _cyclomatic_complexity(self, node: ast.AST) -> int:
-        """
-        Approximate cyclomatic complexity M = decision points + 1.
-
-        Counts: if, elif, for, while, except, with, assert, and/or operators.
-        """
-        complexity = 1  # Base path
-        for n in ast.walk(node):
-            if isinstance(n, (ast.If, ast.For, ast.While, ast.ExceptHandler,
-                               ast.With, ast.Assert, ast.comprehension)):
-                complexity += 1
-            elif isinstance(n, ast.BoolOp):
-                # 'and' / 'or' each add a branch
-                complexity += len(n.values) - 1
-        return complexity
-
-    def _max_nesting(self, node: ast.AST, current: int = 0) -> int:
-        """Recursively compute maximum nesting depth of control structures."""
-        max_depth = current
-        for child in ast.iter_child_nodes(node):
-            if isinstance(child, (ast.If, ast.For, ast.While, ast.With,
-                                   ast.Try, ast.ExceptHandler)):
-                depth = self._max_nesting(child, current + 1)
-                max_depth = max(max_depth, depth)
-            else:
-                depth = self._max_nesting(child, current)
-                max_depth = max(max_depth, depth)
-        return max_depth
-
-    def _count_calls(
+    def _walk_function_metrics(
         self,
-        node: ast.FunctionDef,
+        node: ast.AST,
         class_methods: set,
         ext_names: set
     ):
-        """Count local and external calls within a function body."""
+        """
+        Compute complexity, call counts and CBO references in one traversal.
+
+        Cyclomatic complexity M = decision points + 1, counting if, elif,
+        for, while, except, with, assert, comprehensions and and/or operators.
+        Nodes are visited breadth-first (ast.walk order), so ``all_calls``
+        keeps source-walk order.
+
+        Returns:
+            (complexity, local_calls, external_calls, all_calls, cbo_refs)
+        """
+        complexity = 1  # Base path
         local = 0
         external = 0
         all_calls: List[str] = []
+        cbo_refs: set = set()
 
-        for n in ast.walk(node):
-            if isinstance(n, ast.Call):
+        kind_of = _METRIC_KIND.get
+        todo = deque([node])
+        while todo:
+            n = todo.popleft()
+            kind = kind_of(type(n))
+
+            if kind is None:
+                pass
+            elif kind == _KIND_DECISION:
+                complexity += 1
+            elif kind == _KIND_BOOLOP:
+                # 'and' / 'or' each add a branch
+                complexity += len(n.values) - 1
+            elif kind == _KIND_CALL:
                 func = n.func
-                if isinstance(func, ast.Name):
+                func_type = type(func)
+                if func_type is ast.Name:
                     name = func.id
                     all_calls.append(name)
                     if name in class_methods:
                         local += 1
                     elif name in ext_names:
                         external += 1
-                elif isinstance(func, ast.Attribute):
+                elif func_type is ast.Attribute:
                     full = f"{getattr(func.value, 'id', '?')}.{func.attr}"
                     all_calls.append(full)
-                    if isinstance(func.value, ast.Name) and func.value.id != "self":
+                    if type(func.value) is ast.Name and func.value.id != "self":
                         external += 1
                     else:
                         local += 1
-
-        return local, external, all_calls
+            elif type(n.value) is ast.Name:
+                # CBO: attribute references to external names
+                if n.value.id in ext_names and n.value.id != "self":
+                    cbo_refs.add(n.value.id)
+
+            # Inlined ast.iter_child_nodes (no generator per node)
+            for name in n._fields:
+                value = getattr(n, name, None)
+                if isinstance(value, ast.AST):
+                    todo.append(value)
+                elif type(value) is list:
+                    for item in value:
+                        if isinstance(item, ast.AST):
+                            todo.append(item)
+
+        return complexity, local, external, all_calls, cbo_refs
+
+    def _max_nesting(self, node: ast.AST) -> int:
+        """Compute maximum nesting depth of control structures (explicit stack, no recursion)."""
+        children_of = _CHILD_GETTERS
+        max_depth = 0
+        stack = [(child, 0) for child in children_of[type(node)](node)]
+        push = stack.append
+        while stack:
+            n, depth = stack.pop()
+            n_type = type(n)
+            if n_type in _NESTING_NODES:
+                depth += 1
+                if depth > max_depth:
+                    max_depth = depth
+            for child in children_of[n_type](n):
+                push((child, depth))
+        return max_depth
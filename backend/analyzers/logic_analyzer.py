@@ -3,14 +3,30 @@ Logic analyzer using LLM for detecting logical errors.
 Focuses on edge cases, incorrect assumptions, and subtle bugs.
 """
 
-from typing import List
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Dict, List
 from llm_providers.base import LLMProvider
 
 
+# Number of LLM results kept, keyed by a hash of the analyzed source
+_CACHE_SIZE = 512
+
+_UNAVAILABLE = "⚠️ LLM not available - logical analysis skipped"
+
+
+def _digest(code: str) -> bytes:
+    return hashlib.blake2b(code.encode("utf-8", "surrogatepass"), digest_size=16).digest()
+
+
 class LogicAnalyzer:
     """
     Analyzes code for logical errors using LLM reasoning.
     These are probabilistic warnings, not guaranteed bugs.
+    
+    Successful LLM results are cached by source hash, so unchanged code is
+    never sent to the model twice.
     """
     
     def __init__(self, llm_provider: LLMProvider):
@@ -21,6 +37,8 @@ class LogicAnalyzer:
             llm_provider: LLM provider instance for analysis
         """
         self.llm = llm_provider
+        self._cache: "OrderedDict[bytes, List[str]]" = OrderedDict()
+        self._cache_lock = threading.Lock()
     
     def analyze(self, code: str) -> List[str]:
         """
@@ -32,13 +50,87 @@ class LogicAnalyzer:
         Returns:
             List of logical concerns as human-readable strings
         """
+        key = _digest(code)
+        cached = self._cache_get(key)
+        if cached is not None:
+            return cached
+        
         if not self.llm.is_available():
-            return ["⚠️ LLM not available - logical analysis skipped"]
+            return [_UNAVAILABLE]
         
         try:
             concerns = self.llm.analyze_logic(code)
-            return concerns if concerns else []
+            concerns = concerns if concerns else []
         
         except Exception as e:
             print(f"Logic analysis error: {e}")
             return [f"⚠️ Logic analysis failed: {str(e)}"]
+        
+        self._cache_put(key, concerns)
+        return list(concerns)
+    
+    def analyze_batch(self, codes: List[str]) -> List[List[str]]:
+        """
+        Analyze several snippets, sending only uncached ones to the LLM.
+        
+        Cache misses (with duplicates collapsed) go to the provider in one
+        analyze_logic_batch call.
+        
+        Args:
+            codes: Python source snippets
+            
+        Returns:
+            One list of concerns per snippet, in input order
+        """
+        results: List[List[str]] = [None] * len(codes)
+        misses: Dict[bytes, List[int]] = {}
+        
+        for i, code in enumerate(codes):
+            key = _digest(code)
+            cached = self._cache_get(key)
+            if cached is not None:
+                results[i] = cached
+            else:
+                misses.setdefault(key, []).append(i)
+        
+        if not misses:
+            return results
+        
+        if not self.llm.is_available():
+            for indices in misses.values():
+                for i in indices:
+                    results[i] = [_UNAVAILABLE]
+            return results
+        
+        pending = [codes[indices[0]] for indices in misses.values()]
+        try:
+            batch = self.llm.analyze_logic_batch(pending)
+        except Exception as e:
+            print(f"Logic analysis error: {e}")
+            batch = None
+        
+        for n, (key, indices) in enumerate(misses.items()):
+            if batch is None or n >= len(batch):
+                concerns = ["⚠️ Logic analysis failed"]
+            else:
+                concerns = batch[n] if batch[n] else []
+                self._cache_put(key, concerns)
+            for i in indices:
+                results[i] = list(concerns)
+        
+        return results
+    
+    def _cache_get(self, key: bytes):
+        with self._cache_lock:
+            cached = self._cache.get(key)
+            if cached is None:
+                return None
+            self._cache.move_to_end(key)
+            return list(cached)
+    
+    def _cache_put(self, key: bytes, concerns: List[str]) -> None:
+        with self._cache_lock:
+            self._cache[key] = list(concerns)
+            self._cache.move_to_end(key)
+            if len(self._cache) > _CACHE_SIZE:
+                self._cache.popitem(last=False)
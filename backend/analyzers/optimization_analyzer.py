@@ -4,9 +4,59 @@ Provides code quality and performance improvement recommendations.
 """
 
 import ast
-from typing import List, Dict
+from bisect import bisect_right
+from dataclasses import dataclass
+from itertools import islice
+from typing import Any, Iterator, List, Dict, Optional, Union
+from analyzers._ast_cache import get_ast
+from analyzers.code_context import CodeContext
 from llm_providers.base import LLMProvider
 
+# suggest() returns at most this many (deduplicated) suggestions
+_MAX_SUGGESTIONS = 10
+
+_LOOP_TYPES = (ast.For, ast.AsyncFor, ast.While)
+
+# Nodes whose children can include statements; loops cannot occur
+# anywhere else (expressions never contain statements)
+_STMT_CONTAINERS = (ast.stmt, ast.excepthandler, ast.match_case)
+
+
+def _iter_loops(tree: ast.AST) -> Iterator[ast.stmt]:
+    """
+    Yield the loop statements of ``tree`` in ast.walk order.
+
+    Breadth-first like ast.walk, but only statement-level nodes are
+    queued, so the expressions that make up most of a tree are never
+    visited.
+    """
+    queue = [tree]
+    for node in queue:  # The list grows while it is iterated
+        if isinstance(node, _LOOP_TYPES):
+            yield node
+        for child in ast.iter_child_nodes(node):
+            if isinstance(child, _STMT_CONTAINERS):
+                queue.append(child)
+
+
+@dataclass(slots=True, frozen=True)
+class Suggestion:
+    """A heuristic optimization suggestion (serialized by to_dict())."""
+    type: str          # "performance" | "readability"
+    line: int
+    suggestion: str
+    impact: str
+    example: str
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "type": self.type,
+            "line": self.line,
+            "suggestion": self.suggestion,
+            "impact": self.impact,
+            "example": self.example,
+        }
+
 
 class OptimizationAnalyzer:
     """
@@ -23,148 +73,175 @@ class OptimizationAnalyzer:
         """
         self.llm = llm_provider
     
-    def suggest(self, code: str) -> List[Dict]:
+    def suggest(
+        self,
+        code: str,
+        llm_suggestions: Optional[List[Dict]] = None,
+        ctx: Optional[CodeContext] = None
+    ) -> List[Dict]:
         """
         Generate optimization suggestions for code.
         
         Args:
             code: Python source code to analyze
+            llm_suggestions: LLM suggestions already fetched by the caller
+                (e.g. from a combined review prompt); skips the LLM call
+            ctx: Optional shared context for ``code`` (skips re-parsing)
             
         Returns:
             List of optimization suggestions, each as a dict
         """
-        suggestions = []
-        
-        # Step 1: Run fast heuristic checks
-        heuristic_suggestions = self._heuristic_checks(code)
-        suggestions.extend(heuristic_suggestions)
-        
-        # Step 2: Get LLM-based suggestions (if available)
-        if self.llm.is_available():
-            try:
-                llm_suggestions = self.llm.suggest_optimizations(code)
-                suggestions.extend(llm_suggestions)
-            except Exception as e:
-                print(f"LLM optimization error: {e}")
-        
-        # Remove duplicates and limit results
-        seen = set()
-        unique_suggestions = []
-        for s in suggestions:
-            key = (s.get('line', 0), s.get('suggestion', ''))
-            if key not in seen:
-                seen.add(key)
-                unique_suggestions.append(s)
-        
-        return unique_suggestions[:10]  # Limit to top 10
+        # Suggestions keyed by (line, text); the first one seen wins and
+        # dict order keeps heuristic results ahead of LLM ones
+        unique: Dict[tuple, Union[Suggestion, Dict]] = {}
+
+        # Step 1: Run fast heuristic checks (kept as Suggestion objects
+        # until the result list is final)
+        for s in self._heuristic_checks(code, ctx):
+            unique.setdefault((s.line, s.suggestion), s)
+
+        # Step 2: Get LLM-based suggestions, unless heuristics already
+        # fill the result cap
+        if len(unique) < _MAX_SUGGESTIONS:
+            if llm_suggestions is None and self.llm.is_available():
+                try:
+                    llm_suggestions = self.llm.suggest_optimizations(code)
+                except Exception as e:
+                    print(f"LLM optimization error: {e}")
+            for s in llm_suggestions or ():
+                unique.setdefault((s.get('line', 0), s.get('suggestion', '')), s)
+
+        return [
+            s.to_dict() if type(s) is Suggestion else s
+            for s in islice(unique.values(), _MAX_SUGGESTIONS)
+        ]
     
-    def _heuristic_checks(self, code: str) -> List[Dict]:
+    def _heuristic_checks(self, code: str, ctx: Optional[CodeContext] = None) -> List[Suggestion]:
         """
         Run fast rule-based heuristic checks.
         
         Args:
             code: Python source code
+            ctx: Optional shared context for ``code``
             
         Returns:
             List of optimization suggestions
         """
         suggestions = []
         
-        try:
-            tree = ast.parse(code)
+        if ctx is not None:
+            loops = ctx.loops
+        else:
+            # Only for-loops are needed, so skip the full CodeContext walk
+            try:
+                loops = _iter_loops(get_ast(code))
+            except SyntaxError:
+                # If code has syntax errors, skip heuristic checks
+                return suggestions
+        
+        # One pass over the for-loops runs every per-loop check; each check
+        # keeps its own list so suggestions stay grouped by check
+        range_len: List[Suggestion] = []
+        comprehension: List[Suggestion] = []
+        fors = []
+        for node in loops:
+            if not isinstance(node, ast.For):
+                continue
+            fors.append(node)
             
             # Check for range(len()) pattern
-            suggestions.extend(self._check_range_len(tree, code))
+            suggestion = self._check_range_len(node)
+            if suggestion is not None:
+                range_len.append(suggestion)
             
             # Check for list comprehension opportunities
-            suggestions.extend(self._check_list_comprehension(tree, code))
-            
-            # Check for nested loops (complexity warning)
-            suggestions.extend(self._check_nested_loops(tree, code))
-            
-            # Check for membership testing in lists
-            suggestions.extend(self._check_membership_testing(tree, code))
+            suggestion = self._check_list_comprehension(node)
+            if suggestion is not None:
+                comprehension.append(suggestion)
         
-        except SyntaxError:
-            # If code has syntax errors, skip heuristic checks
-            pass
+        suggestions.extend(range_len)
+        suggestions.extend(comprehension)
         
-        return suggestions
-    
-    def _check_range_len(self, tree: ast.AST, code: str) -> List[Dict]:
-        """Check for range(len(x)) pattern that should use enumerate."""
-        suggestions = []
-        lines = code.split('\n')
+        # Check for nested loops (complexity warning)
+        suggestions.extend(self._check_nested_loops(fors))
         
-        for node in ast.walk(tree):
-            if isinstance(node, ast.For):
-                # Check if iter is range(len(...))
-                if isinstance(node.iter, ast.Call):
-                    if (isinstance(node.iter.func, ast.Name) and 
-                        node.iter.func.id == 'range' and
-                        len(node.iter.args) == 1):
-                        
-                        arg = node.iter.args[0]
-                        if isinstance(arg, ast.Call):
-                            if (isinstance(arg.func, ast.Name) and 
-                                arg.func.id == 'len'):
-                                
-                                suggestions.append({
-                                    "type": "readability",
-                                    "line": node.lineno,
-                                    "suggestion": "Use enumerate() instead of range(len())",
-                                    "impact": "More Pythonic and readable",
-                                    "example": "for i, item in enumerate(items):"
-                                })
+        # Check for membership testing in lists
+        suggestions.extend(self._check_membership_testing(code))
         
         return suggestions
     
-    def _check_list_comprehension(self, tree: ast.AST, code: str) -> List[Dict]:
+    def _check_range_len(self, node: ast.For) -> Optional[Suggestion]:
+        """Check for range(len(x)) pattern that should use enumerate."""
+        # Check if iter is range(len(...)); exact type checks are enough,
+        # since ast.parse never produces node subclasses
+        it = node.iter
+        if (type(it) is ast.Call and
+            type(it.func) is ast.Name and
+            it.func.id == 'range' and
+            len(it.args) == 1):
+            
+            arg = it.args[0]
+            if (type(arg) is ast.Call and
+                type(arg.func) is ast.Name and
+                arg.func.id == 'len'):
+                
+                return Suggestion(
+                    type="readability",
+                    line=node.lineno,
+                    suggestion="Use enumerate() instead of range(len())",
+                    impact="More Pythonic and readable",
+                    example="for i, item in enumerate(items):"
+                )
+        return None
+    
+    def _check_list_comprehension(self, node: ast.For) -> Optional[Suggestion]:
         """Check for loops that could be list comprehensions."""
-        suggestions = []
-        
-        for node in ast.walk(tree):
-            if isinstance(node, ast.For):
-                # Simple heuristic: if loop body is just append, suggest comprehension
-                if (len(node.body) == 1 and
-                    isinstance(node.body[0], ast.Expr) and
-                    isinstance(node.body[0].value, ast.Call)):
-                    
-                    call = node.body[0].value
-                    if (isinstance(call.func, ast.Attribute) and
-                        call.func.attr == 'append'):
-                        
-                        suggestions.append({
-                            "type": "readability",
-                            "line": node.lineno,
-                            "suggestion": "Consider using list comprehension",
-                            "impact": "More concise and Pythonic",
-                            "example": "result = [item for item in items]"
-                        })
-        
-        return suggestions
+        # Simple heuristic: if loop body is just append, suggest comprehension
+        body = node.body
+        if (len(body) == 1 and
+            type(body[0]) is ast.Expr and
+            type(body[0].value) is ast.Call):
+            
+            call = body[0].value
+            if (type(call.func) is ast.Attribute and
+                call.func.attr == 'append'):
+                
+                return Suggestion(
+                    type="readability",
+                    line=node.lineno,
+                    suggestion="Consider using list comprehension",
+                    impact="More concise and Pythonic",
+                    example="result = [item for item in items]"
+                )
+        return None
     
-    def _check_nested_loops(self, tree: ast.AST, code: str) -> List[Dict]:
-        """Check for nested loops (potential O(n²) complexity)."""
-        suggestions = []
+    def _check_nested_loops(self, fors: List[ast.For]) -> List[Suggestion]:
+        """
+        Check for nested loops (potential O(n²) complexity).
         
-        for node in ast.walk(tree):
-            if isinstance(node, ast.For):
-                # Check if body contains another for loop
-                for child in ast.walk(node):
-                    if child != node and isinstance(child, ast.For):
-                        suggestions.append({
-                            "type": "performance",
-                            "line": node.lineno,
-                            "suggestion": "Nested loops detected - consider optimizing",
-                            "impact": "May have O(n²) time complexity",
-                            "example": "Consider using sets, dicts, or different algorithm"
-                        })
-                        break  # Only report once per outer loop
+        Statements never partially overlap, so a for-loop contains
+        another one exactly when some for-loop starts on a later line
+        within its span; a sorted list of start lines answers that with
+        one bisect per loop instead of re-walking every loop body.
+        """
+        suggestions = []
+        starts = sorted(node.lineno for node in fors)
+        
+        for node in fors:
+            # First for-loop starting after this one's first line
+            i = bisect_right(starts, node.lineno)
+            if i < len(starts) and starts[i] <= (node.end_lineno or node.lineno):
+                suggestions.append(Suggestion(
+                    type="performance",
+                    line=node.lineno,
+                    suggestion="Nested loops detected - consider optimizing",
+                    impact="May have O(n²) time complexity",
+                    example="Consider using sets, dicts, or different algorithm"
+                ))
         
         return suggestions
     
-    def _check_membership_testing(self, tree: ast.AST, code: str) -> List[Dict]:
+    def _check_membership_testing(self, code: str) -> List[Suggestion]:
         """Check for 'in' operator used with lists (should use sets)."""
         suggestions = []
         
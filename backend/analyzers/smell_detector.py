@@ -14,18 +14,25 @@ how far the metric exceeds the threshold — using sigmoid normalization
 so the score is interpretable as a probability.
 
 Integrates with the existing CodeReviewAgent via agent_orchestrator.py.
+
+The module is fully annotated so it can optionally be compiled with mypyc
+(``pip install mypy && mypyc analyzers/smell_detector.py`` from backend/);
+the built extension is imported in place of this file.
 """
 
+import heapq
 import math
 import ast
-from typing import List, Dict, Any, Optional
+from typing import Iterator, List, Dict, Any, Optional, Tuple
 from dataclasses import dataclass
+from analyzers import feature_cache
+from analyzers.code_context import CodeContext
 from analyzers.feature_extractor import FeatureExtractor, FileFeatures, MethodFeatures, ClassFeatures
 
 
 # ─── Smell Thresholds (tunable) ─────────────────────────────────────────────
 
-THRESHOLDS = {
+THRESHOLDS: Dict[str, Dict[str, Any]] = {
     "long_method":           {"loc": 30},
     "god_class":             {"methods": 10, "wmc": 40},
     "feature_envy":          {"ext_ratio": 0.7},   # >70% external calls
@@ -36,10 +43,24 @@ THRESHOLDS = {
     "redundant_semicolon":   {"count": 0},
 }
 
+# Plain globals for the per-method checks (bound at import time)
+_LONG_METHOD_LOC: int = THRESHOLDS["long_method"]["loc"]
+_LPL_PARAMS: int = THRESHOLDS["large_parameter_list"]["params"]
+_DEEP_NESTING: int = THRESHOLDS["deep_nesting"]["depth"]
+_COMPLEXITY: int = THRESHOLDS["high_complexity"]["complexity"]
+_FE_RATIO: float = THRESHOLDS["feature_envy"]["ext_ratio"]
+_GC_METHODS: int = THRESHOLDS["god_class"]["methods"]
+_GC_WMC: int = THRESHOLDS["god_class"]["wmc"]
+
+
+# Shared by all detectors: the extractor is thread-safe and its node cache
+# then serves every detector instead of starting cold per instance
+_EXTRACTOR = FeatureExtractor()
+
 
 # ─── Data Model ──────────────────────────────────────────────────────────────
 
-@dataclass
+@dataclass(slots=True)
 class SmellResult:
     """A single detected code smell."""
     smell: str                    # Smell identifier (snake_case)
@@ -54,6 +75,80 @@ class SmellResult:
     severity: str                 # "error" | "warning" | "info"
 
 
+_SMELL_FIELDS = (
+    "smell", "display_name", "confidence", "location", "start_line",
+    "end_line", "metric_value", "threshold", "refactor_hint", "severity",
+)
+
+
+class SmellBatch:
+    """
+    Detected smells stored column-wise: one list per SmellResult field.
+
+    Sorting only permutes an index list over ``confidence``, and
+    to_dicts() builds dicts straight from the columns, so no SmellResult
+    objects are created unless results() is called.
+    """
+
+    __slots__ = _SMELL_FIELDS
+
+    def __init__(self) -> None:
+        self.smell: List[str] = []
+        self.display_name: List[str] = []
+        self.confidence: List[float] = []
+        self.location: List[str] = []
+        self.start_line: List[int] = []
+        self.end_line: List[int] = []
+        self.metric_value: List[Any] = []
+        self.threshold: List[Any] = []
+        self.refactor_hint: List[str] = []
+        self.severity: List[str] = []
+
+    def __len__(self) -> int:
+        return len(self.smell)
+
+    def append(self, smell: str, display_name: str, confidence: float, location: str,
+               start_line: int, end_line: int, metric_value: Any, threshold: Any,
+               refactor_hint: str, severity: str) -> None:
+        self.smell.append(smell)
+        self.display_name.append(display_name)
+        self.confidence.append(confidence)
+        self.location.append(location)
+        self.start_line.append(start_line)
+        self.end_line.append(end_line)
+        self.metric_value.append(metric_value)
+        self.threshold.append(threshold)
+        self.refactor_hint.append(refactor_hint)
+        self.severity.append(severity)
+
+    def order(self, top_k: Optional[int] = None) -> List[int]:
+        """Row indices by confidence descending (stable for ties), at most ``top_k``."""
+        rows = range(len(self.confidence))
+        if top_k is not None and top_k < len(rows):
+            # Same result as the sorted(...)[:top_k] below, in O(n log k)
+            return heapq.nlargest(top_k, rows, key=self.confidence.__getitem__)
+        return sorted(rows, key=self.confidence.__getitem__, reverse=True)
+
+    def _rows(self, top_k: Optional[int] = None) -> Iterator[List[Any]]:
+        columns: List[List[Any]] = [
+            self.smell, self.display_name, self.confidence, self.location,
+            self.start_line, self.end_line, self.metric_value, self.threshold,
+            self.refactor_hint, self.severity,
+        ]
+        for i in self.order(top_k):
+            yield [column[i] for column in columns]
+
+    def results(self, top_k: Optional[int] = None) -> List[SmellResult]:
+        return [SmellResult(*row) for row in self._rows(top_k)]
+
+    def iter_dicts(self, top_k: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+        for row in self._rows(top_k):
+            yield dict(zip(_SMELL_FIELDS, row))
+
+    def to_dicts(self, top_k: Optional[int] = None) -> List[Dict[str, Any]]:
+        return list(self.iter_dicts(top_k))
+
+
 # ─── Main Detector ───────────────────────────────────────────────────────────
 
 class SmellDetector:
@@ -68,138 +163,167 @@ class SmellDetector:
     directly into the ML service pipeline or be used standalone.
     """
 
-    def __init__(self):
-        self._extractor = FeatureExtractor()
+    def __init__(self, feature_cache_dir: Optional[str] = None):
+        """
+        Args:
+            feature_cache_dir: Optional directory for the on-disk feature
+                cache (see analyzers.feature_cache); when set, unchanged
+                sources skip parsing and extraction across runs
+        """
+        self._extractor = _EXTRACTOR
+        self._feature_cache_dir = feature_cache_dir
 
-    def detect(self, code: str) -> List[SmellResult]:
+    def detect_batch(self, code: str, ctx: Optional[CodeContext] = None) -> "SmellBatch":
         """
-        Run all smell checks on the given source code.
+        Run all smell checks, collecting results column-wise.
 
         Args:
             code: Python source as string
+            ctx: Optional shared context for ``code``
 
         Returns:
-            List of SmellResult objects (may be empty)
+            SmellBatch in detection order; results()/to_dicts() sort it
         """
-        features = self._extractor.extract(code)
+        if self._feature_cache_dir is not None:
+            features = feature_cache.get_or_extract(code, self._extractor, self._feature_cache_dir)
+        else:
+            features = self._extractor.extract_incremental(code, ctx=ctx)
         if features is None:
             raise ValueError("Invalid Python syntax")
 
-        smells: List[SmellResult] = []
+        # The checks below stay serial even for huge classes: each is about
+        # a microsecond of arithmetic, less than pickling its MethodFeatures
+        # for a worker would cost. Extraction, the expensive part, already
+        # fans large files out per class (see FeatureExtractor).
+        batch = SmellBatch()
 
         # Check standalone functions
         for fn in features.standalone_functions:
-            smells.extend(self._check_method_smells(fn, parent_name=None))
+            self._check_method_smells(fn, None, batch)
 
         # Check classes and their methods
         for cls in features.classes:
-            smells.extend(self._check_class_smells(cls))
+            self._check_class_smells(cls, batch)
             for method in cls.methods:
-                smells.extend(self._check_method_smells(method, parent_name=cls.name))
+                self._check_method_smells(method, cls.name, batch)
 
         # Check top-level statements for nonsense/useless code
-        smells.extend(self._check_file_level_smells(code, features))
+        self._check_file_level_smells(code, features, batch)
 
-        # Sort by confidence descending
-        smells.sort(key=lambda s: s.confidence, reverse=True)
-        return smells
+        return batch
 
-    def detect_to_dict(self, code: str) -> List[Dict[str, Any]]:
-        """Detect smells and return serializable dicts."""
-        return [_smell_to_dict(s) for s in self.detect(code)]
+    def detect(
+        self, code: str, ctx: Optional[CodeContext] = None, top_k: Optional[int] = None
+    ) -> List[SmellResult]:
+        """
+        Run all smell checks on the given source code.
+
+        Args:
+            code: Python source as string
+            ctx: Optional shared context for ``code``
+            top_k: Return only the ``top_k`` most confident smells (default: all)
+
+        Returns:
+            List of SmellResult objects (may be empty), by confidence descending
+        """
+        return self.detect_batch(code, ctx).results(top_k)
+
+    def detect_to_dict(
+        self, code: str, ctx: Optional[CodeContext] = None, top_k: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """Detect smells and return serializable dicts (no SmellResult objects)."""
+        return self.detect_batch(code, ctx).to_dicts(top_k)
+
+    def iter_detect(
+        self, code: str, ctx: Optional[CodeContext] = None, top_k: Optional[int] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Like detect_to_dict(), but yield each dict as it is built.
+
+        Detection runs (and may raise ValueError) when this is called;
+        only the dicts are produced lazily, for callers that serialize
+        one smell at a time.
+        """
+        return self.detect_batch(code, ctx).iter_dicts(top_k)
 
     # ─── Per-Method Checks ───────────────────────────────────────────────────
 
     def _check_method_smells(
-        self, fn: MethodFeatures, parent_name: Optional[str]
-    ) -> List[SmellResult]:
-        smells = []
+        self, fn: MethodFeatures, parent_name: Optional[str], batch: "SmellBatch"
+    ) -> None:
         location = f"{parent_name}.{fn.name}" if parent_name else fn.name
 
-        smells.extend(self._check_long_method(fn, location))
-        smells.extend(self._check_large_params(fn, location))
-        smells.extend(self._check_deep_nesting(fn, location))
-        smells.extend(self._check_high_complexity(fn, location))
-        smells.extend(self._check_feature_envy(fn, location))
+        self._check_long_method(fn, location, batch)
+        self._check_large_params(fn, location, batch)
+        self._check_deep_nesting(fn, location, batch)
+        self._check_high_complexity(fn, location, batch)
+        self._check_feature_envy(fn, location, batch)
 
-        return smells
-
-    def _check_long_method(self, fn: MethodFeatures, location: str) -> List[SmellResult]:
-        smells = []
-        if fn.loc > THRESHOLDS["long_method"]["loc"]:
-            excess = fn.loc - THRESHOLDS["long_method"]["loc"]
+    def _check_long_method(self, fn: MethodFeatures, location: str, batch: "SmellBatch") -> None:
+        if fn.loc > _LONG_METHOD_LOC:
+            excess = fn.loc - _LONG_METHOD_LOC
             confidence = _sigmoid(excess, scale=20)
-            smells.append(SmellResult(
+            batch.append(
                 smell="long_method", display_name="Long Method", confidence=round(confidence, 3), location=location,
-                start_line=fn.start_line, end_line=fn.end_line, metric_value=fn.loc, threshold=THRESHOLDS["long_method"]["loc"],
+                start_line=fn.start_line, end_line=fn.end_line, metric_value=fn.loc, threshold=_LONG_METHOD_LOC,
                 refactor_hint="Extract sub-routines using the 'Extract Method' refactoring.",
                 severity="warning" if fn.loc < 60 else "error",
-            ))
-        return smells
+            )
 
-    def _check_large_params(self, fn: MethodFeatures, location: str) -> List[SmellResult]:
-        smells = []
-        if fn.params > THRESHOLDS["large_parameter_list"]["params"]:
-            excess = fn.params - THRESHOLDS["large_parameter_list"]["params"]
+    def _check_large_params(self, fn: MethodFeatures, location: str, batch: "SmellBatch") -> None:
+        if fn.params > _LPL_PARAMS:
+            excess = fn.params - _LPL_PARAMS
             confidence = _sigmoid(excess, scale=3)
-            smells.append(SmellResult(
+            batch.append(
                 smell="large_parameter_list", display_name="Large Parameter List", confidence=round(confidence, 3), location=location,
-                start_line=fn.start_line, end_line=fn.end_line, metric_value=fn.params, threshold=THRESHOLDS["large_parameter_list"]["params"],
+                start_line=fn.start_line, end_line=fn.end_line, metric_value=fn.params, threshold=_LPL_PARAMS,
                 refactor_hint="Introduce a Parameter Object or Builder pattern.", severity="warning",
-            ))
-        return smells
+            )
 
-    def _check_deep_nesting(self, fn: MethodFeatures, location: str) -> List[SmellResult]:
-        smells = []
-        if fn.max_nesting_depth > THRESHOLDS["deep_nesting"]["depth"]:
-            excess = fn.max_nesting_depth - THRESHOLDS["deep_nesting"]["depth"]
+    def _check_deep_nesting(self, fn: MethodFeatures, location: str, batch: "SmellBatch") -> None:
+        if fn.max_nesting_depth > _DEEP_NESTING:
+            excess = fn.max_nesting_depth - _DEEP_NESTING
             confidence = _sigmoid(excess, scale=2)
-            smells.append(SmellResult(
+            batch.append(
                 smell="deep_nesting", display_name="Deep Nesting", confidence=round(confidence, 3), location=location,
-                start_line=fn.start_line, end_line=fn.end_line, metric_value=fn.max_nesting_depth, threshold=THRESHOLDS["deep_nesting"]["depth"],
+                start_line=fn.start_line, end_line=fn.end_line, metric_value=fn.max_nesting_depth, threshold=_DEEP_NESTING,
                 refactor_hint="Flatten using early returns or extract nested blocks into separate methods.", severity="warning",
-            ))
-        return smells
+            )
 
-    def _check_high_complexity(self, fn: MethodFeatures, location: str) -> List[SmellResult]:
-        smells = []
-        if fn.complexity > THRESHOLDS["high_complexity"]["complexity"]:
-            excess = fn.complexity - THRESHOLDS["high_complexity"]["complexity"]
+    def _check_high_complexity(self, fn: MethodFeatures, location: str, batch: "SmellBatch") -> None:
+        if fn.complexity > _COMPLEXITY:
+            excess = fn.complexity - _COMPLEXITY
             confidence = _sigmoid(excess, scale=5)
-            smells.append(SmellResult(
+            batch.append(
                 smell="high_complexity", display_name="High Cyclomatic Complexity", confidence=round(confidence, 3), location=location,
-                start_line=fn.start_line, end_line=fn.end_line, metric_value=fn.complexity, threshold=THRESHOLDS["high_complexity"]["complexity"],
+                start_line=fn.start_line, end_line=fn.end_line, metric_value=fn.complexity, threshold=_COMPLEXITY,
                 refactor_hint="Simplify branches: extract conditions, use polymorphism, or redesign logic.",
                 severity="error" if fn.complexity > 20 else "warning",
-            ))
-        return smells
+            )
 
-    def _check_feature_envy(self, fn: MethodFeatures, location: str) -> List[SmellResult]:
-        smells = []
+    def _check_feature_envy(self, fn: MethodFeatures, location: str, batch: "SmellBatch") -> None:
         total_calls = fn.local_calls + fn.external_calls
         if total_calls >= 3:
             ext_ratio = fn.external_calls / total_calls
-            thresh = THRESHOLDS["feature_envy"]["ext_ratio"]
+            thresh = _FE_RATIO
             if ext_ratio > thresh:
                 excess = ext_ratio - thresh
                 confidence = _sigmoid(excess * 10, scale=3)
-                smells.append(SmellResult(
+                batch.append(
                     smell="feature_envy", display_name="Feature Envy", confidence=round(confidence, 3), location=location,
                     start_line=fn.start_line, end_line=fn.end_line, metric_value=round(ext_ratio, 2), threshold=thresh,
                     refactor_hint="Move the method closer to the data it uses via 'Move Method' refactoring.", severity="warning",
-                ))
-        return smells
+                )
 
     # ─── Per-Class Checks ────────────────────────────────────────────────────
 
-    def _check_class_smells(self, cls: ClassFeatures) -> List[SmellResult]:
-        smells = []
+    def _check_class_smells(self, cls: ClassFeatures, batch: "SmellBatch") -> None:
 
         # God Class (method count)
-        if cls.num_methods > THRESHOLDS["god_class"]["methods"]:
-            excess = cls.num_methods - THRESHOLDS["god_class"]["methods"]
+        if cls.num_methods > _GC_METHODS:
+            excess = cls.num_methods - _GC_METHODS
             confidence = _sigmoid(excess, scale=5)
-            smells.append(SmellResult(
+            batch.append(
                 smell="god_class",
                 display_name="God Class",
                 confidence=round(confidence, 3),
@@ -207,16 +331,16 @@ class SmellDetector:
                 start_line=cls.start_line,
                 end_line=cls.end_line,
                 metric_value=cls.num_methods,
-                threshold=THRESHOLDS["god_class"]["methods"],
+                threshold=_GC_METHODS,
                 refactor_hint="Split the class by responsibility using the Single Responsibility Principle.",
                 severity="error" if cls.num_methods > 20 else "warning",
-            ))
+            )
 
         # God Class (WMC)
-        elif cls.wmc > THRESHOLDS["god_class"]["wmc"]:
-            excess = cls.wmc - THRESHOLDS["god_class"]["wmc"]
+        elif cls.wmc > _GC_WMC:
+            excess = cls.wmc - _GC_WMC
             confidence = _sigmoid(excess, scale=20)
-            smells.append(SmellResult(
+            batch.append(
                 smell="god_class",
                 display_name="God Class (High WMC)",
                 confidence=round(confidence, 3),
@@ -224,18 +348,15 @@ class SmellDetector:
                 start_line=cls.start_line,
                 end_line=cls.end_line,
                 metric_value=cls.wmc,
-                threshold=THRESHOLDS["god_class"]["wmc"],
+                threshold=_GC_WMC,
                 refactor_hint="Decompose complex methods and distribute responsibilities across smaller classes.",
                 severity="error",
-            ))
-
-        return smells
+            )
 
 
     # ─── File-Level Checks ───────────────────────────────────────────────────
 
-    def _check_file_level_smells(self, code: str, features: FileFeatures) -> List[SmellResult]:
-        smells = []
+    def _check_file_level_smells(self, code: str, features: FileFeatures, batch: "SmellBatch") -> None:
         
         # 1. Useless Top-level Statements (Nonsense code)
         for stmt in features.top_level_statements:
@@ -244,7 +365,7 @@ class SmellDetector:
                 val = node.value
                 # If it's just a Name or Constant at the top level, it's usually nonsense/useless
                 if isinstance(val, (ast.Name, ast.Constant)):
-                    smells.append(SmellResult(
+                    batch.append(
                         smell="useless_statement",
                         display_name="Useless Top-level Expression",
                         confidence=0.9,
@@ -255,7 +376,7 @@ class SmellDetector:
                         threshold=1,
                         refactor_hint="Remove this snippet; it has no effect and looks like nonsense/leftover code.",
                         severity="warning"
-                    ))
+                    )
 
         # 2. Redundant Semicolons
         lines = code.splitlines()
@@ -263,7 +384,7 @@ class SmellDetector:
             if ";" in line:
                 # Basic check: is it outside a string? (simplified)
                 if line.strip().endswith(";"):
-                    smells.append(SmellResult(
+                    batch.append(
                         smell="redundant_semicolon",
                         display_name="Redundant Semicolon",
                         confidence=0.8,
@@ -274,31 +395,27 @@ class SmellDetector:
                         threshold=0,
                         refactor_hint="Semicolons are not required in Python. Remove it for cleaner style.",
                         severity="info"
-                    ))
-
-        return smells
+                    )
 
 
 # ─── Utilities ───────────────────────────────────────────────────────────────
 
+# Precomputed sigmoid values for the scales the checks use and integer
+# excesses (metrics are counts, so nearly every call hits the table)
+_SIGMOID_SCALES = (2, 3, 5, 20)
+_SIGMOID_TABLE: Dict[Tuple[float, float], float] = {
+    (x, scale): 1.0 / (1.0 + math.exp(-x / scale))
+    for scale in _SIGMOID_SCALES
+    for x in range(256)
+}
+
+
 def _sigmoid(x: float, scale: float = 1.0) -> float:
     """
     Sigmoid function normalized to give ~0.5 when x=0, ~1.0 as x→ scale.
     Used to convert raw excess over threshold into a 0-1 probability.
     """
-    return 1.0 / (1.0 + math.exp(-x / scale))
-
-
-def _smell_to_dict(s: SmellResult) -> Dict[str, Any]:
-    return {
-        "smell": s.smell,
-        "display_name": s.display_name,
-        "confidence": s.confidence,
-        "location": s.location,
-        "start_line": s.start_line,
-        "end_line": s.end_line,
-        "metric_value": s.metric_value,
-        "threshold": s.threshold,
-        "refactor_hint": s.refactor_hint,
-        "severity": s.severity,
-    }
+    y = _SIGMOID_TABLE.get((x, scale))
+    if y is None:
+        y = 1.0 / (1.0 + math.exp(-x / scale))
+    return y
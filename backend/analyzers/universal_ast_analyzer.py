@@ -3,13 +3,18 @@ Universal AST Analyzer for Multi-Language Support.
 
 Uses language-specific parsers:
 - Python: Built-in ast module
-- JavaScript/TypeScript: esprima parser
+- JavaScript/TypeScript: esprima parser; the loop checks use tree-sitter
+  instead when installed (pip install tree-sitter tree-sitter-javascript)
 - Fallback: LLM-based analysis for unsupported languages
 """
 
 import ast
-from typing import List, Dict, Optional, Any
-from dataclasses import dataclass
+import re
+import threading
+from functools import lru_cache
+from typing import Callable, List, Dict, Optional, Any, Tuple
+from analyzers._ast_cache import get_ast
+from analyzers.js_tree_cache import get_js_tree
 
 
 try:
@@ -18,14 +23,101 @@ try:
 except ImportError:
     ESPRIMA_AVAILABLE = False
 
+# Optional C parser for the JavaScript loop checks; esprima parses in
+# pure Python and is still used for syntax errors and as the fallback
+try:
+    import tree_sitter
+    import tree_sitter_javascript
+    _TS_JAVASCRIPT = tree_sitter.Language(tree_sitter_javascript.language())
+    TREE_SITTER_AVAILABLE = True
+except ImportError:
+    TREE_SITTER_AVAILABLE = False
+
+# tree-sitter parsers must not be shared between threads
+_ts_local = threading.local()
+
+
+def _keyword_trigger(keywords: Tuple[str, ...]) -> Callable[[str], bool]:
+    """Return a test for whether ``code`` contains any of ``keywords`` as a word."""
+    pattern = re.compile(r'\b(?:' + '|'.join(keywords) + r')\b')
+
+    def has_keyword(code: str) -> bool:
+        # Substring tests scan at memchr speed, ~10x faster than the
+        # regex on large sources; the regex only confirms word
+        # boundaries once one of the words occurs at all
+        return any(k in code for k in keywords) and pattern.search(code) is not None
+
+    return has_keyword
+
+
+# Every issue find_issues() reports involves one of these keywords (a
+# `while`/`for` loop, or a statement after return/break/continue), so
+# sources without any of them are not parsed. Matches inside strings or
+# comments only cost the usual parse.
+_ISSUE_TRIGGERS = {
+    'python': _keyword_trigger(('while', 'return', 'break', 'continue')),
+    'javascript': _keyword_trigger(('while', 'for', 'return', 'break', 'continue')),
+}
 
-@dataclass
-class CodeSyntaxError:
-    """Represents a syntax error found in code"""
-    line: int
-    column: int
-    message: str
-    type: str = "SyntaxError"
+# JavaScript statements an unlabelled break exits, and function scopes
+# (a break never crosses them)
+_JS_BREAK_TARGETS = frozenset({
+    'WhileStatement', 'DoWhileStatement', 'ForStatement',
+    'ForInStatement', 'ForOfStatement', 'SwitchStatement',
+})
+_JS_FUNCTION_TYPES = frozenset({
+    'FunctionDeclaration', 'FunctionExpression', 'ArrowFunctionExpression',
+})
+
+# The same node kinds in the tree-sitter grammar. Class static blocks
+# (not parsed by esprima) are a break boundary too.
+_TS_BREAK_TARGETS = frozenset({
+    'while_statement', 'do_statement', 'for_statement', 'for_in_statement',
+    'switch_statement',
+})
+_TS_FUNCTION_TYPES = frozenset({
+    'function_declaration', 'function_expression', 'arrow_function',
+    'generator_function', 'generator_function_declaration', 'method_definition',
+})
+_TS_SCOPE_TYPES = _TS_FUNCTION_TYPES | {'class_static_block'}
+_TS_TERMINATORS = frozenset({'return_statement', 'break_statement', 'continue_statement'})
+
+# Python nodes whose ``body`` is scanned for unreachable statements
+_PY_BODY_SCOPES = (ast.FunctionDef, ast.AsyncFunctionDef, ast.For, ast.While)
+_PY_TERMINATORS = frozenset({ast.Return, ast.Break, ast.Continue})
+
+# Python statements and the non-expression nodes that hold them; only
+# these are walked, since breaks and loops never occur in expressions
+_PY_STMT_CONTAINERS = (ast.stmt, ast.excepthandler, ast.match_case)
+_PY_LOOPS = (ast.While, ast.For, ast.AsyncFor)
+_PY_SCOPES = (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)
+
+
+def _js_is_true(test: Optional[Dict[str, Any]]) -> bool:
+    """
+    Whether an esprima expression is a Literal equal to True: ``true``, or
+    the number 1 (``while (1)``), which is why this is == rather than is.
+    """
+    return test is not None and test.get('type') == 'Literal' and test.get('value') == True
+
+
+def _ts_is_true(node) -> bool:
+    """
+    _js_is_true for a tree-sitter expression (parentheses are transparent,
+    as in esprima's tree).
+    """
+    while node.type == 'parenthesized_expression':
+        node = next(c for c in node.named_children if c.type != 'comment')
+    if node.type == 'true':
+        return True
+    if node.type == 'number':
+        text = node.text.decode().lower()
+        try:
+            value = int(text, 0) if text[:2] in ('0x', '0o', '0b') else float(text)
+        except ValueError:
+            return False
+        return value == 1
+    return False
 
 
 class UniversalASTAnalyzer:
@@ -46,6 +138,8 @@ class UniversalASTAnalyzer:
         'typescriptreact': 'javascript',
     }
     
+    __slots__ = ('language', 'parser_type', '_syntax_check', '_issue_finder', '_issue_trigger')
+    
     def __init__(self, language: str):
         """
         Initialize analyzer for specific language.
@@ -58,6 +152,16 @@ class UniversalASTAnalyzer:
         
         if not self.parser_type:
             raise ValueError(f"Language {language} not supported. Supported: {list(self.SUPPORTED_LANGUAGES.keys())}")
+        
+        # Bind the per-language implementations once instead of comparing
+        # parser_type on every call
+        if self.parser_type == 'python':
+            self._syntax_check = self._check_python_syntax
+            self._issue_finder = self._find_python_issues
+        else:
+            self._syntax_check = self._check_javascript_syntax
+            self._issue_finder = self._find_javascript_issues
+        self._issue_trigger = _ISSUE_TRIGGERS[self.parser_type]
     
     def check_syntax(self, code: str) -> Dict[str, Any]:
         """
@@ -69,17 +173,12 @@ class UniversalASTAnalyzer:
         Returns:
             Dict with 'status' and 'errors' keys
         """
-        if self.parser_type == 'python':
-            return self._check_python_syntax(code)
-        elif self.parser_type == 'javascript':
-            return self._check_javascript_syntax(code)
-        else:
-            return {'status': 'unknown', 'errors': []}
+        return self._syntax_check(code)
     
     def _check_python_syntax(self, code: str) -> Dict[str, Any]:
         """Check Python syntax using ast module"""
         try:
-            ast.parse(code)
+            get_ast(code)
             return {'status': 'valid', 'errors': []}
         except SyntaxError as e:
             return {
@@ -97,6 +196,13 @@ class UniversalASTAnalyzer:
         if not ESPRIMA_AVAILABLE:
             return {'status': 'unknown', 'errors': []}
         
+        # Tolerant mode only records the errors a strict parse would raise,
+        # so a cached tolerant tree without errors means the code is valid;
+        # otherwise parse strictly for the error details
+        tree = get_js_tree(code)
+        if tree is not None and not tree.get('errors'):
+            return {'status': 'valid', 'errors': []}
+        
         try:
             esprima.parseScript(code, {'tolerant': False})
             return {'status': 'valid', 'errors': []}
@@ -111,76 +217,177 @@ class UniversalASTAnalyzer:
                 }]
             }
     
-    def find_infinite_loops(self, code: str) -> List[Dict[str, Any]]:
+    def find_issues(self, code: str, tree: Optional[ast.AST] = None) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Detect infinite loops and unreachable code in one pass over the tree.
+        
+        Args:
+            code: Source code to analyze
+            tree: Optional pre-parsed Python AST of ``code``
+            
+        Returns:
+            Dict with 'infinite_loops' and 'unreachable_code' issue lists
+        """
+        if not self._issue_trigger(code):
+            # No keyword that either check reports on: skip parsing
+            infinite, unreachable = [], []
+        else:
+            infinite, unreachable = self._issue_finder(code, tree)
+        return {'infinite_loops': infinite, 'unreachable_code': unreachable}
+    
+    def find_infinite_loops(self, code: str, tree: Optional[ast.AST] = None) -> List[Dict[str, Any]]:
         """
         Detect infinite loop patterns.
         
         Args:
             code: Source code to analyze
+            tree: Optional pre-parsed Python AST of ``code``
             
         Returns:
             List of detected infinite loop issues
         """
-        if self.parser_type == 'python':
-            return self._find_python_infinite_loops(code)
-        elif self.parser_type == 'javascript':
-            return self._find_javascript_infinite_loops(code)
-        else:
-            return []
+        return self.find_issues(code, tree)['infinite_loops']
     
-    def _find_python_infinite_loops(self, code: str) -> List[Dict[str, Any]]:
-        """Find infinite loops in Python code"""
-        try:
-            tree = ast.parse(code)
-        except SyntaxError:
-            return []
+    def find_unreachable_code(self, code: str, tree: Optional[ast.AST] = None) -> List[Dict[str, Any]]:
+        """
+        Detect unreachable code after return/break statements.
+        
+        Args:
+            code: Source code to analyze
+            tree: Optional pre-parsed Python AST of ``code``
+            
+        Returns:
+            List of unreachable code issues
+        """
+        return self.find_issues(code, tree)['unreachable_code']
+    
+    def analyze_all(self, code: str) -> Dict[str, Any]:
+        """
+        Check syntax and, if the code is valid, find loop issues.
         
-        issues = []
+        The tree parsed for the syntax check is the one the issue checks
+        walk (both go through the shared parse caches), and invalid code
+        is not parsed a second time.
         
-        for node in ast.walk(tree):
-            if isinstance(node, ast.While):
-                # Check for while True without break
-                if self._is_constant_true(node.test):
-                    has_break = self._contains_break(node)
-                    if not has_break:
-                        issues.append({
-                            'type': 'infinite_loop',
-                            'line': node.lineno,
-                            'description': 'Infinite loop: while True without break statement',
-                            'severity': 'error'
-                        })
+        Args:
+            code: Source code to analyze
+            
+        Returns:
+            Dict with 'syntax' (as from check_syntax), 'infinite_loops'
+            and 'unreachable_code' keys
+        """
+        syntax = self.check_syntax(code)
+        if syntax['status'] == 'error':
+            return {'syntax': syntax, 'infinite_loops': [], 'unreachable_code': []}
+        return {'syntax': syntax, **self.find_issues(code)}
+    
+    def _find_python_issues(self, code: str, tree: Optional[ast.AST] = None) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """Find (infinite loops, unreachable code) in Python code"""
+        if tree is None:
+            try:
+                tree = get_ast(code)
+            except SyntaxError:
+                return [], []
+        
+        # One breadth-first walk over statements (same order as ast.walk),
+        # carrying the loop a break at each node would exit: collect
+        # while-True loops, note exited loops, and scan function and loop
+        # bodies for statements after return/break/continue
+        candidates = []
+        exited = set()
+        unreachable = []
+        # Bound once: locals are cheaper than global/attribute lookups in
+        # the per-statement loop
+        Break, While = ast.Break, ast.While
+        body_scopes, terminators = _PY_BODY_SCOPES, _PY_TERMINATORS
+        queue_statements = self._queue_statements
+        queue = [(tree, None)]
+        for node, loop in queue:  # The list grows while it is iterated
+            if type(node) is Break:
+                if loop is not None:
+                    exited.add(loop)
+                continue
+            queue_statements(node, loop, queue)
+            if not isinstance(node, body_scopes):
+                continue
+            if type(node) is While and self._is_constant_true(node.test):
+                candidates.append(node)
+            
+            # A terminator as the last statement hides nothing
+            body = node.body
+            for i in range(len(body) - 1):
+                stmt = body[i]
+                if type(stmt) in terminators:
+                    stmt_type = stmt.__class__.__name__.lower()
+                    unreachable.append({
+                        'type': 'unreachable_code',
+                        'line': body[i + 1].lineno,
+                        'description': f'Unreachable code after {stmt_type} statement',
+                        'severity': 'warning'
+                    })
+                    break
         
-        return issues
+        infinite = []
+        for node in candidates:
+            # Check for while True without break
+            if node not in exited:
+                infinite.append({
+                    'type': 'infinite_loop',
+                    'line': node.lineno,
+                    'description': 'Infinite loop: while True without break statement',
+                    'severity': 'error'
+                })
+        
+        return infinite, unreachable
+    
+    @staticmethod
+    def _queue_statements(node: ast.AST, loop: Optional[ast.AST], queue: list):
+        """Queue the statement-level children of ``node`` with the loop a
+        break among them exits (a loop's ``else`` exits the next loop out;
+        function and class bodies are boundaries)"""
+        if isinstance(node, _PY_LOOPS):
+            queue.extend((child, node) for child in node.body)
+            queue.extend((child, loop) for child in node.orelse)
+            return
+        if isinstance(node, _PY_SCOPES):
+            loop = None
+        for child in ast.iter_child_nodes(node):
+            if isinstance(child, _PY_STMT_CONTAINERS):
+                queue.append((child, loop))
     
-    def _find_javascript_infinite_loops(self, code: str) -> List[Dict[str, Any]]:
-        """Find infinite loops in JavaScript code"""
+    def _find_javascript_issues(self, code: str, tree: Optional[ast.AST] = None) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """Find (infinite loops, unreachable code) in JavaScript code (``tree``
+        is only accepted for a common signature with _find_python_issues)"""
+        if TREE_SITTER_AVAILABLE:
+            found = self._find_javascript_issues_ts(code)
+            if found is not None:
+                return found
+        
         if not ESPRIMA_AVAILABLE:
-            return []
+            return [], []
         
-        try:
-            tree = esprima.parseScript(code, {'loc': True, 'tolerant': True})
-        except:
-            return []
+        tree = get_js_tree(code)
+        if tree is None:
+            return [], []
         
-        issues = []
+        infinite = []
+        unreachable = []
         
-        def traverse(node):
-            """Recursively traverse AST"""
-            if not isinstance(node, dict):
-                return
-            
+        # Pre-order walk with an explicit stack (children pushed in
+        # reverse so they pop in source order); deep trees cannot hit
+        # the recursion limit
+        stack = [tree]
+        while stack:
+            node = stack.pop()
             node_type = node.get('type')
             
             # Check for while(true) loops
             if node_type == 'WhileStatement':
-                test = node.get('test', {})
-                # Check for literal true (JavaScript uses lowercase true)
-                if test.get('type') == 'Literal' and test.get('value') == True:
+                if _js_is_true(node.get('test')):
                     # Check if there's a break statement
-                    has_break = self._js_has_break(node.get('body'))
-                    if not has_break:
+                    if not self._js_has_break(node.get('body')):
                         loc = node.get('loc', {}).get('start', {})
-                        issues.append({
+                        infinite.append({
                             'type': 'infinite_loop',
                             'line': loc.get('line', 0),
                             'description': 'Infinite loop: while(true) without break statement',
@@ -189,48 +396,166 @@ class UniversalASTAnalyzer:
             
             # Check for for(;;) loops
             elif node_type == 'ForStatement':
-                if (not node.get('test') or 
-                    (node.get('test', {}).get('type') == 'Literal' and 
-                     node.get('test', {}).get('value') == True)):
-                    has_break = self._js_has_break(node.get('body'))
-                    if not has_break:
+                test = node.get('test')
+                if test is None or _js_is_true(test):
+                    if not self._js_has_break(node.get('body')):
                         loc = node.get('loc', {}).get('start', {})
-                        issues.append({
+                        infinite.append({
                             'type': 'infinite_loop',
                             'line': loc.get('line', 0),
                             'description': 'Infinite loop: for(;;) without break statement',
                             'severity': 'error'
                         })
             
+            # Statements after return/break/continue in function bodies and blocks
+            elif node_type in ('FunctionDeclaration', 'FunctionExpression', 'ArrowFunctionExpression'):
+                body = node.get('body')
+                if isinstance(body, dict) and body.get('type') == 'BlockStatement':
+                    self._check_js_block(body.get('body', []), unreachable)
+            
+            elif node_type == 'BlockStatement':
+                self._check_js_block(node.get('body', []), unreachable)
+            
             # Traverse children
-            for key, value in node.items():
+            children = []
+            for value in node.values():
                 if isinstance(value, dict):
-                    traverse(value)
+                    children.append(value)
                 elif isinstance(value, list):
-                    for item in value:
-                        if isinstance(item, dict):
-                            traverse(item)
+                    children.extend(item for item in value if isinstance(item, dict))
+            stack.extend(reversed(children))
         
-        traverse(tree.toDict())  # Convert to dict before traversing
-        return issues
+        return infinite, unreachable
+    
+    def _find_javascript_issues_ts(self, code: str) -> Optional[Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]]:
+        """
+        _find_javascript_issues on a tree-sitter tree (~40x faster than
+        parsing with esprima).
+        
+        For code both parsers accept, reports exactly what the esprima
+        walk reports. Code only tree-sitter accepts (newer syntax, or
+        errors esprima checks beyond the grammar, like a stray break) is
+        analyzed too. Returns None if tree-sitter finds syntax errors, so
+        esprima's error recovery decides what is analyzed.
+        """
+        parser = getattr(_ts_local, 'parser', None)
+        if parser is None:
+            parser = _ts_local.parser = tree_sitter.Parser(_TS_JAVASCRIPT)
+        root = parser.parse(code.encode('utf-8', 'surrogatepass')).root_node
+        if root.has_error:
+            return None
+        
+        infinite = []
+        unreachable = []
+        stack = [root]
+        while stack:
+            node = stack.pop()
+            node_type = node.type
+            
+            if node_type == 'while_statement':
+                if (_ts_is_true(node.child_by_field_name('condition'))
+                        and not self._ts_has_break(node.child_by_field_name('body'))):
+                    infinite.append({
+                        'type': 'infinite_loop',
+                        'line': node.start_point[0] + 1,
+                        'description': 'Infinite loop: while(true) without break statement',
+                        'severity': 'error'
+                    })
+            
+            elif node_type == 'for_statement':
+                condition = node.child_by_field_name('condition')
+                if ((condition.type == 'empty_statement' or _ts_is_true(condition))
+                        and not self._ts_has_break(node.child_by_field_name('body'))):
+                    infinite.append({
+                        'type': 'infinite_loop',
+                        'line': node.start_point[0] + 1,
+                        'description': 'Infinite loop: for(;;) without break statement',
+                        'severity': 'error'
+                    })
+            
+            # Function bodies are also reached as blocks below, so (as with
+            # esprima's BlockStatement) they are checked twice
+            elif node_type in _TS_FUNCTION_TYPES:
+                body = node.child_by_field_name('body')
+                if body is not None and body.type == 'statement_block':
+                    self._check_ts_block(body, unreachable)
+            
+            elif node_type == 'statement_block':
+                self._check_ts_block(node, unreachable)
+            
+            stack.extend(reversed(node.named_children))
+        
+        return infinite, unreachable
+    
+    def _ts_has_break(self, node) -> bool:
+        """_js_has_break for a tree-sitter loop body"""
+        stack = [(node, False, frozenset())]
+        while stack:
+            n, nested, labels = stack.pop()
+            node_type = n.type
+            if node_type == 'break_statement':
+                label = n.child_by_field_name('label')
+                if label is None:
+                    if not nested:
+                        return True
+                elif label.text not in labels:
+                    return True
+                continue
+            if node_type in _TS_SCOPE_TYPES:
+                continue
+            if node_type in _TS_BREAK_TARGETS:
+                nested = True
+            elif node_type == 'labeled_statement':
+                labels = labels | {n.child_by_field_name('label').text}
+            stack.extend((child, nested, labels) for child in n.named_children)
+        
+        return False
+    
+    def _check_ts_block(self, block, issues: List[Dict[str, Any]]):
+        """_check_js_block for a tree-sitter statement_block"""
+        body = [stmt for stmt in block.named_children if stmt.type != 'comment']
+        for i in range(len(body) - 1):
+            stmt_type = body[i].type
+            if stmt_type in _TS_TERMINATORS:
+                issues.append({
+                    'type': 'unreachable_code',
+                    'line': body[i + 1].start_point[0] + 1,
+                    'description': f'Unreachable code after {stmt_type.split("_")[0]} statement',
+                    'severity': 'warning'
+                })
+                break
     
     def _js_has_break(self, node) -> bool:
-        """Check if JavaScript AST node contains a break statement"""
+        """Check if a JavaScript loop body contains a break that exits the loop"""
         if not isinstance(node, dict):
             return False
         
-        if node.get('type') == 'BreakStatement':
-            return True
-        
-        # Traverse children
-        for key, value in node.items():
-            if isinstance(value, dict):
-                if self._js_has_break(value):
-                    return True
-            elif isinstance(value, list):
-                for item in value:
-                    if isinstance(item, dict) and self._js_has_break(item):
+        # Entries are (node, nested, labels): below an inner loop or switch
+        # only labelled breaks can leave this loop, and only when the label
+        # is not declared inside the body. Functions are separate scopes.
+        stack = [(node, False, frozenset())]
+        while stack:
+            n, nested, labels = stack.pop()
+            node_type = n.get('type')
+            if node_type == 'BreakStatement':
+                label = n.get('label')
+                if label is None:
+                    if not nested:
                         return True
+                elif label.get('name') not in labels:
+                    return True
+                continue
+            if node_type in _JS_FUNCTION_TYPES:
+                continue
+            if node_type in _JS_BREAK_TARGETS:
+                nested = True
+            elif node_type == 'LabeledStatement':
+                labels = labels | {n.get('label', {}).get('name')}
+            for value in n.values():
+                if isinstance(value, dict):
+                    stack.append((value, nested, labels))
+                elif isinstance(value, list):
+                    stack.extend((item, nested, labels) for item in value if isinstance(item, dict))
         
         return False
     
@@ -238,91 +563,6 @@ class UniversalASTAnalyzer:
         """Check if Python AST node is constant True"""
         return isinstance(node, ast.Constant) and node.value is True
     
-    def _contains_break(self, node: ast.AST) -> bool:
-        """Check if Python AST node contains a break statement"""
-        for child in ast.walk(node):
-            if isinstance(child, ast.Break):
-                return True
-        return False
-    
-    def find_unreachable_code(self, code: str) -> List[Dict[str, Any]]:
-        """
-        Detect unreachable code after return/break statements.
-        
-        Args:
-            code: Source code to analyze
-            
-        Returns:
-            List of unreachable code issues
-        """
-        if self.parser_type == 'python':
-            return self._find_python_unreachable(code)
-        elif self.parser_type == 'javascript':
-            return self._find_javascript_unreachable(code)
-        else:
-            return []
-    
-    def _find_python_unreachable(self, code: str) -> List[Dict[str, Any]]:
-        """Find unreachable code in Python"""
-        try:
-            tree = ast.parse(code)
-        except SyntaxError:
-            return []
-        
-        issues = []
-        
-        for node in ast.walk(tree):
-            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.For, ast.While)):
-                body = node.body
-                for i, stmt in enumerate(body):
-                    if isinstance(stmt, (ast.Return, ast.Break, ast.Continue)):
-                        if i < len(body) - 1:
-                            next_stmt = body[i + 1]
-                            stmt_type = stmt.__class__.__name__.lower()
-                            issues.append({
-                                'type': 'unreachable_code',
-                                'line': next_stmt.lineno,
-                                'description': f'Unreachable code after {stmt_type} statement',
-                                'severity': 'warning'
-                            })
-                            break
-        
-        return issues
-    
-    def _find_javascript_unreachable(self, code: str) -> List[Dict[str, Any]]:
-        """Find unreachable code in JavaScript"""
-        if not ESPRIMA_AVAILABLE:
-            return []
-        
-        try:
-            tree = esprima.parseScript(code, {'loc': True, 'tolerant': True})
-        except:
-            return []
-            
-        issues = []
-        
-        def traverse(node):
-            if not isinstance(node, dict): return
-            
-            node_type = node.get('type')
-            
-            if node_type in ['FunctionDeclaration', 'FunctionExpression', 'ArrowFunctionExpression']:
-                body = node.get('body')
-                if isinstance(body, dict) and body.get('type') == 'BlockStatement':
-                    self._check_js_block(body.get('body', []), issues)
-                    
-            elif node_type == 'BlockStatement':
-                self._check_js_block(node.get('body', []), issues)
-                
-            for key, value in node.items():
-                if isinstance(value, dict): traverse(value)
-                elif isinstance(value, list):
-                    for item in value:
-                        if isinstance(item, dict): traverse(item)
-                        
-        traverse(tree.toDict())
-        return issues
-        
     def _check_js_block(self, body_list: Any, issues: List[Dict[str, Any]]):
         """Helper to check a JS block for unreachable code."""
         if not isinstance(body_list, list): return
@@ -343,3 +583,15 @@ class UniversalASTAnalyzer:
                             'severity': 'warning'
                         })
                     break
+
+
+@lru_cache(maxsize=32)
+def get_analyzer(language: str) -> UniversalASTAnalyzer:
+    """
+    Return a shared analyzer for ``language``.
+
+    Analyzers hold no per-call state, so one instance per language is
+    reused across requests. Unsupported languages raise ValueError and
+    are not cached.
+    """
+    return UniversalASTAnalyzer(language)
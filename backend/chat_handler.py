@@ -3,22 +3,51 @@ Chat handler for interactive code analysis conversations.
 Manages context and generates responses to user questions about code analysis.
 """
 
+import json
 import requests
-from typing import List, Dict, Optional
-from pydantic import BaseModel
+from requests.adapters import HTTPAdapter
+from dataclasses import dataclass, field
+from typing import Iterator, List, Dict, Optional
 
 
-class ChatMessage(BaseModel):
+# Plain data carriers: the /chat request is already validated by its
+# pydantic model in main.py, so these are not validated again per turn
+
+@dataclass(slots=True)
+class ChatMessage:
     """Represents a single chat message."""
     role: str  # 'user' or 'assistant'
     content: str
 
 
-class ChatContext(BaseModel):
+@dataclass(slots=True)
+class ChatContext:
     """Context for a chat conversation."""
     code: str
     analysis_results: Dict
-    chat_history: List[ChatMessage] = []
+    chat_history: List[ChatMessage] = field(default_factory=list)
+
+
+# Sent as the system message with every chat turn
+_SYSTEM_PROMPT = """You are an expert Python code analysis assistant. You help developers understand code issues, errors, and optimizations.
+
+Your role:
+- Answer questions about the analyzed code and its issues
+- Explain errors, warnings, and optimization suggestions clearly
+- Provide actionable advice on how to fix problems
+- Reference specific line numbers when relevant
+- Be concise but thorough
+
+Guidelines:
+- Use the code and analysis results provided as context
+- If asked about a specific error or suggestion, explain it in detail
+- Suggest concrete fixes with code examples when appropriate
+- If the question is unclear, ask for clarification
+- Stay focused on the code analysis context provided"""
+
+
+class _ModelUnavailable(Exception):
+    """Ollama answered with a non-200 status."""
 
 
 class ChatHandler:
@@ -35,6 +64,17 @@ class ChatHandler:
         self.base_url = base_url.rstrip('/')
         self.model = model
         self.timeout = 30
+        
+        # One keep-alive connection pool for every call to Ollama, instead
+        # of a new TCP connection per chat turn
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=4)
+        self._session.mount('http://', adapter)
+        self._session.mount('https://', adapter)
+    
+    def close(self) -> None:
+        """Close pooled connections to Ollama."""
+        self._session.close()
     
     def _build_context_prompt(self, context: ChatContext) -> str:
         """
@@ -87,9 +127,9 @@ class ChatHandler:
         
         return "\n".join(prompt_parts)
     
-    def _generate_response(self, user_message: str, context_prompt: str, chat_history: List[ChatMessage]) -> str:
+    def _build_payload(self, user_message: str, context_prompt: str, chat_history: List[ChatMessage]) -> Dict:
         """
-        Generate a response using Ollama.
+        Build the Ollama generate request for a chat turn.
         
         Args:
             user_message: User's question
@@ -97,24 +137,8 @@ class ChatHandler:
             chat_history: Previous messages in conversation
             
         Returns:
-            AI-generated response
+            JSON payload for /api/generate (streaming)
         """
-        system_prompt = """You are an expert Python code analysis assistant. You help developers understand code issues, errors, and optimizations.
-
-Your role:
-- Answer questions about the analyzed code and its issues
-- Explain errors, warnings, and optimization suggestions clearly
-- Provide actionable advice on how to fix problems
-- Reference specific line numbers when relevant
-- Be concise but thorough
-
-Guidelines:
-- Use the code and analysis results provided as context
-- If asked about a specific error or suggestion, explain it in detail
-- Suggest concrete fixes with code examples when appropriate
-- If the question is unclear, ask for clarification
-- Stay focused on the code analysis context provided"""
-
         # Build the full prompt with context and history
         full_prompt_parts = [context_prompt, "\n\n# Conversation:"]
         
@@ -129,34 +153,69 @@ Guidelines:
         
         full_prompt = "\n".join(full_prompt_parts)
         
-        payload = {
+        return {
             "model": self.model,
             "prompt": full_prompt,
-            "system": system_prompt,
-            "stream": False,
+            "system": _SYSTEM_PROMPT,
+            "stream": True,
             "options": {
                 "temperature": 0.7,
                 "top_p": 0.9,
             }
         }
+    
+    def _stream_tokens(self, payload: Dict) -> Iterator[str]:
+        """
+        Yield response text from Ollama as it is generated.
         
-        try:
-            response = requests.post(
-                f"{self.base_url}/api/generate",
-                json=payload,
-                timeout=self.timeout
-            )
-            
-            if response.status_code == 200:
-                return response.json().get("response", "I'm sorry, I couldn't generate a response.")
-            else:
-                return "I'm having trouble connecting to the AI model. Please try again."
-        
-        except requests.exceptions.Timeout:
+        Raises requests exceptions, or _ModelUnavailable on a non-200 reply.
+        """
+        with self._session.post(
+            f"{self.base_url}/api/generate",
+            json=payload,
+            timeout=self.timeout,
+            stream=True
+        ) as response:
+            if response.status_code != 200:
+                raise _ModelUnavailable(response.status_code)
+            # Newline-delimited JSON, one chunk per few tokens
+            for line in response.iter_lines():
+                if not line:
+                    continue
+                chunk = json.loads(line)
+                text = chunk.get("response", "")
+                if text:
+                    yield text
+                if chunk.get("done"):
+                    break
+    
+    def _failure_message(self, error: Exception) -> str:
+        """User-facing reply for a failed generation."""
+        if isinstance(error, _ModelUnavailable):
+            return "I'm having trouble connecting to the AI model. Please try again."
+        if isinstance(error, requests.exceptions.Timeout):
             return "The request timed out. Please try asking a simpler question."
+        print(f"Chat generation error: {error}")
+        return "An error occurred while generating a response. Please try again."
+    
+    def _generate_response(self, user_message: str, context_prompt: str, chat_history: List[ChatMessage]) -> str:
+        """
+        Generate a complete response using Ollama.
+        
+        Args:
+            user_message: User's question
+            context_prompt: Context about code and analysis
+            chat_history: Previous messages in conversation
+            
+        Returns:
+            AI-generated response
+        """
+        payload = self._build_payload(user_message, context_prompt, chat_history)
+        try:
+            response = "".join(self._stream_tokens(payload))
         except Exception as e:
-            print(f"Chat generation error: {e}")
-            return "An error occurred while generating a response. Please try again."
+            return self._failure_message(e)
+        return response or "I'm sorry, I couldn't generate a response."
     
     def chat(self, user_message: str, context: ChatContext) -> str:
         """
@@ -177,10 +236,31 @@ Guidelines:
         
         return response
     
+    def chat_stream(self, user_message: str, context: ChatContext) -> Iterator[str]:
+        """
+        Like chat(), but yield the response in pieces as the model produces them.
+        
+        If generation fails, the failure message is yielded (after any
+        text already sent).
+        """
+        payload = self._build_payload(
+            user_message, self._build_context_prompt(context), context.chat_history
+        )
+        sent = False
+        try:
+            for text in self._stream_tokens(payload):
+                sent = True
+                yield text
+        except Exception as e:
+            yield ("\n\n" if sent else "") + self._failure_message(e)
+            return
+        if not sent:
+            yield "I'm sorry, I couldn't generate a response."
+    
     def is_available(self) -> bool:
         """Check if Ollama is running and available."""
         try:
-            response = requests.get(f"{self.base_url}/api/tags", timeout=5)
+            response = self._session.get(f"{self.base_url}/api/tags", timeout=5)
             return response.status_code == 200
         except Exception:
             return False
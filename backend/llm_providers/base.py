@@ -10,6 +10,50 @@ from typing import List, Dict
 class LLMProvider(ABC):
     """Abstract interface for LLM providers."""
     
+    @abstractmethod
+    def generate(self, prompt: str) -> str:
+        """
+        Send a raw prompt to the model and return its text completion.
+        
+        Args:
+            prompt: Full prompt text
+            
+        Returns:
+            Generated text ("" on failure)
+        """
+        pass
+    
+    def generate_json(self, prompt: str) -> str:
+        """
+        Like generate(), for prompts that ask for a single JSON object.
+        
+        Providers with a JSON output mode should override this so the reply
+        is guaranteed to parse; the default is a plain generate() call.
+        
+        Args:
+            prompt: Full prompt text
+            
+        Returns:
+            Generated text ("" on failure)
+        """
+        return self.generate(prompt)
+    
+    def prepare_code(self, code: str) -> str:
+        """
+        Source code as it should be embedded in an analysis prompt.
+        
+        Providers with a small context window or slow prompt processing
+        should override this to shorten long files; the default returns
+        ``code`` unchanged.
+        
+        Args:
+            code: Python source code
+            
+        Returns:
+            Code to put in the prompt
+        """
+        return code
+    
     @abstractmethod
     def analyze_logic(self, code: str) -> List[str]:
         """
@@ -23,6 +67,21 @@ class LLMProvider(ABC):
         """
         pass
     
+    def analyze_logic_batch(self, codes: List[str]) -> List[List[str]]:
+        """
+        Analyze several snippets for logical errors.
+        
+        Providers whose API can serve multiple prompts per request should
+        override this; the default issues one analyze_logic call per snippet.
+        
+        Args:
+            codes: Python source snippets
+            
+        Returns:
+            One list of concerns per snippet, in input order
+        """
+        return [self.analyze_logic(code) for code in codes]
+    
     @abstractmethod
     def suggest_optimizations(self, code: str) -> List[Dict]:
         """
@@ -41,6 +100,14 @@ class LLMProvider(ABC):
         """
         pass
     
+    def warm_up(self) -> None:
+        """
+        Load the model ahead of the first request.
+        
+        Local providers that load models on demand should override this;
+        hosted APIs have nothing to load. Failures must not raise.
+        """
+    
     @abstractmethod
     def is_available(self) -> bool:
         """
@@ -3,11 +3,206 @@ Ollama LLM provider implementation.
 Uses local Llama models via Ollama for code analysis.
 """
 
+import ast
+import hashlib
 import requests
 import json
-from typing import List, Dict, Optional
+from requests.adapters import HTTPAdapter
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from typing import Any, Callable, List, Dict, Optional, Tuple
 from .base import LLMProvider
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+# Concerns / suggestions returned per analysis; generation stops once
+# this many have been streamed
+_MAX_RESULTS = 5
+
+# Longer code is cut down before it goes into an analysis prompt: the
+# first and last _EDGE_LINES lines, plus whole functions from the middle
+# (longest first) up to _MAX_CODE_LINES in total
+_MAX_CODE_LINES = 200
+_EDGE_LINES = 50
+
+# Output token budgets: five "Line X: ..." concerns, or five
+# TYPE | LINE | ... rows with a one-line example, plus some preamble
+_LOGIC_MAX_TOKENS = 256
+_OPTIMIZATION_MAX_TOKENS = 384
+# generate_json(): the combined review's five concerns and five
+# suggestion objects, with JSON keys and quoting
+_JSON_MAX_TOKENS = 768
+
+# Keep the model loaded between reviews (Ollama unloads after 5 minutes
+# by default), so the next request skips loading it and keeps its
+# prompt cache
+_KEEP_ALIVE = "30m"
+
+# Sent as the system message of each analysis; fixed text, so it is the
+# cached prefix of every request
+_LOGIC_SYSTEM_PROMPT = """You are an expert Python code reviewer focused on finding logical errors.
+Analyze code for:
+- Edge cases not handled (empty lists, None values, zero division)
+- Off-by-one errors in loops
+- Incorrect conditional logic
+- Potential infinite loops
+- Unintended behavior vs likely intent
+
+Return ONLY genuine logical concerns, not style issues.
+Format each concern as: "Line X: <brief description>"
+If no concerns, return "No logical concerns detected"."""
+
+_OPTIMIZATION_SYSTEM_PROMPT = """You are an expert Python developer focused on code optimization.
+Suggest improvements for:
+- Performance (better algorithms, data structures)
+- Readability (Pythonic patterns, clearer logic)
+- Safety (error handling, bounds checking)
+
+Return suggestions in this exact format:
+TYPE | LINE | SUGGESTION | IMPACT | EXAMPLE
+
+Where:
+- TYPE: performance, readability, or safety
+- LINE: line number or 0 for general
+- SUGGESTION: brief description
+- IMPACT: expected benefit
+- EXAMPLE: short code example (one line)
+
+If no suggestions, return "No optimizations needed"."""
+
+# Completions kept, keyed by a hash of the whole request. Shared by all
+# instances: the refactor agent creates a provider per request.
+_CACHE_SIZE = 256
+
+_cache: "OrderedDict[bytes, str]" = OrderedDict()
+_cache_lock = threading.Lock()
+
+# Requests being generated right now, by the same key; concurrent
+# identical requests wait for the first one. Guarded by _cache_lock.
+_inflight: Dict[bytes, Future] = {}
+
+# is_available() runs on every review; its /api/tags result is reused for
+# this many seconds. Keyed by (base_url, model), (checked_at, available).
+_AVAILABILITY_TTL = 30.0
+
+_availability: Dict[Tuple[str, str], Tuple[float, bool]] = {}
+
+
+def _prepare_code(code: str) -> str:
+    """
+    ``code`` unchanged if it has at most _MAX_CODE_LINES lines, otherwise
+    its head, tail and longest functions in between, with each gap
+    replaced by a marker naming the elided line range (so reported line
+    numbers can still refer to the original).
+    """
+    lines = code.splitlines()
+    total = len(lines)
+    if total <= _MAX_CODE_LINES:
+        return code
+
+    # 1-based line ranges strictly between head and tail
+    first, last = _EDGE_LINES + 1, total - _EDGE_LINES
+    budget = _MAX_CODE_LINES - 2 * _EDGE_LINES
+    blocks = []
+    try:
+        tree = ast.parse(code)
+    except (SyntaxError, ValueError):
+        tree = None
+    if tree is not None:
+        for node in ast.walk(tree):
+            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                start = node.lineno
+                if node.decorator_list:
+                    start = node.decorator_list[0].lineno
+                start, end = max(start, first), min(node.end_lineno, last)
+                if start <= end:
+                    blocks.append((start, end))
+
+    kept = []
+    for start, end in sorted(blocks, key=lambda b: b[0] - b[1]):
+        size = end - start + 1
+        if size <= budget and all(end < s or start > e for s, e in kept):
+            kept.append((start, end))
+            budget -= size
+
+    out = lines[:_EDGE_LINES]
+    position = first
+    for start, end in sorted(kept) + [(last + 1, None)]:
+        if start > position:
+            out.append(f"# ... (lines {position}-{start - 1} elided) ...")
+        if end is not None:
+            out.extend(lines[start - 1:end])
+            position = end + 1
+    out.extend(lines[last:])
+    return "\n".join(out)
+
+
+def _parse_concerns(response: str) -> List[str]:
+    """The first _MAX_RESULTS concern lines of an analyze_logic reply."""
+    concerns = []
+    for line in response.strip().split('\n'):
+        line = line.strip()
+        if line and not line.startswith('#') and len(line) > 10:
+            # Clean up formatting
+            line = line.lstrip('-•*123456789. ')
+            if line:
+                concerns.append(line)
+                if len(concerns) == _MAX_RESULTS:
+                    break
+    return concerns
+
+
+def _parse_suggestions(response: str) -> List[Dict]:
+    """The first _MAX_RESULTS ``TYPE | LINE | ...`` rows of a suggestion reply."""
+    suggestions = []
+    for line in response.strip().split('\n'):
+        line = line.strip()
+        if '|' in line and not line.startswith('#'):
+            parts = [p.strip() for p in line.split('|')]
+            if len(parts) >= 4:
+                try:
+                    suggestions.append({
+                        "type": parts[0].lower(),
+                        "line": int(parts[1]) if parts[1].isdigit() else 0,
+                        "suggestion": parts[2],
+                        "impact": parts[3],
+                        "example": parts[4] if len(parts) > 4 else ""
+                    })
+                except (ValueError, IndexError):
+                    continue
+                if len(suggestions) == _MAX_RESULTS:
+                    break
+    return suggestions
+
+
+def _dumps(obj: Any) -> bytes:
+    if ORJSON_AVAILABLE:
+        try:
+            return orjson.dumps(obj)
+        except orjson.JSONEncodeError:
+            pass  # e.g. lone surrogates, which json escapes
+    return json.dumps(obj).encode("utf-8")
+
+
+def _loads(data: bytes) -> Any:
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _request_key(base_url: str, body: bytes) -> bytes:
+    # The body is serialized from a payload built in a fixed key order
+    return hashlib.blake2b(base_url.encode("utf-8", "surrogatepass") + b"\0" + body, digest_size=16).digest()
+
 
 class OllamaProvider(LLMProvider):
     """LLM provider using Ollama for local inference."""
@@ -23,29 +218,88 @@ class OllamaProvider(LLMProvider):
         self.base_url = base_url.rstrip('/')
         self.model = model
         self.timeout = 30  # seconds
+        
+        # One keep-alive connection pool for every call to Ollama, instead
+        # of a new TCP connection per request; sized for the orchestrator's
+        # concurrent stages
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=8)
+        self._session.mount('http://', adapter)
+        self._session.mount('https://', adapter)
+    
+    def close(self) -> None:
+        """Close pooled connections to Ollama."""
+        self._session.close()
     
     def is_available(self) -> bool:
         """Check if Ollama is running and model is available."""
+        key = (self.base_url, self.model)
+        checked = _availability.get(key)
+        if checked is not None and time.monotonic() - checked[0] < _AVAILABILITY_TTL:
+            return checked[1]
+        available = self._check_available()
+        _availability[key] = (time.monotonic(), available)
+        return available
+    
+    def _forget_availability(self) -> None:
+        """Re-probe on the next is_available() call (after a failed request)."""
+        _availability.pop((self.base_url, self.model), None)
+    
+    def _check_available(self) -> bool:
         try:
-            response = requests.get(f"{self.base_url}/api/tags", timeout=5)
+            response = self._session.get(f"{self.base_url}/api/tags", timeout=5)
             if response.status_code == 200:
-                models = response.json().get("models", [])
+                models = _loads(response.content).get("models", [])
                 return any(m.get("name") == self.model for m in models)
             return False
         except Exception:
             return False
     
+    def warm_up(self) -> None:
+        """Load the model into memory (a generate request without a prompt)."""
+        try:
+            self._session.post(
+                f"{self.base_url}/api/generate",
+                data=_dumps({"model": self.model, "keep_alive": _KEEP_ALIVE}),
+                headers=_JSON_HEADERS,
+                timeout=self.timeout
+            )
+        except Exception as e:
+            print(f"Ollama warm-up failed: {e}")
+    
     def generate(self, prompt: str) -> str:
         """Public generate method used by RefactorAgent."""
         return self._generate(prompt)
 
-    def _generate(self, prompt: str, system: Optional[str] = None) -> str:
+    def generate_json(self, prompt: str) -> str:
+        """generate() with Ollama's JSON mode, which only emits valid JSON."""
+        return self._generate(prompt, json_mode=True, max_tokens=_JSON_MAX_TOKENS)
+
+    def prepare_code(self, code: str) -> str:
+        """Files over _MAX_CODE_LINES lines are cut down (see _prepare_code)."""
+        return _prepare_code(code)
+    
+    def _generate(
+        self,
+        prompt: str,
+        system: Optional[str] = None,
+        json_mode: bool = False,
+        enough: Optional[Callable[[str], bool]] = None,
+        max_tokens: Optional[int] = None
+    ) -> str:
         """
         Generate response from Ollama.
         
+        The response is streamed. If ``enough`` is given, it is called with
+        the complete lines received so far whenever a line ends, and
+        generation is cut off as soon as it returns True.
+        
         Args:
             prompt: User prompt
             system: Optional system message
+            json_mode: Constrain the output to a JSON value
+            enough: Optional early-stop test on the text so far
+            max_tokens: Optional limit on generated tokens (num_predict)
             
         Returns:
             Generated text response
@@ -53,7 +307,8 @@ class OllamaProvider(LLMProvider):
         payload = {
             "model": self.model,
             "prompt": prompt,
-            "stream": False,
+            "stream": True,
+            "keep_alive": _KEEP_ALIVE,
             "options": {
                 "temperature": 0.3,  # Lower temperature for more focused responses
                 "top_p": 0.9,
@@ -62,22 +317,82 @@ class OllamaProvider(LLMProvider):
         
         if system:
             payload["system"] = system
+        if json_mode:
+            payload["format"] = "json"
+        if max_tokens is not None:
+            payload["options"]["num_predict"] = max_tokens
         
-        try:
-            response = requests.post(
-                f"{self.base_url}/api/generate",
-                json=payload,
-                timeout=self.timeout
-            )
-            
-            if response.status_code == 200:
-                return response.json().get("response", "")
-            else:
+        # Resubmitting unchanged code (IDE autosave, retries) reuses the
+        # earlier completion instead of another multi-second generation
+        body = _dumps(payload)
+        key = _request_key(self.base_url, body)
+        with _cache_lock:
+            cached = _cache.get(key)
+            if cached is not None:
+                _cache.move_to_end(key)
+                return cached
+            pending = _inflight.get(key)
+            running = pending is not None
+            if not running:
+                pending = _inflight[key] = Future()
+        
+        if running:
+            # The same request is already being generated (e.g. autosave
+            # and a manual save of one buffer); share its completion, but
+            # do not wait longer than a request of our own would
+            try:
+                return pending.result(timeout=self.timeout)
+            except FutureTimeoutError:
+                print("Ollama generation error: timed out waiting for an identical request")
                 return ""
         
+        text = ""
+        try:
+            text = self._stream_text(body, enough)
         except Exception as e:
             print(f"Ollama generation error: {e}")
-            return ""
+            self._forget_availability()
+        finally:
+            with _cache_lock:
+                # Failures and empty completions are not cached
+                if text:
+                    _cache[key] = text
+                    _cache.move_to_end(key)
+                    if len(_cache) > _CACHE_SIZE:
+                        _cache.popitem(last=False)
+                del _inflight[key]
+            pending.set_result(text)
+        return text
+    
+    def _stream_text(self, body: bytes, enough: Optional[Callable[[str], bool]]) -> str:
+        """Collect a streamed generation ("" on a non-200 reply)."""
+        parts: List[str] = []
+        with self._session.post(
+            f"{self.base_url}/api/generate",
+            data=body,
+            headers=_JSON_HEADERS,
+            timeout=self.timeout,
+            stream=True
+        ) as response:
+            if response.status_code != 200:
+                self._forget_availability()
+                return ""
+            # One JSON object per line, the last one with "done": true.
+            # Leaving the block early closes the connection, which makes
+            # Ollama stop generating.
+            for line in response.iter_lines():
+                if not line:
+                    continue
+                chunk = _loads(line)
+                piece = chunk.get("response", "")
+                parts.append(piece)
+                if chunk.get("done"):
+                    break
+                if enough is not None and "\n" in piece:
+                    text = "".join(parts)
+                    if enough(text[:text.rindex("\n")]):
+                        break
+        return "".join(parts)
     
     def analyze_logic(self, code: str) -> List[str]:
         """
@@ -89,42 +404,26 @@ class OllamaProvider(LLMProvider):
         Returns:
             List of logical concerns
         """
-        system_prompt = """You are an expert Python code reviewer focused on finding logical errors.
-Analyze code for:
-- Edge cases not handled (empty lists, None values, zero division)
-- Off-by-one errors in loops
-- Incorrect conditional logic
-- Potential infinite loops
-- Unintended behavior vs likely intent
-
-Return ONLY genuine logical concerns, not style issues.
-Format each concern as: "Line X: <brief description>"
-If no concerns, return "No logical concerns detected"."""
-
+        # The code goes last: Ollama reuses its KV cache for a prompt prefix
+        # it has already processed, so only the code is re-evaluated
         user_prompt = f"""Analyze this Python code for logical errors:
 
 ```python
-{code}
+{self.prepare_code(code)}
 ```
 
 List any logical concerns:"""
 
-        response = self._generate(user_prompt, system=system_prompt)
+        response = self._generate(
+            user_prompt, system=_LOGIC_SYSTEM_PROMPT,
+            enough=lambda text: len(_parse_concerns(text)) >= _MAX_RESULTS,
+            max_tokens=_LOGIC_MAX_TOKENS
+        )
         
         if not response or "no logical concerns" in response.lower():
             return []
         
-        # Parse response into list of concerns
-        concerns = []
-        for line in response.strip().split('\n'):
-            line = line.strip()
-            if line and not line.startswith('#') and len(line) > 10:
-                # Clean up formatting
-                line = line.lstrip('-•*123456789. ')
-                if line:
-                    concerns.append(line)
-        
-        return concerns[:5]  # Limit to top 5 concerns
+        return _parse_concerns(response)
     
     def suggest_optimizations(self, code: str) -> List[Dict]:
         """
@@ -136,53 +435,21 @@ List any logical concerns:"""
         Returns:
             List of optimization suggestions
         """
-        system_prompt = """You are an expert Python developer focused on code optimization.
-Suggest improvements for:
-- Performance (better algorithms, data structures)
-- Readability (Pythonic patterns, clearer logic)
-- Safety (error handling, bounds checking)
-
-Return suggestions in this exact format:
-TYPE | LINE | SUGGESTION | IMPACT | EXAMPLE
-
-Where:
-- TYPE: performance, readability, or safety
-- LINE: line number or 0 for general
-- SUGGESTION: brief description
-- IMPACT: expected benefit
-- EXAMPLE: short code example (one line)
-
-If no suggestions, return "No optimizations needed"."""
-
         user_prompt = f"""Suggest optimizations for this Python code:
 
 ```python
-{code}
+{self.prepare_code(code)}
 ```
 
 Provide optimization suggestions:"""
 
-        response = self._generate(user_prompt, system=system_prompt)
+        response = self._generate(
+            user_prompt, system=_OPTIMIZATION_SYSTEM_PROMPT,
+            enough=lambda text: len(_parse_suggestions(text)) >= _MAX_RESULTS,
+            max_tokens=_OPTIMIZATION_MAX_TOKENS
+        )
         
         if not response or "no optimizations" in response.lower():
             return []
         
-        # Parse response into structured suggestions
-        suggestions = []
-        for line in response.strip().split('\n'):
-            line = line.strip()
-            if '|' in line and not line.startswith('#'):
-                parts = [p.strip() for p in line.split('|')]
-                if len(parts) >= 4:
-                    try:
-                        suggestions.append({
-                            "type": parts[0].lower(),
-                            "line": int(parts[1]) if parts[1].isdigit() else 0,
-                            "suggestion": parts[2],
-                            "impact": parts[3],
-                            "example": parts[4] if len(parts) > 4 else ""
-                        })
-                    except (ValueError, IndexError):
-                        continue
-        
-        return suggestions[:5]  # Limit to top 5 suggestions
+        return _parse_suggestions(response)
@@ -13,7 +13,9 @@ Endpoints:
 """
 
 from fastapi import FastAPI, HTTPException
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, ORJSONResponse, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from pydantic import BaseModel, Field
 from typing import List, Dict, Optional, Any
@@ -23,10 +25,17 @@ from model import ErrorDetectionModel
 from agent_orchestrator import CodeReviewAgent
 from chat_handler import ChatHandler, ChatContext, ChatMessage
 from analyzers.smell_detector import SmellDetector
+import asyncio
 import uvicorn
 import os
 import datetime
 
+try:
+    import orjson  # noqa: F401 - required by ORJSONResponse
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 def log_action(action: str):
     """Write semantic logs to action.log for the UI Activity Feed."""
     try:
@@ -50,31 +59,46 @@ async def lifespan(app: FastAPI):
     global model, agent, chat_handler, smell_detector
     
     # Startup
-    print("Starting up... Loading model...")
-    model = ErrorDetectionModel()
-    print("Model loaded successfully!")
-
-    print("Initializing code review agent...")
-    agent = CodeReviewAgent(runtime_model=model)
-    print("Agent initialized and ready!")
-
-    print("Initializing chat handler...")
-    chat_handler = ChatHandler()
-    print("Chat handler ready!")
-
-    print("Initializing smell detector...")
-    smell_detector = SmellDetector()
-    print("Smell detector ready!")
+    # Loading the model dominates startup and only the agent depends on
+    # it, so the other components are set up alongside it
+    async def load_model_and_agent():
+        print("Loading model...")
+        loaded_model = await run_in_threadpool(ErrorDetectionModel)
+        print("Model loaded successfully!")
+
+        print("Initializing code review agent...")
+        loaded_agent = await run_in_threadpool(CodeReviewAgent, runtime_model=loaded_model)
+        print("Agent initialized and ready!")
+        return loaded_model, loaded_agent
 
     # Initialise sprint store (creates file if missing)
     from agile_risk.sprint_store import SprintStore
-    SprintStore()
-    print("Sprint store ready!")
+
+    print("Starting up... Initializing chat handler, smell detector and sprint store...")
+    (model, agent), chat_handler, smell_detector, _ = await asyncio.gather(
+        load_model_and_agent(),
+        run_in_threadpool(ChatHandler),
+        run_in_threadpool(SmellDetector),
+        run_in_threadpool(SprintStore),
+    )
+    print("Chat handler, smell detector and sprint store ready!")
+
+    # Load the LLM in the background, so the first review does not wait
+    # for it and startup does not wait for (or depend on) the LLM server
+    warm_up = None
+    if agent.llm_provider is not None:
+        warm_up = asyncio.create_task(run_in_threadpool(agent.llm_provider.warm_up))
     
     yield
     
     # Shutdown (cleanup if needed)
     print("Shutting down...")
+    if warm_up is not None:
+        warm_up.cancel()
+    agent.close()
+    if callable(getattr(agent.llm_provider, "close", None)):
+        agent.llm_provider.close()
+    chat_handler.close()
 
 
 # Request/Response models
@@ -127,7 +151,9 @@ app = FastAPI(
     title="Python Error Detection API",
     description="AI-based error detection for Python code using CodeBERT",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    # orjson serializes the nested review payloads in a single C pass
+    default_response_class=ORJSONResponse if ORJSON_AVAILABLE else JSONResponse
 )
 
 # Add CORS middleware to allow requests from VS Code extension
@@ -209,8 +235,11 @@ async def review_code(request: ReviewRequest):
         raise HTTPException(status_code=400, detail="Code cannot be empty")
     
     try:
-        # Run comprehensive review
-        result = agent.review_code(
+        # Run comprehensive review. It blocks on model inference and LLM
+        # round-trips for seconds, so it runs in the worker threadpool
+        # instead of stalling the event loop for every other request.
+        result = await run_in_threadpool(
+            agent.review_code,
             code=request.code,
             language=request.language,
             include_logic_analysis=request.include_logic_analysis,
@@ -239,6 +268,21 @@ async def review_code(request: ReviewRequest):
         )
 
 
+def _chat_context(request: ChatRequest) -> ChatContext:
+    """Build the chat context (code, analysis, history) for a chat request."""
+    # Convert chat history to ChatMessage objects
+    history = [
+        ChatMessage(role=msg.get("role", "user"), content=msg.get("content", ""))
+        for msg in request.chat_history
+    ]
+    
+    return ChatContext(
+        code=request.code,
+        analysis_results=request.analysis_results,
+        chat_history=history
+    )
+
+
 @app.post("/chat", response_model=ChatResponse)
 async def chat(request: ChatRequest):
     """
@@ -260,21 +304,10 @@ async def chat(request: ChatRequest):
         raise HTTPException(status_code=400, detail="Message cannot be empty")
     
     try:
-        # Convert chat history to ChatMessage objects
-        history = [
-            ChatMessage(role=msg.get("role", "user"), content=msg.get("content", ""))
-            for msg in request.chat_history
-        ]
-        
-        # Create context
-        context = ChatContext(
-            code=request.code,
-            analysis_results=request.analysis_results,
-            chat_history=history
-        )
+        context = _chat_context(request)
         
-        # Generate response
-        response_text = chat_handler.chat(request.message, context)
+        # Generate response (a blocking LLM call, see /review)
+        response_text = await run_in_threadpool(chat_handler.chat, request.message, context)
         
         return ChatResponse(response=response_text)
     
@@ -285,6 +318,27 @@ async def chat(request: ChatRequest):
         )
 
 
+@app.post("/chat/stream")
+async def chat_stream(request: ChatRequest):
+    """
+    Interactive chat about code analysis, streamed as plain text.
+    
+    Same request as /chat; the answer is sent in pieces as the model
+    generates it, so the first words arrive without waiting for the rest.
+    """
+    if chat_handler is None:
+        raise HTTPException(status_code=503, detail="Chat handler not loaded yet")
+    
+    if not request.message or not request.message.strip():
+        raise HTTPException(status_code=400, detail="Message cannot be empty")
+    
+    context = _chat_context(request)
+    return StreamingResponse(
+        chat_handler.chat_stream(request.message, context),
+        media_type="text/plain"
+    )
+
+
 # ─────────────────────────────────────────────────────────────────────────────
 # SMELL ENDPOINTS
 # ─────────────────────────────────────────────────────────────────────────────
@@ -366,7 +420,8 @@ async def refactor_code(request: RefactorRequest):
     try:
         from refactor_agent.refactor_agent import RefactorAgent
         ra_agent = RefactorAgent()
-        result = ra_agent.refactor(
+        result = await run_in_threadpool(
+            ra_agent.refactor,
             code=request.code,
             smell=request.smell,
             confidence=request.confidence
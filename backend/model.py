@@ -3,7 +3,11 @@ Model wrapper for error detection.
 (PyTorch / CodeBERT replaced with a heuristic stub to prevent macOS ARM segfaults)
 """
 
-from typing import Tuple
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import List, Optional, Tuple
 
 
 class ErrorDetectionModel:
@@ -50,3 +54,99 @@ class ErrorDetectionModel:
         # Default fallback
         return "Unknown", 0.40
 
+    def predict_batch(self, codes: List[str]) -> List[Tuple[str, float]]:
+        """
+        Predict error types for several snippets in one call.
+
+        Args:
+            codes: Python source snippets
+
+        Returns:
+            One (error_type, confidence) tuple per snippet, in input order
+        """
+        return [self.predict(code) for code in codes]
+
+
+class RuntimeModelBatcher:
+    """
+    Micro-batching front end for an error detection model.
+
+    Concurrent callers submit single snippets; a background worker groups
+    up to ``max_batch_size`` pending snippets, waiting at most
+    ``max_latency_ms`` after the first one arrives, and runs them through
+    one ``predict_batch`` call. Models without ``predict_batch`` are called
+    per snippet. close() stops the worker once queued snippets are done.
+    """
+
+    def __init__(self, model, max_batch_size: int = 8, max_latency_ms: float = 20):
+        self.model = model
+        self.max_batch_size = max_batch_size
+        self.max_latency = max_latency_ms / 1000
+        # None is the stop sentinel put by close()
+        self._queue: "queue.Queue[Optional[Tuple[str, Future]]]" = queue.Queue()
+        self._closed = False
+        self._close_lock = threading.Lock()
+        self._worker = threading.Thread(
+            target=self._run, name="runtime-model-batcher", daemon=True
+        )
+        self._worker.start()
+
+    def submit(self, code: str) -> Future:
+        """Queue a snippet; the future resolves to (error_type, confidence)."""
+        future: Future = Future()
+        with self._close_lock:
+            if self._closed:
+                future.set_exception(RuntimeError("RuntimeModelBatcher is closed"))
+            else:
+                self._queue.put((code, future))
+        return future
+
+    def close(self) -> None:
+        """Stop the worker after the snippets already submitted."""
+        with self._close_lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(None)
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            batch = [item]
+            stop = False
+            deadline = time.monotonic() + self.max_latency
+            while len(batch) < self.max_batch_size:
+                try:
+                    item = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+                if item is None:
+                    stop = True
+                    break
+                batch.append(item)
+            self._predict(batch)
+            if stop:
+                return
+
+    def _predict(self, batch: List[Tuple[str, Future]]) -> None:
+        codes = [code for code, _ in batch]
+        try:
+            # Looked up on the type so mocks don't grow a fake predict_batch
+            if callable(getattr(type(self.model), "predict_batch", None)):
+                results = self.model.predict_batch(codes)
+            else:
+                results = [self.model.predict(code) for code in codes]
+        except Exception as e:
+            for _, future in batch:
+                future.set_exception(e)
+            return
+        for (_, future), result in zip(batch, results):
+            future.set_result(result)
+        # A short result list must not leave callers waiting for a timeout
+        for _, future in batch[len(results):]:
+            future.set_exception(
+                RuntimeError(f"Model returned {len(results)} results for {len(batch)} snippets")
+            )
+
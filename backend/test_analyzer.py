@@ -12,12 +12,15 @@ analyzer = UniversalASTAnalyzer('javascript')
 print("Testing JavaScript infinite loop detection:")
 print("=" * 60)
 
-loops = analyzer.find_infinite_loops(js_code)
+result = analyzer.analyze_all(js_code)
+print(f"Syntax: {result['syntax']['status']}")
+
+loops = result['infinite_loops']
 print(f"\nInfinite loops found: {len(loops)}")
 for loop in loops:
     print(f"  - {loop}")
 
-unreachable = analyzer.find_unreachable_code(js_code)
+unreachable = result['unreachable_code']
 print(f"\nUnreachable code found: {len(unreachable)}")
 for code in unreachable:
     print(f"  - {code}")
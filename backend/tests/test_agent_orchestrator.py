@@ -0,0 +1,83 @@
+"""
+Unit tests for the Code Review Agent.
+Tests reuse of LLM results across reviews of unchanged code.
+"""
+
+import json
+from unittest.mock import MagicMock
+
+import pytest
+
+from agent_orchestrator import CodeReviewAgent
+from model import ErrorDetectionModel
+
+CODE = "def f(items):\n    return items[0]\n"
+
+COMBINED_REPLY = json.dumps({
+    "logical_concerns": ["Line 2: items may be empty"],
+    "optimizations": [{"type": "safety", "line": 2, "suggestion": "Check for an empty list",
+                       "impact": "No IndexError", "example": "if not items: return None"}],
+})
+
+
+def make_agent(available=True):
+    llm = MagicMock()
+    llm.is_available.return_value = available
+    llm.generate_json.return_value = COMBINED_REPLY
+    llm.prepare_code.side_effect = lambda code: code
+    llm.suggest_optimizations.return_value = [
+        {"type": "performance", "line": 1, "suggestion": "Use a set", "impact": "O(1)", "example": ""}
+    ]
+    return CodeReviewAgent(runtime_model=ErrorDetectionModel(), llm_provider=llm), llm
+
+
+def test_combined_review_reuses_llm_results():
+    agent, llm = make_agent()
+    first = agent._combined_llm_review(CODE)
+    assert first == (["Line 2: items may be empty"], [json.loads(COMBINED_REPLY)["optimizations"][0]])
+    first[0].append("mutated by caller")
+    first[1][0]["line"] = 99
+
+    assert agent._combined_llm_review(CODE)[0] == ["Line 2: items may be empty"]
+    assert agent._combined_llm_review(CODE)[1][0]["line"] == 2
+    assert llm.generate_json.call_count == 1
+
+
+def test_combined_review_fallback_is_not_cached():
+    agent, llm = make_agent(available=False)
+    assert agent._combined_llm_review(CODE) == (["⚠️ LLM not available - logical analysis skipped"], [])
+
+    # The LLM comes back: the same code is reviewed for real
+    llm.is_available.return_value = True
+    concerns, _ = agent._combined_llm_review(CODE)
+    assert concerns == ["Line 2: items may be empty"]
+    assert llm.generate_json.call_count == 1
+
+
+def test_heuristic_only_optimizations_are_not_cached():
+    agent, llm = make_agent(available=False)
+    assert all(s["suggestion"] != "Use a set" for s in agent._suggest_optimizations(CODE))
+
+    llm.is_available.return_value = True
+    assert any(s["suggestion"] == "Use a set" for s in agent._suggest_optimizations(CODE))
+    assert any(s["suggestion"] == "Use a set" for s in agent._suggest_optimizations(CODE))
+    assert llm.suggest_optimizations.call_count == 1
+
+
+def test_combined_review_prompt_uses_prepared_code():
+    agent, llm = make_agent()
+    llm.prepare_code.side_effect = lambda code: "# shortened\n"
+    agent._combined_llm_review(CODE)
+    prompt = llm.generate_json.call_args.args[0]
+    assert "# shortened" in prompt
+    assert "items[0]" not in prompt
+
+
+def test_close_releases_worker_threads():
+    agent, _ = make_agent()
+    agent._combined_llm_review(CODE)
+    agent.close()
+    agent._runtime_batcher._worker.join(timeout=5)
+    assert not agent._runtime_batcher._worker.is_alive()
+    with pytest.raises(RuntimeError):
+        agent._executor.submit(print)
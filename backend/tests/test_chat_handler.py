@@ -0,0 +1,90 @@
+"""
+Unit tests for Chat Handler.
+Tests streamed Ollama replies (fake NDJSON responses) for chat() and
+chat_stream(), and the /chat/stream endpoint.
+"""
+
+import json
+
+import pytest
+import requests
+from fastapi.testclient import TestClient
+
+import main
+from chat_handler import ChatContext, ChatHandler
+
+
+class FakeStreamResponse:
+    """Stand-in for a streamed requests.Response carrying Ollama NDJSON."""
+
+    def __init__(self, chunks, status_code=200, error=None):
+        self.status_code = status_code
+        self._lines = [json.dumps(c).encode() for c in chunks]
+        self._error = error
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def iter_lines(self):
+        for line in self._lines:
+            yield line
+            yield b""  # Keep-alive blank lines are skipped
+        if self._error is not None:
+            raise self._error
+
+
+def make_handler(monkeypatch, response):
+    handler = ChatHandler()
+    monkeypatch.setattr(handler._session, "post", lambda *args, **kwargs: response)
+    return handler
+
+
+CONTEXT = ChatContext(code="x = 1\n", analysis_results={})
+
+CHUNKS = [
+    {"response": "Line 1 ", "done": False},
+    {"response": "looks fine.", "done": False},
+    {"response": "", "done": True},
+    {"response": "after done", "done": False},
+]
+
+
+def test_chat_joins_streamed_chunks(monkeypatch):
+    handler = make_handler(monkeypatch, FakeStreamResponse(CHUNKS))
+    assert handler.chat("Any issues?", CONTEXT) == "Line 1 looks fine."
+
+
+def test_chat_stream_yields_pieces_until_done(monkeypatch):
+    handler = make_handler(monkeypatch, FakeStreamResponse(CHUNKS))
+    assert list(handler.chat_stream("Any issues?", CONTEXT)) == ["Line 1 ", "looks fine."]
+
+
+def test_chat_stream_appends_failure_after_partial_output(monkeypatch):
+    response = FakeStreamResponse(CHUNKS[:1], error=requests.exceptions.Timeout())
+    handler = make_handler(monkeypatch, response)
+    pieces = list(handler.chat_stream("Any issues?", CONTEXT))
+    assert pieces == [
+        "Line 1 ",
+        "\n\nThe request timed out. Please try asking a simpler question.",
+    ]
+
+
+def test_chat_reports_unavailable_model(monkeypatch):
+    handler = make_handler(monkeypatch, FakeStreamResponse([], status_code=500))
+    assert handler.chat("Any issues?", CONTEXT) == (
+        "I'm having trouble connecting to the AI model. Please try again."
+    )
+
+
+@pytest.mark.parametrize("message, status", [("Any issues?", 200), ("   ", 400)])
+def test_chat_stream_endpoint(monkeypatch, message, status):
+    monkeypatch.setattr(main, "chat_handler", make_handler(monkeypatch, FakeStreamResponse(CHUNKS)))
+    response = TestClient(main.app).post("/chat/stream", json={
+        "message": message, "code": "x = 1\n", "analysis_results": {},
+    })
+    assert response.status_code == status
+    if status == 200:
+        assert response.text == "Line 1 looks fine."
@@ -4,7 +4,7 @@ Tests detection of infinite loops, unreachable code, and loop variable issues.
 """
 
 import pytest
-from analyzers.control_flow_analyzer import ControlFlowAnalyzer
+from analyzers.control_flow_analyzer import ControlFlowAnalyzer, MermaidGenerator, CFGNode, CFGEdge
 
 
 def test_infinite_while_true_without_break():
@@ -38,6 +38,22 @@ while True:
     assert not result.has_issues
 
 
+def test_break_in_nested_loop_does_not_exit_outer_while():
+    """A break inside an inner for-loop only exits the inner loop"""
+    code = """
+while True:
+    for item in items:
+        if item:
+            break
+"""
+    analyzer = ControlFlowAnalyzer()
+    result = analyzer.analyze(code)
+    
+    assert result.has_issues
+    assert result.issues[0].type == 'infinite_loop'
+    assert 'false (never taken)' in result.mermaid_code
+
+
 def test_while_loop_variable_not_updated():
     """Test detection of loop variable never being modified"""
     code = """
@@ -128,6 +144,19 @@ def foo(
     assert result.mermaid_code == ""
 
 
+def test_find_node_at_line_prefers_statement_spanning_line():
+    """Lines inside a multi-line statement resolve to that statement"""
+    import ast
+    code = "x = foo(\n    1,\n    2)\nwhile True:\n    pass\n"
+    tree = ast.parse(code)
+    analyzer = ControlFlowAnalyzer()
+    
+    assert isinstance(analyzer._find_node_at_line(tree, 2), ast.Assign)
+    assert isinstance(analyzer._find_node_at_line(tree, 4), ast.While)
+    assert isinstance(analyzer._find_node_at_line(tree, 5), ast.Pass)
+    assert analyzer._find_node_at_line(tree, 9) is None
+
+
 def test_mermaid_graph_structure():
     """Test that generated Mermaid graph has correct structure"""
     code = """
@@ -143,6 +172,27 @@ while True:
     assert 'classDef problem' in result.mermaid_code
 
 
+def test_mermaid_exact_output():
+    """Test node shapes, quote escaping, problem class and edge syntax"""
+    nodes = [
+        CFGNode('start', 'entry', 'Start', 0),
+        CFGNode('c1', 'condition', 'x > "0"', 1, is_problematic=True),
+        CFGNode('u1', 'unreachable', 'dead', 2),
+    ]
+    edges = [CFGEdge('start', 'c1'), CFGEdge('c1', 'u1', 'true')]
+    
+    assert MermaidGenerator().generate(nodes, edges) == (
+        'flowchart TD\n'
+        '    start["Start"]\n'
+        '    c1{"x > \'0\'"}:::problem\n'
+        '    u1[["dead"]]\n'
+        '    start ----> c1\n'
+        '    c1 --|true|--> u1\n'
+        '\n'
+        '    classDef problem fill:#ff6b6b,stroke:#c92a2a,stroke-width:3px,color:#fff'
+    )
+
+
 def test_to_dict_serialization():
     """Test that result can be serialized to dictionary"""
     code = """
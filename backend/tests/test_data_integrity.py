@@ -3,7 +3,7 @@ Category 10 — Data Integrity Tests.
 
 Tests SprintStore for:
   - Correct persistence and retrieval using real API
-  - JSON file validity after writes
+  - JSONL file validity after writes
   - SmellDetector and FeatureExtractor handle invalid code safely
 """
 
@@ -18,9 +18,9 @@ class TestDataIntegrity:
 
     @pytest.fixture
     def temp_store(self, tmp_path, monkeypatch):
-        """SprintStore using a temp file instead of the real sprint_data.json."""
-        store_file = tmp_path / "sprint_data.json"
-        store_file.write_text(json.dumps({"sprints": []}, indent=2))
+        """SprintStore using a temp file instead of the real sprint_data.jsonl."""
+        store_file = tmp_path / "sprint_data.jsonl"
+        store_file.write_text("")
 
         import agile_risk.sprint_store as ss_module
         monkeypatch.setattr(ss_module, "_DATA_FILE", store_file)
@@ -72,9 +72,9 @@ class TestDataIntegrity:
         import agile_risk.sprint_store as ss_module
         path = ss_module._DATA_FILE
         with open(path) as f:
-            data = json.load(f)
-        assert "sprints" in data
-        assert isinstance(data["sprints"], list)
+            records = [json.loads(line) for line in f if line.strip()]
+        assert len(records) == 1
+        assert records[0]["sprint_id"] == "Sprint-JSON"
 
     def test_empty_store_summary_zero(self, temp_store):
         data = temp_store.get_all()
@@ -89,8 +89,8 @@ class TestDataIntegrity:
         import agile_risk.sprint_store as ss_module
         path = ss_module._DATA_FILE
         with open(path) as f:
-            parsed = json.loads(f.read())
-        assert isinstance(parsed["sprints"], list)
+            parsed = [json.loads(line) for line in f if line.strip()]
+        assert len(parsed) == 10
 
     def test_repeated_sprint_id_handled_gracefully(self, temp_store):
         temp_store.log_sprint("Sprint-DUP", smell_count=3)
@@ -116,7 +116,7 @@ class TestDataIntegrity:
 
     def test_store_load_fallback_on_corrupt_file(self, tmp_path, monkeypatch):
         """If file is corrupted, _load() must return safe default."""
-        store_file = tmp_path / "sprint_data.json"
+        store_file = tmp_path / "sprint_data.jsonl"
         store_file.write_text("{{NOT VALID JSON}}")
 
         import agile_risk.sprint_store as ss_module
@@ -127,3 +127,37 @@ class TestDataIntegrity:
         result = store._load()
         assert isinstance(result, dict)
         assert "sprints" in result
+
+    def test_update_and_delete_rewrite_jsonl(self, temp_store):
+        temp_store.log_sprint("Sprint-A", smell_count=4, refactor_count=1)
+        temp_store.log_sprint("Sprint-B", smell_count=6, refactor_count=0)
+        assert temp_store.update_latest_sprint(smells_delta=2, refactor_delta=3) == "Sprint-B"
+        assert temp_store.delete_sprint("Sprint-A") is True
+        assert temp_store.get_smell_history() == [8]
+        assert temp_store.get_refactor_history() == [3]
+
+    def test_legacy_json_store_is_migrated(self, tmp_path, monkeypatch):
+        """An existing sprint_data.json is converted on first use."""
+        legacy = {"sprints": [{"sprint_id": "Old-1", "smell_count": 7, "refactor_count": 2}]}
+        (tmp_path / "sprint_data.json").write_text(json.dumps(legacy, indent=2))
+
+        import agile_risk.sprint_store as ss_module
+        monkeypatch.setattr(ss_module, "_DATA_FILE", tmp_path / "sprint_data.jsonl")
+
+        from agile_risk.sprint_store import SprintStore
+        store = SprintStore()
+        store.log_sprint("New-1", smell_count=9)
+        assert store.get_smell_history() == [7, 9]
+
+    def test_timestamps_stored_as_ns_and_formatted_on_read(self, temp_store):
+        """Records carry integer ns timestamps; get_all() adds an ISO string."""
+        with patch("agile_risk.sprint_store.time.time_ns", return_value=1772182800123456789):
+            temp_store.log_sprint("Sprint-TS", smell_count=1)
+
+        import agile_risk.sprint_store as ss_module
+        record = json.loads(ss_module._DATA_FILE.read_text().splitlines()[0])
+        assert record["timestamp_ns"] == 1772182800123456789
+        assert "timestamp" not in record
+
+        sprint = temp_store.get_all()["sprints"][0]
+        assert sprint["timestamp"] == "2026-02-27T09:00:00.123456"
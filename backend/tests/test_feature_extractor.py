@@ -175,3 +175,60 @@ def test_num_methods_accuracy(god_class_code, feature_extractor):
     features = feature_extractor.extract(god_class_code)
     cls = features.classes[0]
     assert cls.num_methods == 12
+
+# ── Incremental extraction ────────────────────────────────────────────────
+
+def test_incremental_reuses_unchanged_definitions(feature_extractor):
+    code = "def a(x):\n    return x\n\ndef b(y):\n    return y\n"
+    first = feature_extractor.extract_incremental(code)
+    edited = code + "\ndef c():\n    pass\n"
+    second = feature_extractor.extract_incremental(edited)
+    assert second.standalone_functions[0] is first.standalone_functions[0]
+    assert [f.name for f in second.standalone_functions] == ["a", "b", "c"]
+
+def test_incremental_recomputes_edited_definition(feature_extractor):
+    first = feature_extractor.extract_incremental("def a(x):\n    return x\n")
+    second = feature_extractor.extract_incremental("def a(x):\n    if x:\n        return x\n")
+    assert second.standalone_functions[0] is not first.standalone_functions[0]
+    assert second.standalone_functions[0].complexity == 2
+
+def test_incremental_edit_range_forces_recompute(feature_extractor):
+    code = "def a(x):\n    return x\n"
+    first = feature_extractor.extract_incremental(code)
+    second = feature_extractor.extract_incremental(code, edit_range=(2, 2))
+    assert second.standalone_functions[0] is not first.standalone_functions[0]
+    assert second.standalone_functions[0] == first.standalone_functions[0]
+
+def test_incremental_reuses_unchanged_methods_of_edited_class(feature_extractor):
+    code = "class K:\n    def a(self):\n        return 1\n    def b(self):\n        return 2\n"
+    first = feature_extractor.extract_incremental(code)
+    second = feature_extractor.extract_incremental(code.replace("return 2", "return self.a()"))
+    assert second.classes[0] is not first.classes[0]
+    assert second.classes[0].methods[0] is first.classes[0].methods[0]
+    assert second.classes[0].methods[1].local_calls == 1
+
+# ── Parallel class extraction ─────────────────────────────────────────────
+
+def test_worker_class_extraction_matches_in_process(feature_extractor):
+    from analyzers.feature_extractor import _extract_class_from_source
+    code = (
+        "import os\n\nx = 1\n\n@dataclass\nclass A:\n\n"
+        "    def m(self, p):\n        if p and os.sep:\n            return self.n(p)\n\n"
+        "    def n(self, p):\n        return p\n"
+    )
+    expected = feature_extractor.extract(code).classes[0]
+    source = "\n".join(code.splitlines()[4:])
+    assert _extract_class_from_source(source, 5, {"os"}) == expected
+
+# ── Compiled metric walk ──────────────────────────────────────────────────
+
+def test_compiled_metrics_match_python_walk(feature_extractor):
+    metrics = pytest.importorskip("analyzers._metrics")
+    import ast
+    code = (
+        "import os\n\ndef f(a, b):\n    if a and b or a:\n        for x in os.listdir(a):\n"
+        "            g(x)\n    return [y for y in b if y], os.sep\n"
+    )
+    fn = ast.parse(code).body[1]
+    expected = feature_extractor._walk_function_metrics(fn, {"g"}, {"os"})
+    assert metrics.function_metrics(fn, {"g"}, {"os"}) == expected
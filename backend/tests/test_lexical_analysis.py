@@ -144,3 +144,34 @@ class TestJavaScriptLexicalAnalysis:
         code = "const square = (x) => x * x;"
         result = js_analyzer.check_syntax(code)
         assert result["status"] in ("valid", "unknown")
+
+    def test_js_tree_cache_round_trip(self, tmp_path):
+        pytest.importorskip("esprima")
+        from analyzers.js_tree_cache import get_js_tree
+        code = "while (true) { x++; }\nfunction f() { return 1; g(); }"
+        path = str(tmp_path / "trees.sqlite")
+        first = get_js_tree(code, path)
+        get_js_tree.cache_clear()
+        assert get_js_tree(code, path) == first
+        assert get_js_tree("function broken( {", path) is None
+
+    def test_js_break_must_exit_the_reported_loop(self, js_analyzer):
+        pytest.importorskip("esprima")
+        inner_only = "while (true) { switch (x) { case 1: break; } }"
+        labelled = "outer: while (true) { for (const a of b) { break outer; } }"
+        assert len(js_analyzer.find_infinite_loops(inner_only)) == 1
+        assert js_analyzer.find_infinite_loops(labelled) == []
+
+    def test_tree_sitter_issues_match_esprima(self, js_analyzer, monkeypatch):
+        pytest.importorskip("esprima")
+        pytest.importorskip("tree_sitter_javascript")
+        import analyzers.universal_ast_analyzer as uaa
+        code = (
+            "while ((1)) { l: { break l; } }\nfor (;;) { switch (a) { case 1: break; } }\n"
+            "function f() { return 1; /* c */ g(); }\n"
+            "o = { m() { while (true) { if (x) break; } return; h(); } };\n"
+        )
+        expected = js_analyzer._find_javascript_issues_ts(code)
+        monkeypatch.setattr(uaa, "TREE_SITTER_AVAILABLE", False)
+        assert js_analyzer._find_javascript_issues(code) == expected
+        assert len(expected[0]) == 2 and expected[1]
@@ -0,0 +1,62 @@
+"""
+Unit tests for Logic Analyzer.
+Tests reuse of LLM results and that unavailable/failed analyses are retried.
+"""
+
+from unittest.mock import MagicMock
+
+from analyzers.logic_analyzer import LogicAnalyzer
+
+
+def make_llm():
+    llm = MagicMock()
+    llm.is_available.return_value = True
+    llm.analyze_logic.return_value = ["Line 1: concern"]
+    llm.analyze_logic_batch.side_effect = lambda codes: [[f"Line 1: {c}"] for c in codes]
+    return llm
+
+
+def test_logic_analyzer_reuses_llm_results():
+    """Unchanged code must not be sent to the LLM a second time."""
+    llm = make_llm()
+    analyzer = LogicAnalyzer(llm)
+
+    assert analyzer.analyze("x = 1") == ["Line 1: concern"]
+    assert analyzer.analyze("x = 1") == ["Line 1: concern"]
+    assert llm.analyze_logic.call_count == 1
+
+    results = analyzer.analyze_batch(["x = 1", "y = 2", "y = 2"])
+    assert results == [["Line 1: concern"], ["Line 1: y = 2"], ["Line 1: y = 2"]]
+    llm.analyze_logic_batch.assert_called_once_with(["y = 2"])
+
+
+def test_cached_results_are_copies():
+    analyzer = LogicAnalyzer(make_llm())
+    analyzer.analyze("x = 1").append("mutated by caller")
+    assert analyzer.analyze("x = 1") == ["Line 1: concern"]
+
+
+def test_unavailable_result_is_not_cached():
+    llm = make_llm()
+    llm.is_available.return_value = False
+    analyzer = LogicAnalyzer(llm)
+    assert analyzer.analyze("x = 1") == ["⚠️ LLM not available - logical analysis skipped"]
+    assert analyzer.analyze_batch(["y = 2"]) == [["⚠️ LLM not available - logical analysis skipped"]]
+
+    llm.is_available.return_value = True
+    assert analyzer.analyze("x = 1") == ["Line 1: concern"]
+    assert analyzer.analyze_batch(["y = 2"]) == [["Line 1: y = 2"]]
+
+
+def test_failed_analysis_is_not_cached():
+    llm = make_llm()
+    llm.analyze_logic.side_effect = RuntimeError("timeout")
+    llm.analyze_logic_batch.side_effect = RuntimeError("timeout")
+    analyzer = LogicAnalyzer(llm)
+    assert analyzer.analyze("x = 1") == ["⚠️ Logic analysis failed: timeout"]
+    assert analyzer.analyze_batch(["y = 2"]) == [["⚠️ Logic analysis failed"]]
+
+    llm.analyze_logic.side_effect = None
+    llm.analyze_logic_batch.side_effect = lambda codes: [[f"Line 1: {c}"] for c in codes]
+    assert analyzer.analyze("x = 1") == ["Line 1: concern"]
+    assert analyzer.analyze_batch(["y = 2"]) == [["Line 1: y = 2"]]
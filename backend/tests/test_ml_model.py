@@ -139,3 +139,38 @@ class TestMLModel:
         _, conf1 = error_model.predict(code)
         _, conf2 = error_model.predict(code)
         assert conf1 == conf2, "Model is non-deterministic — possible overfitting instability"
+
+    def test_batcher_matches_single_predictions(self, error_model):
+        """Batched predictions come back per-snippet, in submission order."""
+        from model import RuntimeModelBatcher
+        batcher = RuntimeModelBatcher(error_model, max_batch_size=4, max_latency_ms=20)
+        codes = [code for code, _ in LABELLED_SAMPLES]
+        futures = [batcher.submit(code) for code in codes]
+        results = [f.result(timeout=5) for f in futures]
+        assert results == [error_model.predict(code) for code in codes]
+
+    def test_batcher_fails_snippets_without_a_result(self):
+        """A model returning too few results fails the rest instead of hanging."""
+        from model import RuntimeModelBatcher
+
+        class ShortModel:
+            def predict_batch(self, codes):
+                return [("Unknown", 0.0)] * (len(codes) - 1)
+
+        batcher = RuntimeModelBatcher(ShortModel(), max_batch_size=2, max_latency_ms=200)
+        futures = [batcher.submit("a = 1"), batcher.submit("b = 2")]
+        assert futures[0].result(timeout=5) == ("Unknown", 0.0)
+        with pytest.raises(RuntimeError, match="1 results for 2"):
+            futures[1].result(timeout=5)
+        batcher.close()
+
+    def test_batcher_close_stops_worker(self, error_model):
+        from model import RuntimeModelBatcher
+        batcher = RuntimeModelBatcher(error_model)
+        pending = batcher.submit("x = 1")
+        batcher.close()
+        assert pending.result(timeout=5) == error_model.predict("x = 1")
+        batcher._worker.join(timeout=5)
+        assert not batcher._worker.is_alive()
+        with pytest.raises(RuntimeError, match="closed"):
+            batcher.submit("y = 2").result(timeout=1)
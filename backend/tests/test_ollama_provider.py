@@ -0,0 +1,210 @@
+"""
+Unit tests for the Ollama provider.
+Tests request payloads with the HTTP call (_stream_text) stubbed out.
+"""
+
+import json
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+
+import pytest
+
+from llm_providers import ollama_provider
+from llm_providers.ollama_provider import OllamaProvider, _prepare_code
+
+
+@pytest.fixture
+def provider(monkeypatch):
+    """Provider with empty module-level caches and a recording stub for the HTTP call."""
+    monkeypatch.setattr(ollama_provider, "_cache", OrderedDict())
+    monkeypatch.setattr(ollama_provider, "_inflight", {})
+    monkeypatch.setattr(ollama_provider, "_availability", {})
+    p = OllamaProvider()
+    p.requests = []
+
+    def fake_stream_text(body, enough):
+        p.requests.append(json.loads(body))
+        if isinstance(p.reply, Exception):
+            raise p.reply
+        return p.reply() if callable(p.reply) else p.reply
+
+    p.reply = "Line 1: concern number one"
+    monkeypatch.setattr(p, "_stream_text", fake_stream_text)
+    return p
+
+
+def test_output_token_budgets(provider):
+    provider.analyze_logic("x = 1")
+    provider.suggest_optimizations("x = 1")
+    provider.generate_json("{}")
+    provider.generate("refactor this")
+    budgets = [r["options"].get("num_predict") for r in provider.requests]
+    assert budgets == [256, 384, 768, None]
+    assert provider.requests[2]["format"] == "json"
+
+
+def test_malformed_suggestion_rows_are_skipped(provider):
+    # '²'.isdigit() is True, but int('²') raises
+    provider.reply = (
+        "performance | ² | Use a set | Faster lookups | s = set(xs)\n"
+        "readability | 3 | Use enumerate | Clearer | for i, x in enumerate(xs):\n"
+    )
+    suggestions = provider.suggest_optimizations("x = 1")
+    assert [s["line"] for s in suggestions] == [3]
+
+
+def make_file(function_sizes, edge=60):
+    """``edge`` assignments, one function per body size, ``edge`` more assignments."""
+    lines = [f"a{i} = {i}" for i in range(edge)]
+    for n, size in enumerate(function_sizes):
+        lines.append(f"def f{n}():")
+        lines += [f"    y{k} = {k}" for k in range(size - 2)]
+        lines.append("    return 0")
+    lines += [f"b{i} = {i}" for i in range(edge)]
+    return "\n".join(lines)
+
+
+@pytest.mark.parametrize("num_lines", [1, 150, 200])
+def test_prepare_code_passes_short_files_through(num_lines):
+    code = "\n".join(f"x{i} = {i}" for i in range(num_lines))
+    assert _prepare_code(code) == code
+
+
+def test_prepare_code_keeps_head_and_tail():
+    code = make_file([30, 30, 30, 30])
+    lines = code.splitlines()
+    out = _prepare_code(code).splitlines()
+    assert len(out) <= 200 + 5  # Plus the elision markers
+    assert out[:50] == lines[:50]
+    assert out[-50:] == lines[-50:]
+
+
+def test_prepare_code_prefers_longest_functions():
+    # f0..f3 span lines 61-72, 73-112, 113-132 and 133-182; f3 and f1
+    # (90 lines) fill the 100 middle lines, f0 (12) no longer fits
+    code = make_file([12, 40, 20, 50])
+    out = _prepare_code(code)
+    assert "def f1():" in out and "def f3():" in out
+    assert "def f0():" not in out and "def f2():" not in out
+    markers = [line for line in out.splitlines() if "elided" in line]
+    assert markers == [
+        "# ... (lines 51-72 elided) ...",
+        "# ... (lines 113-132 elided) ...",
+        "# ... (lines 183-192 elided) ...",
+    ]
+
+
+def test_prepare_code_unparsable_keeps_head_and_tail():
+    code = "def broken(:\n" + "\n".join(f"x{i} = {i}" for i in range(300))
+    out = _prepare_code(code).splitlines()
+    assert len(out) == 101
+    assert out[50] == "# ... (lines 51-251 elided) ..."
+
+
+def test_analysis_prompts_use_prepared_code(provider):
+    code = make_file([12, 40, 20, 50])
+    provider.analyze_logic(code)
+    provider.suggest_optimizations(code)
+    for request in provider.requests:
+        assert "# ... (lines 51-72 elided) ..." in request["prompt"]
+
+
+def test_concurrent_identical_requests_share_one_generation(provider, monkeypatch):
+    waiting = threading.Semaphore(0)
+
+    class WatchedFuture(Future):
+        def result(self, timeout=None):
+            waiting.release()
+            return super().result(timeout)
+
+    monkeypatch.setattr(ollama_provider, "Future", WatchedFuture)
+    release = threading.Event()
+
+    def slow_reply():
+        # Finish only once the three other callers wait on this request
+        for _ in range(3):
+            assert waiting.acquire(timeout=5)
+        release.set()
+        return "Line 1: shared"
+
+    provider.reply = slow_reply
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(provider.generate("same")))
+               for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(timeout=5)
+
+    assert release.is_set()
+    assert results == ["Line 1: shared"] * 4
+    assert len(provider.requests) == 1
+    assert ollama_provider._inflight == {}
+
+
+
+def test_waiting_for_a_stalled_identical_request_times_out(provider):
+    started, release = threading.Event(), threading.Event()
+
+    def stalled_reply():
+        started.set()
+        release.wait(timeout=5)
+        return "Line 1: late"
+
+    provider.reply = stalled_reply
+    provider.timeout = 0.1
+    first = threading.Thread(target=provider.generate, args=("same",))
+    first.start()
+    assert started.wait(timeout=5)
+    try:
+        assert provider.generate("same") == ""
+    finally:
+        release.set()
+        first.join(timeout=5)
+    assert len(provider.requests) == 1
+
+@pytest.mark.parametrize("reply", [RuntimeError("connection reset"), ""])
+def test_failed_and_empty_generations_are_not_cached(provider, reply):
+    provider.reply = reply
+    assert provider.generate("x") == ""
+    assert ollama_provider._inflight == {}
+    assert len(ollama_provider._cache) == 0
+
+    provider.reply = "Line 1: ok"
+    assert provider.generate("x") == "Line 1: ok"
+    assert provider.generate("x") == "Line 1: ok"
+    assert len(provider.requests) == 2
+
+
+def test_availability_is_reused_within_ttl(provider, monkeypatch):
+    clock = [1000.0]
+    checks = []
+    monkeypatch.setattr(ollama_provider.time, "monotonic", lambda: clock[0])
+    monkeypatch.setattr(provider, "_check_available", lambda: checks.append(1) or True)
+
+    assert provider.is_available() and provider.is_available()
+    assert len(checks) == 1
+
+    clock[0] += 29
+    assert provider.is_available()
+    assert len(checks) == 1
+
+    clock[0] += 2  # Past the 30 s window
+    assert provider.is_available()
+    assert len(checks) == 2
+
+    provider._forget_availability()
+    assert provider.is_available()
+    assert len(checks) == 3
+
+
+def test_failed_generation_forgets_availability(provider, monkeypatch):
+    checks = []
+    monkeypatch.setattr(provider, "_check_available", lambda: checks.append(1) or True)
+    assert provider.is_available()
+
+    provider.reply = RuntimeError("connection refused")
+    provider.generate("x")
+    assert provider.is_available()
+    assert len(checks) == 2
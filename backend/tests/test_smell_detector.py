@@ -123,6 +123,15 @@ def test_results_sorted_by_confidence_desc(smell_detector, long_method_code):
         confidences = [s.confidence for s in smells]
         assert confidences == sorted(confidences, reverse=True)
 
+def test_top_k_is_prefix_of_full_result(smell_detector, long_method_code):
+    smells = smell_detector.detect_to_dict(long_method_code)
+    for k in (0, 1, len(smells) + 1):
+        assert smell_detector.detect_to_dict(long_method_code, top_k=k) == smells[:k]
+
+def test_iter_detect_matches_detect_to_dict(smell_detector, long_method_code):
+    assert list(smell_detector.iter_detect(long_method_code, top_k=2)) == \
+        smell_detector.detect_to_dict(long_method_code, top_k=2)
+
 def test_confidence_in_range(smell_detector, long_method_code):
     smells = smell_detector.detect(long_method_code)
     for s in smells:
@@ -154,3 +163,10 @@ def test_invalid_code_raises_error(smell_detector):
 def test_empty_code_returns_empty(smell_detector):
     smells = smell_detector.detect("")
     assert smells == []
+
+def test_disk_feature_cache_round_trip(tmp_path, long_method_code):
+    from analyzers.smell_detector import SmellDetector
+    first = SmellDetector(feature_cache_dir=str(tmp_path)).detect_to_dict(long_method_code)
+    assert len(list(tmp_path.rglob("*.pkl"))) == 1
+    second = SmellDetector(feature_cache_dir=str(tmp_path)).detect_to_dict(long_method_code)
+    assert second == first
@@ -150,3 +150,18 @@ def test_above_threshold_trend_when_current_exceeds(sprint_risk_model):
     # predicted_smell_count ~5, which is > threshold=3
     assert result["trend"] in ("above_threshold", "stable", "increasing")
     assert result["risk_probability"] > 0.5
+
+# ── Batch Scoring ─────────────────────────────────────────────────────────
+
+def test_predict_batch_matches_single_predictions(sprint_risk_model):
+    histories = [[5, 5, 5], [1, 5, 10, 20, 35], [20, 15, 10, 5, 3], [3]]
+    refactors = [None, [1, 2], [], None]
+    batch = sprint_risk_model.predict_batch(histories, refactors, threshold=12)
+    single = [
+        sprint_risk_model.predict(h, r, threshold=12)
+        for h, r in zip(histories, refactors)
+    ]
+    assert batch == single
+
+def test_predict_batch_empty_input(sprint_risk_model):
+    assert sprint_risk_model.predict_batch([]) == []
@@ -168,3 +168,54 @@ async def fetch_data(url: str) -> str:
 """
         result = ast_analyzer_python.check_syntax(code)
         assert result["status"] == "valid"
+
+    def test_break_in_inner_loop_does_not_exit_outer_while_true(self, ast_analyzer_python):
+        """Breaks are attributed to the loop they exit."""
+        nested = "while True:\n    for x in xs:\n        break\n"
+        in_else = "while True:\n    for x in xs:\n        pass\n    else:\n        break\n"
+        assert len(ast_analyzer_python.find_infinite_loops(nested)) == 1
+        assert ast_analyzer_python.find_infinite_loops(in_else) == []
+
+    def test_analyze_all_skips_issue_checks_on_syntax_error(self, ast_analyzer_python):
+        valid = ast_analyzer_python.analyze_all("while True:\n    pass\n")
+        assert valid["syntax"]["status"] == "valid"
+        assert len(valid["infinite_loops"]) == 1
+        invalid = ast_analyzer_python.analyze_all("while True:\n    pass(\n")
+        assert invalid["syntax"]["status"] == "error"
+        assert invalid["infinite_loops"] == invalid["unreachable_code"] == []
+
+
+class TestCompileTimeChecker:
+
+    def test_repeated_check_returns_cached_result(self):
+        """Re-submitting the same buffer must hit the cache, not re-parse."""
+        from analyzers.compile_checker import CompileTimeChecker
+        checker = CompileTimeChecker()
+        code = "def f(x):\n    return x + 1\n"
+        first = checker.check(code)
+        assert checker.check(code) is first
+        assert isinstance(first.tree, ast.Module)
+
+    def test_symbol_table_errors_still_reported(self):
+        """Compiling the shared tree must still catch non-parser errors."""
+        from analyzers.compile_checker import CompileTimeChecker
+        result = CompileTimeChecker().check("return 1\n")
+        assert result.has_errors
+        assert result.errors[0].type == "SyntaxError"
+
+    def test_wildcard_and_relative_imports_flagged(self):
+        from analyzers.compile_checker import CompileTimeChecker
+        result = CompileTimeChecker().check("from os import *\nfrom . import sibling\n")
+        messages = [e.message for e in result.errors]
+        assert any("Wildcard" in m for m in messages)
+        assert any("Relative" in m for m in messages)
+
+    def test_shared_context_collects_nodes_in_one_walk(self):
+        """The context handed to other analyzers lists the nodes they read."""
+        from analyzers.compile_checker import CompileTimeChecker
+        code = "import os\ndef f(xs):\n    for x in xs:\n        while x:\n            x = os.fspath(x)\n"
+        ctx = CompileTimeChecker().check(code).context
+        assert [type(n).__name__ for n in ctx.imports] == ["Import"]
+        assert [n.name for n in ctx.function_defs] == ["f"]
+        assert [type(n).__name__ for n in ctx.loops] == ["For", "While"]
+        assert len(ctx.calls) == 1